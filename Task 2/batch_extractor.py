@@ -4,6 +4,14 @@ BATCH IMAGE EXTRACTOR - Task 2
 ================================================================================
 Process multiple PDFs from the pdfs folder and extract all images.
 Creates organized output with per-PDF folders and consolidated metadata.
+
+With a resource budget (--budget-* options) every PDF runs in its own
+process: a PDF that goes over its limits, hangs or crashes is killed and
+recorded as "budget_exceeded" / "failed", and the batch carries on.
+
+Console output goes through event_log.py (--quiet, --log-level, --log-json,
+--log-items, --progress-interval), with one rate-limited progress line
+for the batch instead of a listing of every PDF.
 ================================================================================
 """
 
@@ -11,55 +19,107 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
+from event_log import configure_from_argv, get_log
 from image_extractor import ImageExtractor
+from resource_budget import ResourceBudget, run_isolated
+
+
+def _extract_pdf(pdf_path: str, output_dir: str = None, budget=None) -> dict:
+    """Extract one PDF's images (runs in a child process under a budget)."""
+    try:
+        return ImageExtractor(pdf_path, output_dir=output_dir, budget=budget).extract_images()
+    finally:
+        # The child exits without running atexit handlers
+        get_log().flush()
 
 
-def process_all_pdfs():
-    """Process all PDFs in the pdfs folder."""
+def process_all_pdfs(profiler=None, budget=None, pdfs_folder: str = None, output_dir: str = None,
+                     log=None):
+    """
+    Process all PDFs in the pdfs folder.
+    
+    Args:
+        profiler: Optional MemoryProfiler (mem_profiler.py); records the
+                  "images" stage of every PDF (not measured for isolated PDFs)
+        budget: Optional ResourceBudget (resource_budget.py) applied to each
+                PDF separately; PDFs then run isolated in child processes
+        pdfs_folder: Folder to read PDFs from (default: ../pdfs)
+        output_dir: Folder for the per-PDF output and the consolidated
+                    metadata (default: Task 2 folder)
+        log: Optional EventLog (event_log.py); default is the shared log
+    
+    Returns:
+        Consolidated metadata dictionary (None if no PDFs were found)
+    """
+    isolate = budget is not None and budget.is_limited()
+    log = log if log is not None else get_log()
     
     # Get paths
-    script_dir = Path(__file__).parent.resolve()
-    project_dir = script_dir.parent
-    pdfs_folder = project_dir / "pdfs"
+    script_dir = Path(output_dir).resolve() if output_dir else Path(__file__).parent.resolve()
+    project_dir = Path(__file__).parent.resolve().parent
+    pdfs_folder = Path(pdfs_folder) if pdfs_folder else project_dir / "pdfs"
     
-    print(f"\n{'='*60}")
-    print(f"📁 BATCH IMAGE EXTRACTOR - Task 2")
-    print(f"{'='*60}")
-    print(f"📂 PDFs folder: {pdfs_folder}")
-    print(f"{'='*60}\n")
+    log.info(f"\n{'='*60}")
+    log.info(f"📁 BATCH IMAGE EXTRACTOR - Task 2")
+    log.info(f"{'='*60}")
+    log.info(f"📂 PDFs folder: {pdfs_folder}")
+    log.info(f"{'='*60}\n")
     
     # Find all PDFs
     if not pdfs_folder.exists():
-        print(f"❌ PDFs folder not found: {pdfs_folder}")
+        log.error(f"❌ PDFs folder not found: {pdfs_folder}")
         return
     
     pdf_files = list(pdfs_folder.glob("*.pdf"))
     
     if not pdf_files:
-        print(f"❌ No PDF files found in: {pdfs_folder}")
+        log.error(f"❌ No PDF files found in: {pdfs_folder}")
         return
     
-    print(f"📄 Found {len(pdf_files)} PDF(s):\n")
+    log.info(f"📄 Found {len(pdf_files)} PDF(s)\n")
     for pdf in pdf_files:
-        print(f"   • {pdf.name}")
+        if log.sample("pdf_found"):
+            log.item("pdf_found", f"   • {pdf.name}", pdf=pdf.name)
     
     # Process each PDF
     all_metadata = {
         "extraction_date": datetime.now().isoformat(),
         "total_pdfs": len(pdf_files),
         "total_images": 0,
-        "pdfs": []
+        "pdfs": [],
+        "failed_pdfs": []
     }
+    if isolate:
+        all_metadata["budget"] = budget.limits()
     
-    for pdf_path in pdf_files:
-        print(f"\n{'='*60}")
-        print(f"🔄 Processing: {pdf_path.name}")
-        print(f"{'='*60}")
+    for done, pdf_path in enumerate(pdf_files):
+        log.progress("batch", done, len(pdf_files), unit="PDFs")
+        log.info(f"\n{'='*60}")
+        log.info(f"🔄 Processing: {pdf_path.name}")
+        log.info(f"{'='*60}")
+        
+        if isolate:
+            status, value = run_isolated(_extract_pdf, (str(pdf_path), output_dir), budget)
+            if status == "ok":
+                all_metadata["pdfs"].append(value)
+                all_metadata["total_images"] += value["total_images"]
+            else:
+                failure = {"pdf_name": pdf_path.name, "status": status}
+                if status == "budget_exceeded":
+                    failure.update(value)
+                    log.warning(f"🛑 {pdf_path.name}: budget exceeded ({value['limit']}: {value['used']} > {value['allowed']})",
+                                "pdf_budget_exceeded", pdf=pdf_path.name, **value)
+                else:
+                    failure["error"] = value
+                    log.error(f"❌ Error processing {pdf_path.name}: {value}", "pdf_failed",
+                              pdf=pdf_path.name, status=status, error=value)
+                all_metadata["failed_pdfs"].append(failure)
+            continue
         
         try:
             # Create extractor - it will automatically create the correct folder structure
             # images (pdf_name)/ and metadata (pdf_name).json
-            extractor = ImageExtractor(str(pdf_path))
+            extractor = ImageExtractor(str(pdf_path), output_dir=output_dir, profiler=profiler, log=log)
             
             # Extract images
             metadata = extractor.extract_images()
@@ -69,24 +129,79 @@ def process_all_pdfs():
             all_metadata["total_images"] += metadata["total_images"]
             
         except Exception as e:
-            print(f"❌ Error processing {pdf_path.name}: {e}")
+            if profiler is not None:
+                profiler.end(failed=True)
+            all_metadata["failed_pdfs"].append({"pdf_name": pdf_path.name, "status": "failed", "error": str(e)})
+            log.error(f"❌ Error processing {pdf_path.name}: {e}", "pdf_failed",
+                      pdf=pdf_path.name, status="failed", error=str(e))
             import traceback
             traceback.print_exc()
     
+    log.progress("batch", len(pdf_files), len(pdf_files), unit="PDFs")
+    
     # Save consolidated metadata
     consolidated_path = script_dir / "all_images_metadata.json"
     with open(consolidated_path, 'w', encoding='utf-8') as f:
         json.dump(all_metadata, f, indent=2, ensure_ascii=False)
     
     # Print summary
-    print(f"\n{'='*60}")
-    print(f"✅ BATCH EXTRACTION COMPLETE")
-    print(f"{'='*60}")
-    print(f"📄 PDFs Processed: {all_metadata['total_pdfs']}")
-    print(f"🖼️  Total Images: {all_metadata['total_images']}")
-    print(f"📋 Consolidated Metadata: {consolidated_path}")
-    print(f"{'='*60}\n")
+    log.info(f"\n{'='*60}")
+    log.info(f"✅ BATCH EXTRACTION COMPLETE")
+    log.info(f"{'='*60}")
+    log.info(f"📄 PDFs Processed: {all_metadata['total_pdfs']}")
+    log.info(f"🖼️  Total Images: {all_metadata['total_images']}")
+    if all_metadata["failed_pdfs"]:
+        log.warning(f"⚠️  Failed PDFs: {len(all_metadata['failed_pdfs'])}")
+    log.info(f"📋 Consolidated Metadata: {consolidated_path}")
+    log.info(f"{'='*60}\n")
+    log.info(event="batch_finished", total_pdfs=all_metadata['total_pdfs'],
+             total_images=all_metadata['total_images'], failed_pdfs=len(all_metadata['failed_pdfs']))
+    
+    return all_metadata
 
 
 if __name__ == "__main__":
-    process_all_pdfs()
+    # Optional memory profile (--profile-memory <report.json>) and
+    # per-PDF resource budget (--budget-seconds 120 --budget-pixels 500000000
+    # --budget-bytes 2000000000 --budget-pages 2000 --budget-memory-mb 4096)
+    budget_flags = {
+        "--budget-seconds": ("max_seconds", float),
+        "--budget-pixels": ("max_pixels", int),
+        "--budget-bytes": ("max_output_bytes", int),
+        "--budget-pages": ("max_pages", int),
+        "--budget-memory-mb": ("max_memory_mb", int)
+    }
+    budget_options = {}
+    profile_path = None
+    
+    # Console/JSON logging: --quiet, --log-level, --log-json, --log-items, --progress-interval
+    log = configure_from_argv(sys.argv)
+    
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg == "--profile-memory":
+            profile_path = sys.argv[i + 1] if i + 1 < len(sys.argv) else "memory_profile.json"
+            i += 2
+        elif arg in budget_flags and i + 1 < len(sys.argv):
+            name, convert = budget_flags[arg]
+            budget_options[name] = convert(sys.argv[i + 1])
+            i += 2
+        else:
+            print(f"⚠️ Unknown option: {arg}")
+            i += 1
+    
+    budget = ResourceBudget(**budget_options) if budget_options else None
+    
+    try:
+        if profile_path:
+            from mem_profiler import MemoryProfiler
+            profiler = MemoryProfiler()
+            try:
+                process_all_pdfs(profiler, budget=budget)
+            finally:
+                profiler.save(profile_path)
+        else:
+            process_all_pdfs(budget=budget)
+    finally:
+        log.close()
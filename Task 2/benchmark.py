@@ -0,0 +1,640 @@
+"""
+================================================================================
+BENCHMARK SUITE - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Tell whether a change to the extractors makes them faster or slower,
+      on the same PDFs every time
+
+How it works:
+- Generates a synthetic corpus offline with PyMuPDF (seeded, so every
+  machine gets the same documents):
+  * image_heavy      - several embedded JPEG/PNG photos per page
+  * vector_charts    - bar and line charts drawn as vector paths
+  * scan_like        - one full-page grayscale raster per page
+  * duplicate_heavy  - the same logos and template chart page over and over
+  * huge_page        - A0 pages with dense vector drawings and a big image
+  Page counts scale with --scale; the corpus is only rebuilt when the
+  settings change
+- Runs images, charts and OCR on every document, plus the batch path over
+  the whole corpus. Each measurement runs in a fresh process (run_isolated
+  from resource_budget.py), so peak RSS belongs to that stage alone and a
+  hung stage is killed after --timeout seconds
+- OCR uses the replay engine by default (ocr_engines.py), so the benchmark
+  runs without PaddleOCR; record real results once with
+  --ocr-engine record:<file> and replay them everywhere else
+- Reports pages/s, items/s (images, charts or OCR records), seconds and peak
+  RSS per document and stage; --repeat N keeps the median time
+- Compares against an earlier results file and fails (exit code 1) when a
+  stage got slower or bigger than the allowed thresholds
+
+Dependencies:
+- PyMuPDF (fitz), NumPy, Pillow
+
+Output:
+- benchmark/corpus/*.pdf, benchmark/work/ (extractor output) and
+  benchmark/results.json (or any path you choose)
+================================================================================
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+from mem_profiler import _read_proc_status, _reset_rss_peak
+from resource_budget import ResourceBudget, run_isolated
+
+
+# Bump when the generators change so old corpora are rebuilt
+CORPUS_VERSION = 1
+
+# Pages per document at --scale 1
+BASE_PAGES = {
+    "image_heavy": 20,
+    "vector_charts": 20,
+    "scan_like": 10,
+    "duplicate_heavy": 40,
+    "huge_page": 2
+}
+KINDS = tuple(BASE_PAGES)
+
+STAGES = ("images", "charts", "ocr", "batch")
+
+# Time differences below this are noise, whatever the ratio
+MIN_SECONDS_DELTA = 0.05
+
+MB = 1024 * 1024
+
+CHART_CAPTION = "Figure {n}: revenue growth FY2021-FY2025 (INR bn), CAGR % - Source: company filings"
+
+
+# ----------------------------------------------------------------------------
+# Synthetic corpus
+# ----------------------------------------------------------------------------
+
+def _encode(array: np.ndarray, fmt: str) -> bytes:
+    """Encode an RGB or grayscale array as JPEG or PNG."""
+    buffer = io.BytesIO()
+    options = {"quality": 85} if fmt == "JPEG" else {}
+    Image.fromarray(array).save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def _photo(rng, width: int, height: int) -> np.ndarray:
+    """Photo-like RGB image: smooth colour fields plus grain."""
+    coarse = rng.integers(0, 256, size=(max(2, height // 40), max(2, width // 40), 3), dtype=np.uint8)
+    smooth = np.asarray(Image.fromarray(coarse).resize((width, height), Image.BILINEAR), dtype=np.int16)
+    grain = rng.integers(-12, 13, size=(height, width, 3), dtype=np.int16)
+    return np.clip(smooth + grain, 0, 255).astype(np.uint8)
+
+
+def _scan(rng, width: int, height: int) -> np.ndarray:
+    """Scan-like grayscale page: paper noise with dark text-line blocks."""
+    page = rng.integers(225, 256, size=(height, width), dtype=np.uint8)
+    margin = width // 10
+    y = height // 12
+    while y < height - height // 12:
+        line_height = max(4, height // 110)
+        x = margin
+        while x < width - margin:
+            word = int(rng.integers(width // 40, width // 12))
+            page[y:y + line_height, x:min(x + word, width - margin)] = rng.integers(10, 70)
+            x += word + width // 80
+        y += line_height * 2 + int(rng.integers(0, line_height))
+    return page
+
+
+def _draw_chart(page, rect: fitz.Rect, rng, number: int):
+    """Draw a bar + line chart with axes, grid and caption as vector paths."""
+    page.insert_text((rect.x0, rect.y0 - 6), CHART_CAPTION.format(n=number), fontsize=7)
+    
+    shape = page.new_shape()
+    for i in range(6):
+        y = rect.y1 - i * rect.height / 5
+        shape.draw_line((rect.x0, y), (rect.x1, y))
+    shape.finish(color=(0.8, 0.8, 0.8), width=0.3)
+    
+    shape.draw_line((rect.x0, rect.y0), (rect.x0, rect.y1))
+    shape.draw_line((rect.x0, rect.y1), (rect.x1, rect.y1))
+    shape.finish(color=(0, 0, 0), width=0.8)
+    
+    bars = 12
+    step = rect.width / bars
+    values = rng.uniform(0.15, 0.95, size=bars)
+    for i, value in enumerate(values):
+        x0 = rect.x0 + i * step + step * 0.2
+        shape.draw_rect(fitz.Rect(x0, rect.y1 - value * rect.height, x0 + step * 0.6, rect.y1))
+        shape.finish(color=None, fill=(0.2, 0.4, 0.7))
+    
+    points = [fitz.Point(rect.x0 + (i + 0.5) * step, rect.y1 - v * rect.height * 0.8) for i, v in enumerate(values[::-1])]
+    shape.draw_polyline(points)
+    shape.finish(color=(0.9, 0.4, 0.1), width=1.2)
+    for point in points:
+        shape.draw_circle(point, 1.5)
+        shape.finish(color=(0.9, 0.4, 0.1), fill=(1, 1, 1))
+    shape.commit()
+
+
+def _make_image_heavy(doc, pages: int, rng):
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 40), f"Photo appendix, page {page_num + 1}", fontsize=12)
+        for i in range(4):
+            rect = fitz.Rect(50 + (i % 2) * 260, 60 + (i // 2) * 330, 300 + (i % 2) * 260, 370 + (i // 2) * 330)
+            fmt = "JPEG" if i % 2 == 0 else "PNG"
+            page.insert_image(rect, stream=_encode(_photo(rng, 480, 600), fmt))
+
+
+def _make_vector_charts(doc, pages: int, rng):
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 40), f"Market overview {page_num + 1}: units, growth and forecast", fontsize=12)
+        _draw_chart(page, fitz.Rect(60, 90, 540, 380), rng, page_num * 2 + 1)
+        _draw_chart(page, fitz.Rect(60, 450, 540, 740), rng, page_num * 2 + 2)
+
+
+def _make_scan_like(doc, pages: int, rng):
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_image(page.rect, stream=_encode(_scan(rng, 1240, 1754), "JPEG"))
+
+
+def _make_duplicate_heavy(doc, pages: int, rng):
+    logos = [_encode(_photo(rng, 160, 80), "PNG") for _ in range(3)]
+    logo_xrefs = [0, 0, 0]
+    
+    for page_num in range(pages):
+        page = doc.new_page()
+        # Logos are stored once and referenced from every page
+        for i, logo in enumerate(logos):
+            rect = fitz.Rect(50 + i * 180, 20, 170 + i * 180, 60)
+            if logo_xrefs[i]:
+                page.insert_image(rect, xref=logo_xrefs[i])
+            else:
+                logo_xrefs[i] = page.insert_image(rect, stream=logo)
+        
+        if page_num % 4 == 0:
+            # Identical template page (same drawing on every occurrence)
+            template_rng = np.random.default_rng(0)
+            _draw_chart(page, fitz.Rect(60, 120, 540, 400), template_rng, 1)
+            _draw_chart(page, fitz.Rect(60, 460, 540, 740), template_rng, 2)
+            page.insert_text((60, 560), "Disclaimer: forward-looking statements, growth estimates in %.", fontsize=9)
+        else:
+            page.insert_text((60, 120), f"Section {page_num}: narrative text only.", fontsize=11)
+
+
+def _make_huge_page(doc, pages: int, rng):
+    width, height = fitz.paper_size("a0")
+    for page_num in range(pages):
+        page = doc.new_page(width=width, height=height)
+        for row in range(6):
+            for col in range(4):
+                x0 = 80 + col * (width - 160) / 4
+                y0 = 120 + row * (height * 0.7) / 6
+                rect = fitz.Rect(x0 + 20, y0 + 20, x0 + (width - 160) / 4 - 20, y0 + height * 0.7 / 6 - 20)
+                _draw_chart(page, rect, rng, page_num * 24 + row * 4 + col + 1)
+        page.insert_image(fitz.Rect(80, height * 0.75, width - 80, height - 80),
+                          stream=_encode(_photo(rng, 4000, 1200), "JPEG"))
+
+
+GENERATORS = {
+    "image_heavy": _make_image_heavy,
+    "vector_charts": _make_vector_charts,
+    "scan_like": _make_scan_like,
+    "duplicate_heavy": _make_duplicate_heavy,
+    "huge_page": _make_huge_page
+}
+
+
+def generate_corpus(corpus_dir: str, scale: float = 1.0, kinds: tuple = KINDS, seed: int = 0) -> dict:
+    """
+    Generate the synthetic corpus (or reuse it if the settings are unchanged).
+    
+    Args:
+        corpus_dir: Folder for the PDFs and corpus.json
+        scale: Multiplier for the page count of every document
+        kinds: Document kinds to generate (see BASE_PAGES)
+        seed: Random seed; the same seed always gives the same documents
+    
+    Returns:
+        Corpus manifest with settings and one entry per document
+    """
+    corpus_dir = Path(corpus_dir)
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = corpus_dir / "corpus.json"
+    settings = {"version": CORPUS_VERSION, "seed": seed, "scale": scale, "kinds": list(kinds)}
+    
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("settings") == settings and all(
+                (corpus_dir / d["file"]).exists() for d in manifest["documents"]):
+            print(f"📚 Reusing corpus in {corpus_dir}")
+            return manifest
+    
+    # Stale PDFs would be picked up by the batch run
+    for old in corpus_dir.glob("*.pdf"):
+        old.unlink()
+    
+    documents = []
+    for kind in kinds:
+        pages = max(1, round(BASE_PAGES[kind] * scale))
+        # Seeded per kind, so a document is the same whichever kinds are selected
+        rng = np.random.default_rng([seed, KINDS.index(kind)])
+        
+        doc = fitz.open()
+        GENERATORS[kind](doc, pages, rng)
+        doc.set_metadata({})
+        path = corpus_dir / f"bench_{kind}.pdf"
+        doc.save(path, garbage=3, deflate=True, no_new_id=True)
+        doc.close()
+        
+        documents.append({"file": path.name, "kind": kind, "pages": pages, "bytes": path.stat().st_size})
+        print(f"📄 Generated {path.name}: {pages} page(s), {path.stat().st_size / MB:.1f} MB")
+    
+    manifest = {"settings": settings, "documents": documents}
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ----------------------------------------------------------------------------
+# Measurements
+# ----------------------------------------------------------------------------
+
+def _run_stage(stage: str, pdf_path: str, work_dir: str, options: dict, budget=None) -> dict:
+    """
+    Run one stage on one PDF (or the batch on a folder) and measure it.
+    
+    Runs in a fresh child process (see run_isolated), so VmHWM is this
+    stage's peak. Extractor output is discarded unless options["verbose"].
+    """
+    rss_peak_reset = _reset_rss_peak()
+    rss_start = _read_proc_status().get("VmRSS", 0)
+    
+    with contextlib.ExitStack() as stack:
+        if not options.get("verbose"):
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        
+        started = time.perf_counter()
+        if stage == "images":
+            from image_extractor import ImageExtractor
+            metadata = ImageExtractor(pdf_path, output_dir=work_dir, budget=budget).extract_images()
+            pages, items = metadata["total_pages"], metadata["total_images"]
+        elif stage == "charts":
+            from chart_extractor import ChartExtractor
+            metadata = ChartExtractor(pdf_path, output_dir=work_dir, workers=options["chart_workers"],
+                                      budget=budget).extract_charts()
+            pages, items = metadata["total_pages"], len(metadata["charts"])
+        elif stage == "ocr":
+            from ocr_extractor import OCRExtractor
+            metadata_path = Path(work_dir) / f"metadata ({Path(pdf_path).stem}).json"
+            metadata = OCRExtractor(metadata_path=str(metadata_path), output_dir=work_dir,
+                                    workers=options["ocr_workers"], engine=options["ocr_engine"],
+                                    engine_options=options["ocr_engine_options"], resume=False,
+                                    budget=budget).run_ocr()
+            pages, items = metadata.get("total_pages", 0), len(metadata.get("images", []))
+        elif stage == "batch":
+            from batch_extractor import process_all_pdfs
+            metadata = process_all_pdfs(pdfs_folder=pdf_path, output_dir=work_dir)
+            pages = sum(pdf["total_pages"] for pdf in metadata["pdfs"])
+            items = metadata["total_images"]
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+        seconds = time.perf_counter() - started
+    
+    status = _read_proc_status()
+    return {
+        "seconds": seconds,
+        "pages": pages,
+        "items": items,
+        "rss_start_mb": round(rss_start / MB, 2),
+        "peak_rss_mb": round(status.get("VmHWM", 0) / MB, 2),
+        "rss_peak_is_stage_peak": rss_peak_reset
+    }
+
+
+def _measure(stage: str, target: str, work_dir: Path, options: dict, repeat: int, timeout: float) -> dict:
+    """Run a stage repeat times in fresh processes and summarise the runs."""
+    runs = []
+    for _ in range(repeat):
+        status, value = run_isolated(_run_stage, (stage, target, str(work_dir), options),
+                                     ResourceBudget(max_seconds=timeout))
+        if status != "ok":
+            return {"status": status, "error": value}
+        runs.append(value)
+    
+    seconds = statistics.median(run["seconds"] for run in runs)
+    pages, items = runs[0]["pages"], runs[0]["items"]
+    return {
+        "status": "ok",
+        "seconds": round(seconds, 4),
+        "seconds_min": round(min(run["seconds"] for run in runs), 4),
+        "seconds_max": round(max(run["seconds"] for run in runs), 4),
+        "pages": pages,
+        "items": items,
+        "pages_per_s": round(pages / seconds, 2) if seconds > 0 else None,
+        "items_per_s": round(items / seconds, 2) if seconds > 0 else None,
+        "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+        "rss_start_mb": runs[0]["rss_start_mb"],
+        "rss_peak_is_stage_peak": runs[0]["rss_peak_is_stage_peak"]
+    }
+
+
+def _environment() -> dict:
+    """Machine and version details, so results are compared like for like."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pymupdf": getattr(fitz, "VersionBind", "unknown"),
+        "numpy": np.__version__,
+        "git_commit": commit
+    }
+
+
+def run_benchmark(corpus_dir: str, work_dir: str, stages: tuple = STAGES, kinds: tuple = KINDS,
+                  scale: float = 1.0, seed: int = 0, repeat: int = 1, timeout: float = 600,
+                  options: dict = None) -> dict:
+    """
+    Generate (or reuse) the corpus and measure every stage on it.
+    
+    Args:
+        corpus_dir: Folder for the synthetic PDFs
+        work_dir: Folder the extractors write their output to
+        stages: Stages to measure ("images", "charts", "ocr", "batch")
+        kinds: Document kinds in the corpus
+        scale: Page-count multiplier for the corpus
+        seed: Corpus random seed
+        repeat: Runs per measurement (the median time is reported)
+        timeout: Seconds one run may take before it is killed
+        options: chart_workers, ocr_workers, ocr_engine, ocr_engine_options, verbose
+    
+    Returns:
+        Results dictionary (see save / compare_results)
+    """
+    options = dict({"chart_workers": 1, "ocr_workers": 1, "verbose": False,
+                    "ocr_engine": f"replay:{Path(corpus_dir) / 'ocr_replay.jsonl'}",
+                    "ocr_engine_options": {}}, **(options or {}))
+    manifest = generate_corpus(corpus_dir, scale=scale, kinds=kinds, seed=seed)
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    
+    results = []
+    for document in manifest["documents"]:
+        pdf_path = str(Path(corpus_dir) / document["file"])
+        
+        # OCR reads the images stage's output
+        if "ocr" in stages and "images" not in stages:
+            run_isolated(_run_stage, ("images", pdf_path, str(work_dir), options), ResourceBudget(max_seconds=timeout))
+        
+        for stage in (s for s in STAGES if s in stages and s != "batch"):
+            print(f"⏱️  {document['file']} / {stage} ...")
+            result = _measure(stage, pdf_path, work_dir, options, repeat, timeout)
+            result.update({"document": document["file"], "kind": document["kind"], "stage": stage})
+            results.append(result)
+    
+    if "batch" in stages:
+        print(f"⏱️  batch over {len(manifest['documents'])} PDF(s) ...")
+        result = _measure("batch", str(corpus_dir), work_dir / "batch", options, repeat, timeout)
+        # Named after its contents, so only batches over the same kinds are compared
+        result.update({"document": ",".join(d["kind"] for d in manifest["documents"]),
+                       "kind": "corpus", "stage": "batch"})
+        results.append(result)
+    
+    return {
+        "benchmark_date": datetime.now().isoformat(),
+        "environment": _environment(),
+        "corpus": manifest,
+        "repeat": repeat,
+        "options": {k: v for k, v in options.items() if k != "verbose"},
+        "results": results
+    }
+
+
+def compare_results(current: dict, baseline: dict, time_threshold: float = 0.10,
+                    memory_threshold: float = 0.20) -> dict:
+    """
+    Compare two benchmark results.
+    
+    Args:
+        current: Results of this run
+        baseline: Earlier results (same corpus version, seed and scale;
+                  documents and stages are matched by name)
+        time_threshold: Allowed slowdown as a fraction (0.10 = 10% slower)
+        memory_threshold: Allowed peak RSS growth as a fraction
+    
+    Returns:
+        Dictionary with "comparable", "changes" (every matched measurement)
+        and "regressions" (changes over a threshold)
+    """
+    settings = ("version", "seed", "scale")
+    if any(current["corpus"]["settings"][k] != baseline["corpus"]["settings"].get(k) for k in settings):
+        return {"comparable": False, "reason": "corpus version, seed or scale differ", "changes": [], "regressions": []}
+    
+    before = {(r["document"], r["stage"]): r for r in baseline["results"] if r["status"] == "ok"}
+    changes = []
+    regressions = []
+    
+    for result in current["results"]:
+        old = before.get((result["document"], result["stage"]))
+        if old is None or result["status"] != "ok":
+            if old is not None:
+                regressions.append({"document": result["document"], "stage": result["stage"],
+                                    "metric": "status", "baseline": "ok", "current": result["status"]})
+            continue
+        
+        for metric, threshold, min_delta in (("seconds", time_threshold, MIN_SECONDS_DELTA),
+                                             ("peak_rss_mb", memory_threshold, 0)):
+            if not old[metric]:
+                continue
+            change = {
+                "document": result["document"],
+                "stage": result["stage"],
+                "metric": metric,
+                "baseline": old[metric],
+                "current": result[metric],
+                "change": round(result[metric] / old[metric] - 1, 4)
+            }
+            changes.append(change)
+            if change["change"] > threshold and result[metric] - old[metric] > min_delta:
+                regressions.append(change)
+    
+    return {
+        "comparable": True,
+        "thresholds": {"seconds": time_threshold, "peak_rss_mb": memory_threshold},
+        "changes": changes,
+        "regressions": regressions
+    }
+
+
+def _print_report(report: dict):
+    """Print one line per measurement and any regressions."""
+    print(f"\n{'='*60}")
+    print(f"✅ BENCHMARK COMPLETE")
+    print(f"{'='*60}")
+    for r in report["results"]:
+        label = f"{r['document']} / {r['stage']}"
+        if r["status"] != "ok":
+            print(f"❌ {label}: {r['status']} ({r['error']})")
+            continue
+        print(f"⏱️  {label}: {r['seconds']:.3f}s, {r['pages_per_s']} pages/s, "
+              f"{r['items_per_s']} items/s, peak RSS {r['peak_rss_mb']} MB")
+    
+    comparison = report.get("comparison")
+    if comparison is not None:
+        if not comparison["comparable"]:
+            print(f"\n⚠️  Not compared with the baseline: {comparison['reason']}")
+        elif comparison["regressions"]:
+            print(f"\n🐢 Regressions ({len(comparison['regressions'])}):")
+            for change in comparison["regressions"]:
+                if change["metric"] == "status":
+                    print(f"   • {change['document']} / {change['stage']}: {change['current']}")
+                else:
+                    print(f"   • {change['document']} / {change['stage']} {change['metric']}: "
+                          f"{change['baseline']} -> {change['current']} ({change['change']:+.0%})")
+        else:
+            print(f"\n✅ No regressions against the baseline")
+    print(f"{'='*60}\n")
+
+
+def main():
+    """Main function to run the benchmark."""
+    script_dir = Path(__file__).parent.resolve()
+    
+    corpus_dir = script_dir / "benchmark" / "corpus"
+    work_dir = script_dir / "benchmark" / "work"
+    output_path = script_dir / "benchmark" / "results.json"
+    baseline_path = None
+    stages = STAGES
+    kinds = KINDS
+    scale = 1.0
+    seed = 0
+    repeat = 1
+    timeout = 600.0
+    time_threshold = 0.10
+    memory_threshold = 0.20
+    options = {}
+    
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print("Usage: python benchmark.py [options]")
+        print("\nOptions:")
+        print("  --scale 1.0        Page-count multiplier for the synthetic corpus")
+        print("  --seed 0           Corpus random seed")
+        print(f"  --kinds a,b        Document kinds ({','.join(KINDS)})")
+        print(f"  --stages a,b       Stages to measure ({','.join(STAGES)})")
+        print("  --repeat 3         Runs per measurement (median time is reported)")
+        print("  --timeout 600      Seconds one run may take before it is killed")
+        print("  --chart-workers N  Render processes for the charts stage")
+        print("  --ocr-workers N    OCR worker processes")
+        print("  --ocr-engine SPEC  OCR engine (default: replay:<corpus>/ocr_replay.jsonl)")
+        print("  --ocr-latency-per-mpx S  Simulated replay OCR seconds per megapixel")
+        print("  --corpus DIR       Corpus folder (default: benchmark/corpus)")
+        print("  --work DIR         Extractor output folder (default: benchmark/work)")
+        print("  --output FILE      Results file (default: benchmark/results.json)")
+        print("  --compare FILE     Baseline results; exit code 1 on regressions")
+        print("  --time-threshold 0.10    Allowed slowdown (fraction)")
+        print("  --memory-threshold 0.20  Allowed peak RSS growth (fraction)")
+        print("  --verbose          Show extractor output")
+        sys.exit(0)
+    
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        value = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+        if arg == "--scale" and value:
+            scale = float(value)
+        elif arg == "--seed" and value:
+            seed = int(value)
+        elif arg == "--kinds" and value:
+            kinds = tuple(k.strip() for k in value.split(",") if k.strip())
+            unknown = [k for k in kinds if k not in KINDS]
+            if unknown:
+                print(f"❌ Unknown kind(s): {', '.join(unknown)}")
+                sys.exit(1)
+        elif arg == "--stages" and value:
+            stages = tuple(s.strip() for s in value.split(",") if s.strip())
+            unknown = [s for s in stages if s not in STAGES]
+            if unknown:
+                print(f"❌ Unknown stage(s): {', '.join(unknown)}")
+                sys.exit(1)
+        elif arg == "--repeat" and value:
+            repeat = max(1, int(value))
+        elif arg == "--timeout" and value:
+            timeout = float(value)
+        elif arg == "--chart-workers" and value:
+            options["chart_workers"] = int(value)
+        elif arg == "--ocr-workers" and value:
+            options["ocr_workers"] = int(value)
+        elif arg == "--ocr-engine" and value:
+            options["ocr_engine"] = value
+        elif arg == "--ocr-latency-per-mpx" and value:
+            options["ocr_engine_options"] = {"latency_per_mpx": float(value)}
+        elif arg == "--corpus" and value:
+            corpus_dir = Path(value)
+        elif arg == "--work" and value:
+            work_dir = Path(value)
+        elif arg == "--output" and value:
+            output_path = Path(value)
+        elif arg == "--compare" and value:
+            baseline_path = Path(value)
+        elif arg == "--time-threshold" and value:
+            time_threshold = float(value)
+        elif arg == "--memory-threshold" and value:
+            memory_threshold = float(value)
+        elif arg == "--verbose":
+            options["verbose"] = True
+            i += 1
+            continue
+        else:
+            print(f"⚠️  Ignoring argument: {arg}")
+            i += 1
+            continue
+        i += 2
+    
+    print(f"\n{'='*60}")
+    print(f"📈 BENCHMARK - Task 2")
+    print(f"{'='*60}")
+    print(f"📚 Corpus: {corpus_dir} (scale {scale}, seed {seed})")
+    print(f"🧪 Stages: {', '.join(stages)}")
+    print(f"{'='*60}\n")
+    
+    report = run_benchmark(corpus_dir, work_dir, stages=stages, kinds=kinds, scale=scale, seed=seed,
+                           repeat=repeat, timeout=timeout, options=options)
+    
+    if baseline_path is not None:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report["comparison"] = compare_results(report, baseline, time_threshold, memory_threshold)
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    
+    _print_report(report)
+    print(f"💾 Results saved: {output_path}")
+    
+    comparison = report.get("comparison")
+    if comparison is not None and comparison["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
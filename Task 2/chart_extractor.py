@@ -9,6 +9,11 @@ How it works:
 - Renders PDF pages as high-resolution images
 - Detects pages that contain charts/graphs (pages with vector content)
 - Saves rendered page images in 'charts (pdf_name)/' folder
+- Optionally fingerprints every selected page (page_fingerprint.py) and
+  reuses the detection and renders of template pages already seen in
+  earlier PDFs
+- Per-page and per-chart lines are sampled item events (event_log.py);
+  detection and rendering report rate-limited progress instead
 
 Dependencies:
 - PyMuPDF (fitz)
@@ -22,11 +27,22 @@ Output:
 
 import fitz  # PyMuPDF
 import json
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
 from PIL import Image
 import io
+import math
+import struct
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from event_log import configure_from_argv, get_log
+from page_fingerprint import FINGERPRINT_VERSION, PageFingerprintStore, copy_render, page_fingerprint
+from pdf_source import PDFSource
+from resource_budget import BudgetExceeded, ResourceBudget
 
 
 class ChartExtractor:
@@ -35,29 +51,89 @@ class ChartExtractor:
     These are vector graphics that aren't detected as embedded images.
     """
     
-    def __init__(self, pdf_path: str, dpi: int = 150):
+    def __init__(self, pdf_path: str, dpi: int = 150, workers: int = 1,
+                 target_long_side: int = None, min_dpi: int = 72, max_dpi: int = 300,
+                 max_pixels: int = None, tile_pixels: int = None,
+                 preview_dpi: int = None, display_list_cache: int = 4,
+                 raster_coverage_threshold: float = 0.9, profiler=None, budget=None,
+                 pdf_name: str = None, fingerprint_store: str = None,
+                 fingerprint_max_mb: int = 1024, output_dir: str = None, log=None):
         """
         Initialize the Chart Extractor.
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or the PDF itself as bytes,
+                      a binary file object or an mmap (opened without a copy)
             dpi: Resolution for rendering (higher = better quality, larger files)
+            workers: Number of render processes (1 = serial, 0 = one per CPU core)
+            target_long_side: If set, pick the DPI per region so its longest side
+                              comes out at this many pixels (adaptive mode)
+            min_dpi: Lowest DPI allowed in adaptive mode
+            max_dpi: Highest DPI allowed in adaptive mode
+            max_pixels: Hard cap on pixels per render (width x height); the DPI
+                        is lowered until the render fits
+            tile_pixels: If set, renders larger than this many pixels are drawn
+                         in horizontal stripes of at most this size and streamed
+                         to the PNG file, so peak memory follows the stripe size
+            preview_dpi: If set, also save a low-resolution preview of each chart
+                         (rendered from the same display list as the full image)
+            display_list_cache: Number of page display lists kept for reuse
+                                (0 = only reuse within the current page)
+            raster_coverage_threshold: In auto-detect mode, skip pages where
+                                       embedded images already cover at least
+                                       this fraction of the page (None = never skip)
+            profiler: Optional MemoryProfiler (mem_profiler.py) that records
+                      this extraction as stage "charts" (this process only;
+                      render workers are not measured)
+            budget: Optional ResourceBudget (resource_budget.py); every render
+                    is charged before it is drawn and BudgetExceeded is raised
+                    when the document goes over it
+            pdf_name: Name for output folders and metadata; required when
+                      pdf_path is data without a file name
+            fingerprint_store: Directory shared across runs where page
+                               fingerprints, detection results and renders
+                               are kept for reuse (None = off)
+            fingerprint_max_mb: Size limit of the store before old pages are evicted
+            output_dir: Directory for the charts folder and metadata
+                        (default: Task 2 folder)
+            log: Optional EventLog (event_log.py); default is the shared log
+        
+        Raises:
+            FileNotFoundError: The PDF file does not exist
+            ValueError: The input does not start like a PDF ("%PDF-")
         """
-        self.pdf_path = Path(pdf_path).resolve()
+        self.source = PDFSource(pdf_path, pdf_name)
+        self.pdf_path = self.source.path  # None for in-memory PDFs
         self.dpi = dpi
         self.zoom = dpi / 72  # PDF default is 72 DPI
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.target_long_side = target_long_side
+        self.min_dpi = min_dpi
+        self.max_dpi = max_dpi
+        self.max_pixels = max_pixels
+        self.tile_pixels = tile_pixels
+        self.preview_dpi = preview_dpi
+        self.display_list_cache = display_list_cache
+        self.raster_coverage_threshold = raster_coverage_threshold
+        self.profiler = profiler
+        self.budget = budget
+        self.fingerprint_store = fingerprint_store
+        self.fingerprint_max_mb = fingerprint_max_mb
+        self.log = log if log is not None else get_log()
         
-        if not self.pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        # Open PageFingerprintStore during extract_charts(); per-document
+        # hash memo for shared fonts and images
+        self._fingerprints = None
+        self._fingerprint_memo = {}
         
-        if not self.pdf_path.suffix.lower() == '.pdf':
-            raise ValueError(f"File is not a PDF: {pdf_path}")
+        # Page number -> fitz.DisplayList, most recently used last
+        self._display_lists = OrderedDict()
         
         # Get PDF name without extension
-        self.pdf_name = self.pdf_path.stem
+        self.pdf_name = self.source.stem
         
-        # Set output directory (same as script location)
-        self.script_dir = Path(__file__).parent.resolve()
+        # Set output directory (same as script location unless given)
+        self.script_dir = Path(output_dir).resolve() if output_dir else Path(__file__).parent.resolve()
         
         # Create charts folder with PDF name
         self.charts_dir = self.script_dir / f"charts ({self.pdf_name})"
@@ -68,13 +144,20 @@ class ChartExtractor:
         
         # Metadata storage
         self.metadata = {
-            "pdf_name": self.pdf_path.name,
-            "pdf_path": str(self.pdf_path),
+            "pdf_name": self.source.name,
+            "pdf_path": str(self.pdf_path) if self.pdf_path is not None else None,
             "extraction_date": datetime.now().isoformat(),
             "dpi": dpi,
+            "adaptive_dpi": {
+                "target_long_side": target_long_side,
+                "min_dpi": min_dpi,
+                "max_dpi": max_dpi,
+                "max_pixels": max_pixels
+            } if target_long_side or max_pixels else None,
             "total_pages": 0,
             "chart_pages": 0,
-            "charts": []
+            "charts": [],
+            "raster_covered_pages": []
         }
     
     def _has_vector_content(self, page) -> bool:
@@ -146,6 +229,62 @@ class ChartExtractor:
             # If analysis fails, skip this page
             return False
     
+    def _raster_coverage(self, page) -> tuple:
+        """
+        Measure how much of a page is already covered by embedded images.
+        
+        Scanned pages usually carry one full-page raster (plus small vector
+        overlays) that ImageExtractor already extracts losslessly, so rendering
+        them again as a chart only duplicates work.
+        
+        Args:
+            page: PyMuPDF page object
+            
+        Returns:
+            Tuple of (covered fraction of the page area, xref of the largest image)
+        """
+        page_rect = page.rect
+        page_area = page_rect.width * page_rect.height
+        if page_area <= 0:
+            return 0.0, None
+        
+        rects = []
+        largest_xref = None
+        largest_area = 0
+        
+        for info in page.get_image_info(xrefs=True):
+            rect = fitz.Rect(info["bbox"]) & page_rect
+            if rect.is_empty:
+                continue
+            rects.append(rect)
+            area = rect.width * rect.height
+            if area > largest_area:
+                largest_area = area
+                largest_xref = info.get("xref") or None
+        
+        if not rects:
+            return 0.0, None
+        
+        # Area of the union of all placements (overlapping images count once)
+        xs = sorted({r.x0 for r in rects} | {r.x1 for r in rects})
+        covered = 0.0
+        for x0, x1 in zip(xs, xs[1:]):
+            spans = sorted((r.y0, r.y1) for r in rects if r.x0 <= x0 and r.x1 >= x1)
+            column = 0.0
+            top, bottom = None, None
+            for y0, y1 in spans:
+                if bottom is None or y0 > bottom:
+                    if bottom is not None:
+                        column += bottom - top
+                    top, bottom = y0, y1
+                else:
+                    bottom = max(bottom, y1)
+            if bottom is not None:
+                column += bottom - top
+            covered += column * (x1 - x0)
+        
+        return min(1.0, covered / page_area), largest_xref
+    
     def _find_chart_regions(self, page) -> list:
         """
         Find bounding boxes of chart regions on a page.
@@ -221,6 +360,136 @@ class ChartExtractor:
         
         return [combined]
     
+    def _zoom_for_clip(self, clip: fitz.Rect) -> float:
+        """
+        Choose the zoom factor for rendering a clip.
+        
+        Uses the fixed DPI unless a target long side is configured, in which
+        case the DPI is scaled to hit that size and clamped to [min_dpi, max_dpi].
+        The pixel budget is applied last and always wins.
+        
+        Args:
+            clip: Area of the page to render (in PDF points)
+            
+        Returns:
+            Zoom factor (DPI / 72)
+        """
+        zoom = self.zoom
+        
+        long_side = max(clip.width, clip.height)
+        if self.target_long_side and long_side > 0:
+            dpi = self.target_long_side * 72 / long_side
+            dpi = min(max(dpi, self.min_dpi), self.max_dpi)
+            zoom = dpi / 72
+        
+        if self.max_pixels and clip.width > 0 and clip.height > 0:
+            if clip.width * clip.height * zoom * zoom > self.max_pixels:
+                zoom = math.sqrt(self.max_pixels / (clip.width * clip.height))
+            
+            # Rendering rounds the pixel box outwards, so shrink until it fits
+            irect = (clip * fitz.Matrix(zoom, zoom)).irect
+            while irect.width * irect.height > self.max_pixels and zoom > 0.01:
+                zoom *= 0.99
+                irect = (clip * fitz.Matrix(zoom, zoom)).irect
+        
+        return zoom
+    
+    def _get_display_list(self, page) -> fitz.DisplayList:
+        """
+        Get the display list for a page, building it on first use.
+        
+        Interpreting the page content stream is often more expensive than
+        rasterizing it, so all clips, stripes and zoom levels of a page are
+        rendered from one display list. A small LRU keeps lists for pages that
+        are revisited within a run.
+        
+        Args:
+            page: PyMuPDF page object
+            
+        Returns:
+            fitz.DisplayList for the page
+        """
+        key = page.number
+        
+        if key in self._display_lists:
+            self._display_lists.move_to_end(key)
+            return self._display_lists[key]
+        
+        display_list = page.get_displaylist()
+        self._display_lists[key] = display_list
+        
+        # Always keep the current page; evict the least recently used others
+        while len(self._display_lists) > max(1, self.display_list_cache):
+            self._display_lists.popitem(last=False)
+        
+        return display_list
+    
+    def _save_clip_as_png(self, page, clip: fitz.Rect, zoom: float, image_path: Path) -> tuple:
+        """
+        Render a clip of a page at the given zoom and write it as PNG.
+        
+        Small renders go through a single pixmap. Renders above tile_pixels are
+        drawn stripe by stripe and streamed into the PNG encoder, so only one
+        stripe is ever held in memory.
+        
+        Args:
+            page: PyMuPDF page object
+            clip: Area of the page to render (in PDF points)
+            zoom: Zoom factor (DPI / 72)
+            image_path: Output PNG path
+            
+        Returns:
+            Tuple of (width, height) in pixels
+        """
+        mat = fitz.Matrix(zoom, zoom)
+        irect = (clip * mat).irect
+        display_list = self._get_display_list(page)
+        
+        if not self.tile_pixels or irect.width * irect.height <= self.tile_pixels:
+            pix = display_list.get_pixmap(matrix=mat, clip=clip, alpha=False)
+            
+            # Convert to PIL Image and save
+            img_data = pix.tobytes("png")
+            img = Image.open(io.BytesIO(img_data))
+            img.save(image_path, "PNG", optimize=True)
+            
+            return pix.width, pix.height
+        
+        width, height = irect.width, irect.height
+        rows_per_stripe = max(1, self.tile_pixels // width)
+        
+        with _StripedPNGWriter(image_path, width, height) as writer:
+            for y in range(irect.y0, irect.y1, rows_per_stripe):
+                rows = min(rows_per_stripe, irect.y1 - y)
+                
+                # Stripe clip in page coordinates; x range is the full clip so
+                # every stripe rounds to the same pixel columns
+                stripe = fitz.Rect(clip.x0, y / zoom, clip.x1, (y + rows) / zoom)
+                if self.budget is not None:
+                    self.budget.check_time()
+                pix = display_list.get_pixmap(matrix=mat, clip=stripe, alpha=False)
+                writer.write_rows(pix.samples, pix.stride, min(rows, pix.height))
+                pix = None
+        
+        return width, height
+    
+    def _render_preview(self, page, clip: fitz.Rect, image_name: str) -> str:
+        """
+        Save a low-resolution preview next to a rendered chart.
+        
+        Args:
+            page: PyMuPDF page object
+            clip: Area of the page that was rendered
+            image_name: File name of the full-resolution chart image
+            
+        Returns:
+            File name of the preview image
+        """
+        zoom = min(self.preview_dpi / 72, self._zoom_for_clip(clip))
+        preview_name = image_name.replace(".png", "_preview.png")
+        self._save_clip_as_png(page, clip, zoom, self.charts_dir / preview_name)
+        return preview_name
+    
     def _render_chart_region(self, page, page_num: int, region: fitz.Rect, chart_idx: int) -> tuple:
         """
         Render a specific region of a page as a cropped chart image.
@@ -232,35 +501,19 @@ class ChartExtractor:
             chart_idx: Chart index for naming
             
         Returns:
-            Tuple of (image_path, width, height, size_bytes, image_name, bbox)
+            Tuple of (image_path, width, height, size_bytes, image_name, bbox, dpi)
         """
-        # Create transformation matrix for zoom
-        mat = fitz.Matrix(self.zoom, self.zoom)
-        
-        # Render only the specified region (clip)
-        pix = page.get_pixmap(matrix=mat, clip=region, alpha=False)
-        
-        # Convert to PIL Image
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
+        zoom = self._zoom_for_clip(region)
         
-        # Save image
+        # Render only the specified region (clip) and save it
         image_name = f"page{page_num}_chart{chart_idx}.png"
         image_path = self.charts_dir / image_name
-        img.save(image_path, "PNG", optimize=True)
+        width, height = self._save_clip_as_png(page, region, zoom, image_path)
         
         # Get file size
         size_bytes = image_path.stat().st_size
         
-        # Create bbox dict
-        bbox = {
-            "x0": round(region.x0, 2),
-            "y0": round(region.y0, 2),
-            "x1": round(region.x1, 2),
-            "y1": round(region.y1, 2)
-        }
-        
-        return str(image_path), pix.width, pix.height, size_bytes, image_name, bbox
+        return str(image_path), width, height, size_bytes, image_name, _bbox_dict(region), round(zoom * 72, 1)
     
     def _render_page(self, page, page_num: int) -> tuple:
         """
@@ -271,131 +524,498 @@ class ChartExtractor:
             page_num: Page number (1-indexed)
             
         Returns:
-            Tuple of (image_path, width, height, size_bytes)
+            Tuple of (image_path, width, height, size_bytes, image_name, dpi)
         """
-        # Create transformation matrix for zoom
-        mat = fitz.Matrix(self.zoom, self.zoom)
-        
-        # Render page to pixmap
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        
-        # Convert to PIL Image
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
+        zoom = self._zoom_for_clip(page.rect)
         
-        # Save image
+        # Render the whole page and save it
         image_name = f"page{page_num}_chart.png"
         image_path = self.charts_dir / image_name
-        img.save(image_path, "PNG", optimize=True)
+        width, height = self._save_clip_as_png(page, page.rect, zoom, image_path)
         
         # Get file size
         size_bytes = image_path.stat().st_size
         
-        return str(image_path), pix.width, pix.height, size_bytes, image_name
+        return str(image_path), width, height, size_bytes, image_name, round(zoom * 72, 1)
     
-    def extract_charts(self, pages: list = None, force_all: bool = False) -> dict:
+    def _render_pixels(self, clip: fitz.Rect) -> int:
+        """Pixels a render of this clip will produce (including its preview)."""
+        zoom = self._zoom_for_clip(clip)
+        irect = (clip * fitz.Matrix(zoom, zoom)).irect
+        pixels = irect.width * irect.height
+        if self.preview_dpi:
+            preview_zoom = min(self.preview_dpi / 72, zoom)
+            preview = (clip * fitz.Matrix(preview_zoom, preview_zoom)).irect
+            pixels += preview.width * preview.height
+        return pixels
+    
+    def _plan_render_jobs(self, doc, pages: list = None, force_all: bool = False) -> list:
         """
-        Extract charts from PDF pages.
+        Decide which pages to render and find their chart regions.
+        
+        Detection is cheap compared to rendering, so it always runs
+        sequentially in the parent process. Each job describes one render
+        (a cropped region or a full page) and is small enough to pickle.
         
         Args:
+            doc: Open PyMuPDF document
             pages: List of specific page numbers to extract (1-indexed)
-                   If None, auto-detect pages with charts
-            force_all: If True, extract all pages (not just chart pages)
+            force_all: If True, plan all pages (not just chart pages)
             
+        A template page that repeats within this document is rendered once:
+        later jobs with the same fingerprint and region get "same_as", the
+        index of the first job, and copy its render (see _copy_same_render).
+        
         Returns:
-            Metadata dictionary with chart information
+            List of job dictionaries, in output order
         """
-        print(f"\n{'='*60}")
-        print(f"📊 CHART/GRAPH EXTRACTOR - Task 2")
-        print(f"{'='*60}")
-        print(f"📁 PDF: {self.pdf_path.name}")
-        print(f"📂 Output: {self.charts_dir}")
-        print(f"🔍 DPI: {self.dpi}")
-        print(f"{'='*60}\n")
-        
-        # Open PDF
-        doc = fitz.open(self.pdf_path)
-        self.metadata["total_pages"] = len(doc)
-        
-        chart_count = 0
+        jobs = []
+        first_jobs = {}  # (fingerprint, region_index) -> index of the job that renders it
         
         for page_num in range(len(doc)):
-            page = doc[page_num]
+            self.log.progress("chart detection", page_num, len(doc), unit="pages")
             page_number = page_num + 1  # 1-indexed
+            if pages and page_number not in pages:
+                # Not selected: no fingerprinting or detection at all
+                continue
+            page = doc[page_num]
+            
+            if self.budget is not None:
+                self.budget.add_pages(1)
+            
+            # Template pages seen before (here or in earlier PDFs) skip detection
+            fingerprint = entry = None
+            if self._fingerprints is not None:
+                fingerprint = page_fingerprint(doc, page, self._fingerprint_memo)
+                entry = self._fingerprints.get(fingerprint)
             
             # Determine if we should extract this page
             should_extract = False
             
-            if pages:
-                # User specified pages
-                should_extract = page_number in pages
-            elif force_all:
-                # Extract all pages
+            if pages or force_all:
+                # User specified pages, or all pages
                 should_extract = True
+            elif entry is not None and entry["chart"] is not None:
+                # Auto-detected before - reuse the decision
+                should_extract = entry["chart"]
+                if entry["coverage"] is not None:
+                    self.metadata["raster_covered_pages"].append({
+                        "page_number": page_number,
+                        "coverage": entry["coverage"],
+                        "xref": None  # not looked up for a known page
+                    })
+                    if self.log.sample("page_skipped"):
+                        self.log.item("page_skipped", f"🖼️  Skipping page {page_number}: {entry['coverage']:.0%} covered by embedded image (known page)",
+                                      page=page_number, coverage=entry["coverage"], known=True)
             else:
                 # Auto-detect: check for vector content
                 should_extract = self._has_vector_content(page)
-            
-            if should_extract:
-                print(f"📊 Analyzing page {page_number}...", end=" ")
+                skipped_coverage = None
                 
+                # Skip pages that are essentially one embedded raster (scans)
+                if should_extract and self.raster_coverage_threshold:
+                    coverage, xref = self._raster_coverage(page)
+                    if coverage >= self.raster_coverage_threshold:
+                        skipped_coverage = round(coverage, 3)
+                        self.metadata["raster_covered_pages"].append({
+                            "page_number": page_number,
+                            "coverage": skipped_coverage,
+                            "xref": xref
+                        })
+                        if self.log.sample("page_skipped"):
+                            self.log.item("page_skipped", f"🖼️  Skipping page {page_number}: {coverage:.0%} covered by embedded image (xref {xref})",
+                                          page=page_number, coverage=skipped_coverage, xref=xref)
+                        should_extract = False
+            
+                if fingerprint is not None:
+                    self._fingerprints.update(fingerprint, chart=should_extract, coverage=skipped_coverage)
+            
+            if not should_extract:
+                continue
+            
+            if entry is not None and entry["regions"] is not None:
+                if self.log.sample("page_analyzed"):
+                    self.log.item("page_analyzed", f"📊 Analyzing page {page_number}... (known page)",
+                                  page=page_number, known=True)
+                regions = [fitz.Rect(region) for region in entry["regions"]]
+            else:
+                if self.log.sample("page_analyzed"):
+                    self.log.item("page_analyzed", f"📊 Analyzing page {page_number}...", page=page_number)
+            
                 try:
                     # Find chart regions on this page
                     regions = self._find_chart_regions(page)
-                    
-                    if regions:
-                        # Extract each chart region
-                        for idx, region in enumerate(regions, 1):
-                            image_path, width, height, size_bytes, image_name, bbox = self._render_chart_region(
-                                page, page_number, region, idx
-                            )
-                            
-                            chart_count += 1
-                            
-                            # Add to metadata
-                            chart_info = {
-                                "page_number": page_number,
-                                "chart_index": chart_count,
-                                "image_name": image_name,
-                                "width": width,
-                                "height": height,
-                                "size_bytes": size_bytes,
-                                "format": "png",
-                                "bbox": bbox,
-                                "cropped": True
-                            }
-                            self.metadata["charts"].append(chart_info)
-                            
-                            print(f"✅ Cropped chart saved as {image_name} ({width}x{height})")
-                    else:
-                        # Fallback: render full page if no specific regions found
-                        image_path, width, height, size_bytes, image_name = self._render_page(page, page_number)
-                        
-                        chart_count += 1
-                        
-                        # Add to metadata
-                        chart_info = {
-                            "page_number": page_number,
-                            "chart_index": chart_count,
-                            "image_name": image_name,
-                            "width": width,
-                            "height": height,
-                            "size_bytes": size_bytes,
-                            "format": "png",
-                            "cropped": False
-                        }
-                        self.metadata["charts"].append(chart_info)
-                        
-                        print(f"✅ Full page saved as {image_name} ({width}x{height})")
-                    
                 except Exception as e:
-                    print(f"❌ Error: {e}")
+                    self.log.error(f"❌ Error: {e}", "chart_detection_failed", page=page_number, error=str(e))
+                    continue
+            
+                if fingerprint is not None:
+                    self._fingerprints.update(fingerprint, regions=[tuple(region) for region in regions])
+            
+            # Fallback: render full page if no specific regions found
+            targets = [(idx, region) for idx, region in enumerate(regions, 1)] or [(None, None)]
+            
+            for region_index, region in targets:
+                reuse = self._fingerprints.render_for(entry, region_index) if entry is not None else None
+                same_as = None
+                if reuse is None and fingerprint is not None:
+                    same_as = first_jobs.setdefault((fingerprint, region_index), len(jobs))
+                    if same_as == len(jobs):
+                        same_as = None
+                
+                # Charge renders before drawing them, so an absurd page size
+                # stops the document instead of allocating the pixmap
+                if self.budget is not None and reuse is None and same_as is None:
+                    self.budget.add_pixels(self._render_pixels(region if region is not None else page.rect))
+            
+                jobs.append({
+                    "page_number": page_number,
+                    "region_index": region_index,
+                    "region": tuple(region) if region is not None else None,
+                    "fingerprint": fingerprint,
+                    "reuse": reuse,
+                    "same_as": same_as
+                })
+        
+        self.log.progress("chart detection", len(doc), len(doc), unit="pages")
+        return jobs
+    
+    def _run_render_job(self, doc, job: dict) -> dict:
+        """
+        Render a single planned job and describe the result.
+        
+        Args:
+            doc: Open PyMuPDF document
+            job: Job dictionary from _plan_render_jobs
+            
+        Returns:
+            Chart metadata entry (chart_index is filled in by the caller),
+            or a dictionary with an "error" key if rendering failed
+        """
+        page_number = job["page_number"]
+        
+        try:
+            if job.get("reuse") is not None:
+                chart_info = self._reuse_render(job)
+                if chart_info is not None:
+                    return chart_info
+            
+            page = doc[page_number - 1]
+            
+            if job["region"] is not None:
+                clip = fitz.Rect(job["region"])
+                image_path, width, height, size_bytes, image_name, bbox, dpi = self._render_chart_region(
+                    page, page_number, clip, job["region_index"]
+                )
+                chart_info = {
+                    "page_number": page_number,
+                    "chart_index": None,
+                    "image_name": image_name,
+                    "width": width,
+                    "height": height,
+                    "size_bytes": size_bytes,
+                    "format": "png",
+                    "dpi": dpi,
+                    "bbox": bbox,
+                    "cropped": True
+                }
+            else:
+                clip = page.rect
+                image_path, width, height, size_bytes, image_name, dpi = self._render_page(page, page_number)
+                chart_info = {
+                    "page_number": page_number,
+                    "chart_index": None,
+                    "image_name": image_name,
+                    "width": width,
+                    "height": height,
+                    "size_bytes": size_bytes,
+                    "format": "png",
+                    "dpi": dpi,
+                    "cropped": False
+                }
+            
+            if self.preview_dpi:
+                chart_info["preview_name"] = self._render_preview(page, clip, image_name)
+            
+            if job.get("fingerprint"):
+                chart_info["page_fingerprint"] = job["fingerprint"]
+            
+            return chart_info
+            
+        except (BudgetExceeded, MemoryError):
+            # Resource limits stop the document, not just this chart
+            raise
+        except Exception as e:
+            return {"page_number": page_number, "error": str(e)}
+    
+    def _copy_same_render(self, doc, job: dict, first: dict) -> dict:
+        """
+        Copy the render of an earlier job in this document with the same fingerprint.
+        
+        Args:
+            doc: Open PyMuPDF document (used if the page has to be rendered after all)
+            job: Job dictionary with "same_as" set
+            first: Result of the job it points to
+        
+        Returns:
+            Chart metadata entry, as from _run_render_job
+        """
+        job = dict(job, same_as=None)
+        if "error" not in first:
+            job["reuse"] = {
+                "width": first["width"],
+                "height": first["height"],
+                "dpi": first["dpi"],
+                "image_file": str(self.charts_dir / first["image_name"]),
+                "preview_file": str(self.charts_dir / first["preview_name"]) if "preview_name" in first else None
+            }
+        return self._run_render_job(doc, job)
+    
+    def _reuse_render(self, job: dict):
+        """
+        Copy the stored render of a known page instead of rendering it.
+        
+        Args:
+            job: Job dictionary with a "reuse" render from the fingerprint store
+        
+        Returns:
+            Chart metadata entry, or None if the stored files are gone
+        """
+        page_number = job["page_number"]
+        if job["region_index"] is not None:
+            image_name = f"page{page_number}_chart{job['region_index']}.png"
+        else:
+            image_name = f"page{page_number}_chart.png"
+        preview_name = image_name.replace(".png", "_preview.png") if self.preview_dpi else None
+        
+        image_path = self.charts_dir / image_name
+        preview_path = self.charts_dir / preview_name if preview_name else None
+        if not copy_render(job["reuse"], image_path, preview_path):
+            return None
+        
+        render = job["reuse"]
+        chart_info = {
+            "page_number": page_number,
+            "chart_index": None,
+            "image_name": image_name,
+            "width": render["width"],
+            "height": render["height"],
+            "size_bytes": image_path.stat().st_size,
+            "format": "png",
+            "dpi": render["dpi"]
+        }
+        if job["region"] is not None:
+            chart_info["bbox"] = _bbox_dict(fitz.Rect(job["region"]))
+        chart_info["cropped"] = job["region"] is not None
+        if preview_name:
+            chart_info["preview_name"] = preview_name
+        chart_info["page_fingerprint"] = job["fingerprint"]
+        chart_info["reused"] = True
+        return chart_info
+    
+    def _fingerprint_settings(self) -> dict:
+        """Settings that change detection or renders; part of every store key."""
+        return {
+            "version": FINGERPRINT_VERSION,
+            "dpi": self.dpi,
+            "target_long_side": self.target_long_side,
+            "min_dpi": self.min_dpi,
+            "max_dpi": self.max_dpi,
+            "max_pixels": self.max_pixels,
+            "preview_dpi": self.preview_dpi,
+            "raster_coverage_threshold": self.raster_coverage_threshold
+        }
+    
+    def _worker_options(self) -> dict:
+        """Constructor options needed to rebuild this extractor in a worker process."""
+        return {
+            "dpi": self.dpi,
+            "target_long_side": self.target_long_side,
+            "min_dpi": self.min_dpi,
+            "max_dpi": self.max_dpi,
+            "max_pixels": self.max_pixels,
+            "tile_pixels": self.tile_pixels,
+            "preview_dpi": self.preview_dpi,
+            "display_list_cache": self.display_list_cache,
+            "output_dir": str(self.script_dir),
+            "budget": self._worker_budget_limits()
+        }
+    
+    def _worker_budget_limits(self) -> dict:
+        """
+        What is left of the document budget, for the budget of a render worker.
+        
+        Each worker gets the remaining wall time and the remaining pixel and
+        output-byte allowances, so it stops on its own (inside a striped
+        render, say) instead of rendering on after the document is over
+        budget. The parent still charges every result it receives.
+        
+        Returns:
+            ResourceBudget keyword arguments, or None without a budget
+        """
+        if self.budget is None:
+            return None
+        limits = self.budget.limits()
+        usage = self.budget.usage()
+        if limits["max_seconds"] is not None:
+            limits["max_seconds"] = max(0.0, limits["max_seconds"] - usage["seconds"])
+        if limits["max_pixels"] is not None:
+            limits["max_pixels"] = max(0, limits["max_pixels"] - usage["pixels"])
+        if limits["max_output_bytes"] is not None:
+            limits["max_output_bytes"] = max(0, limits["max_output_bytes"] - usage["output_bytes"])
+        return limits
+    
+    def _render_jobs(self, doc, jobs: list):
+        """
+        Render planned jobs, serially or on a process pool.
+        
+        In parallel mode each worker opens its own copy of the document once
+        (see _init_render_worker); an in-memory PDF is sent to each worker
+        once as bytes. Results are yielded in job order either way,
+        so numbering and file names do not depend on the worker count.
+        Workers enforce what is left of the budget themselves; closing the
+        generator (when the document goes over budget) cancels the jobs
+        that have not started.
+        
+        Args:
+            doc: Open PyMuPDF document (used in serial mode)
+            jobs: Job dictionaries from _plan_render_jobs
+            
+        Yields:
+            Result dictionaries from _run_render_job, in job order; None for
+            "same_as" jobs, which the caller copies from the first render
+        """
+        render_jobs = [job for job in jobs if job.get("same_as") is None]
+        if self.workers <= 1 or len(render_jobs) <= 1:
+            for job in jobs:
+                yield self._run_render_job(doc, job) if job.get("same_as") is None else None
+            return
+        
+        max_workers = min(self.workers, len(render_jobs))
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_render_worker,
+            initargs=(self.source.worker_source(), self.pdf_name, self._worker_options())
+        )
+        futures = []
+        try:
+            futures = [pool.submit(_render_job_in_worker, job) for job in render_jobs]
+            results = iter(futures)
+            for job in jobs:
+                yield next(results).result() if job.get("same_as") is None else None
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+    
+    def extract_charts(self, pages: list = None, force_all: bool = False) -> dict:
+        """
+        Extract charts from PDF pages.
+        
+        Args:
+            pages: List of specific page numbers to extract (1-indexed)
+                   If None, auto-detect pages with charts
+            force_all: If True, extract all pages (not just chart pages)
+            
+        Returns:
+            Metadata dictionary with chart information
+        """
+        self.log.info(f"\n{'='*60}")
+        self.log.info(f"📊 CHART/GRAPH EXTRACTOR - Task 2")
+        self.log.info(f"{'='*60}")
+        self.log.info(f"📁 PDF: {self.source.name}")
+        self.log.info(f"📂 Output: {self.charts_dir}")
+        if self.target_long_side:
+            self.log.info(f"🔍 DPI: adaptive ({self.min_dpi}-{self.max_dpi}, target {self.target_long_side}px)")
+        else:
+            self.log.info(f"🔍 DPI: {self.dpi}")
+        if self.max_pixels:
+            self.log.info(f"📐 Pixel budget: {self.max_pixels:,} per render")
+        if self.workers > 1:
+            self.log.info(f"⚙️  Workers: {self.workers}")
+        self.log.info(f"{'='*60}\n")
+        self.log.info(event="charts_started", pdf=self.source.name, output=str(self.charts_dir))
+        
+        if self.profiler is not None:
+            self.profiler.begin(self.source.name, "charts")
+        
+        if self.budget is not None and self.budget.started_at is None:
+            self.budget.start()
+        
+        # Open PDF
+        doc = self.source.open()
+        self.metadata["total_pages"] = len(doc)
+        
+        chart_count = 0
         
-        # Close document
-        doc.close()
+        if self.fingerprint_store:
+            self._fingerprints = PageFingerprintStore(self.fingerprint_store, self._fingerprint_settings(),
+                                                      max_bytes=self.fingerprint_max_mb * 1024 * 1024)
+            self._fingerprint_memo = {}
+        
+        rendered = None
+        try:
+            # Detect chart pages and regions (sequential, cheap)
+            jobs = self._plan_render_jobs(doc, pages=pages, force_all=force_all)
+        
+            # Render (serial or parallel) and number charts in job order
+            results = []
+            rendered = self._render_jobs(doc, jobs)
+            for done, (job, chart_info) in enumerate(zip(jobs, rendered), 1):
+                if chart_info is None:
+                    chart_info = self._copy_same_render(doc, job, results[job["same_as"]])
+                results.append(chart_info)
+                self.log.progress("chart rendering", done, len(jobs), unit="renders")
+                if "error" in chart_info:
+                    self.log.error(f"❌ Error on page {chart_info['page_number']}: {chart_info['error']}",
+                                   "chart_render_failed", page=chart_info['page_number'], error=chart_info['error'])
+                    continue
+                
+                if self._fingerprints is not None and job["fingerprint"]:
+                    if chart_info.get("reused"):
+                        self._fingerprints.reused_renders += 1
+                    else:
+                        self._fingerprints.add_render(job["fingerprint"], job["region_index"],
+                                                      chart_info, self.charts_dir)
+                
+                if self.budget is not None:
+                    self.budget.add_output_bytes(chart_info["size_bytes"])
+            
+                chart_count += 1
+                chart_info["chart_index"] = chart_count
+                self.metadata["charts"].append(chart_info)
+                if self.profiler is not None:
+                    self.profiler.checkpoint()
+            
+                if self.log.sample("chart_saved"):
+                    width, height = chart_info["width"], chart_info["height"]
+                    kind = "Cropped chart" if chart_info["cropped"] else "Full page"
+                    self.log.item("chart_saved", f"✅ {kind} saved as {chart_info['image_name']} ({width}x{height})",
+                                  page=chart_info["page_number"], image=chart_info['image_name'],
+                                  width=width, height=height, cropped=chart_info["cropped"],
+                                  reused=bool(chart_info.get("reused")))
+        finally:
+            # Stop parallel renders still queued (e.g. after BudgetExceeded)
+            if rendered is not None:
+                rendered.close()
+            
+            # Display lists reference the document, so drop them before closing
+            self._display_lists.clear()
+        
+            # Close document and its source
+            doc.close()
+            self.source.close()
+            
+            if self._fingerprints is not None:
+                self._fingerprints.close()
+                self.metadata["page_fingerprints"] = self._fingerprints.stats()
+                self._fingerprints = None
+            self._fingerprint_memo = {}
         
         # Update counts
         self.metadata["chart_pages"] = chart_count
+        if self.budget is not None:
+            self.metadata["budget_usage"] = self.budget.usage()
         
         # Save metadata
         self._save_metadata()
@@ -403,6 +1023,9 @@ class ChartExtractor:
         # Print summary
         self._print_summary()
         
+        if self.profiler is not None:
+            self.profiler.end()
+        
         return self.metadata
     
     def _save_metadata(self):
@@ -412,27 +1035,203 @@ class ChartExtractor:
         with open(metadata_path, 'w', encoding='utf-8') as f:
             json.dump(self.metadata, f, indent=2, ensure_ascii=False)
         
-        print(f"\n💾 Metadata saved: {metadata_path}")
+        self.log.info(f"\n💾 Metadata saved: {metadata_path}")
     
     def _print_summary(self):
         """Print extraction summary."""
-        print(f"\n{'='*60}")
-        print(f"✅ CHART EXTRACTION COMPLETE")
-        print(f"{'='*60}")
-        print(f"📄 PDF: {self.metadata['pdf_name']}")
-        print(f"📖 Total Pages: {self.metadata['total_pages']}")
-        print(f"📊 Charts Extracted: {self.metadata['chart_pages']}")
-        print(f"📂 Saved to: {self.charts_dir}")
-        print(f"📋 Metadata: {self.metadata_filename}")
-        print(f"{'='*60}\n")
+        self.log.info(f"\n{'='*60}")
+        self.log.info(f"✅ CHART EXTRACTION COMPLETE")
+        self.log.info(f"{'='*60}")
+        self.log.info(f"📄 PDF: {self.metadata['pdf_name']}")
+        self.log.info(f"📖 Total Pages: {self.metadata['total_pages']}")
+        self.log.info(f"📊 Charts Extracted: {self.metadata['chart_pages']}")
+        if self.metadata["raster_covered_pages"]:
+            self.log.info(f"🖼️  Scanned Pages Skipped: {len(self.metadata['raster_covered_pages'])}")
+        if "page_fingerprints" in self.metadata:
+            stats = self.metadata["page_fingerprints"]
+            self.log.info(f"🧬 Known Pages: {stats['hits']} of {stats['hits'] + stats['misses']} "
+                          f"({stats['reused_renders']} render(s) reused)")
+        self.log.info(f"📂 Saved to: {self.charts_dir}")
+        self.log.info(f"📋 Metadata: {self.metadata_filename}")
+        self.log.info(f"{'='*60}\n")
+        self.log.info(event="charts_finished", pdf=self.metadata['pdf_name'],
+                      total_pages=self.metadata['total_pages'], charts=self.metadata['chart_pages'],
+                      raster_skipped=len(self.metadata['raster_covered_pages']),
+                      page_fingerprints=self.metadata.get("page_fingerprints"))
+
+
+def _bbox_dict(region: fitz.Rect) -> dict:
+    """Chart bounding box for metadata (PDF points, 2 decimals)."""
+    return {
+        "x0": round(region.x0, 2),
+        "y0": round(region.y0, 2),
+        "x1": round(region.x1, 2),
+        "y1": round(region.y1, 2)
+    }
+
+
+class _StripedPNGWriter:
+    """
+    Minimal streaming PNG encoder for 8-bit RGB images.
+    
+    Rows are added stripe by stripe and compressed immediately, so the full
+    image never exists in memory. Each row gets the PNG filter (None, Sub,
+    Up, Average or Paeth) that makes it most compressible, chosen with NumPy,
+    as PIL's optimize=True does. Short stripes are padded with white rows
+    on close so the file always matches the declared size; if writing fails
+    the partial file is removed instead.
+    """
+    
+    # Rows filtered per NumPy pass (bounds the temporary arrays of a stripe)
+    FILTER_CHUNK_BYTES = 4 * 1024 * 1024
+    
+    def __init__(self, path: Path, width: int, height: int):
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+        self.row_bytes = width * 3
+        self.rows_written = 0
+        self.compressor = zlib.compressobj(9)
+        # Row above the next one written (zeros before the first row)
+        self._previous = np.zeros(self.row_bytes, dtype=np.uint8)
+        self.file = open(path, 'wb')
+        self.file.write(b"\x89PNG\r\n\x1a\n")
+        # 8-bit depth, colour type 2 (RGB), default compression/filter, no interlace
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    
+    def _write_chunk(self, tag: bytes, data: bytes):
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(tag)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)) & 0xFFFFFFFF))
+    
+    def _write_scanlines(self, data: bytes):
+        compressed = self.compressor.compress(data)
+        if compressed:
+            self._write_chunk(b"IDAT", compressed)
+    
+    def _filter_rows(self, pixels: np.ndarray) -> bytes:
+        """
+        Filter rows (uint8, rows x row_bytes) for PNG, picking the best filter per row.
+        
+        Returns:
+            Scanlines, each prefixed with its filter type byte
+        """
+        up = np.vstack((self._previous[None, :], pixels[:-1]))
+        self._previous = pixels[-1].copy()
+        
+        # Byte 3 to the left (one RGB pixel), zero at the row start
+        left = np.zeros_like(pixels)
+        left[:, 3:] = pixels[:, :-3]
+        up_left = np.zeros_like(up)
+        up_left[:, 3:] = up[:, :-3]
+        
+        # Paeth predictor
+        a, b, c = left.astype(np.int16), up.astype(np.int16), up_left.astype(np.int16)
+        p = a + b - c
+        pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+        paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+        average = ((a + b) >> 1).astype(np.uint8)
+        del a, b, c, p, pa, pb, pc
+        
+        # uint8 arithmetic wraps modulo 256, as PNG filters require
+        candidates = np.stack((pixels, pixels - left, pixels - up, pixels - average, pixels - paeth))
+        # Usual heuristic: smallest sum of absolute values as signed bytes
+        cost = np.abs(candidates.view(np.int8).astype(np.int16)).sum(axis=2)
+        best = cost.argmin(axis=0)
+        
+        out = np.empty((len(pixels), self.row_bytes + 1), dtype=np.uint8)
+        out[:, 0] = best
+        out[:, 1:] = candidates[best, np.arange(len(pixels))]
+        return out.tobytes()
+    
+    def write_rows(self, samples, stride: int, rows: int):
+        """Append rows from a pixmap sample buffer."""
+        rows = min(rows, self.height - self.rows_written)
+        if rows <= 0:
+            return
+        
+        buffer = np.frombuffer(samples, dtype=np.uint8)
+        if len(buffer) >= rows * stride and stride >= self.row_bytes:
+            pixels = buffer[:rows * stride].reshape(rows, stride)[:, :self.row_bytes]
+        else:
+            # Short buffer: pad the missing bytes with white
+            pixels = np.full((rows, self.row_bytes), 255, dtype=np.uint8)
+            for r in range(rows):
+                row = buffer[r * stride:r * stride + self.row_bytes]
+                pixels[r, :len(row)] = row
+        
+        chunk = max(1, self.FILTER_CHUNK_BYTES // self.row_bytes)
+        for start in range(0, rows, chunk):
+            self._write_scanlines(self._filter_rows(pixels[start:start + chunk]))
+        self.rows_written += rows
+    
+    def close(self):
+        """Pad any missing rows, flush the compressor and finish the file."""
+        chunk = max(1, self.FILTER_CHUNK_BYTES // self.row_bytes)
+        while self.rows_written < self.height:
+            rows = min(chunk, self.height - self.rows_written)
+            self.write_rows(bytes([255]) * (rows * self.row_bytes), self.row_bytes, rows)
+        self._write_chunk(b"IDAT", self.compressor.flush())
+        self._write_chunk(b"IEND", b"")
+        self.file.close()
+    
+    def abort(self):
+        """Close and delete the unfinished file, so no truncated PNG is left behind."""
+        self.file.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+# Per-process state for parallel rendering (see ChartExtractor._render_jobs)
+_worker_extractor = None
+_worker_doc = None
+
+
+def _init_render_worker(pdf_source, pdf_name: str, options: dict):
+    """Open the PDF once in a render worker and keep it for all of its jobs."""
+    global _worker_extractor, _worker_doc
+    options = dict(options)
+    limits = options.pop("budget", None)
+    budget = ResourceBudget(**limits) if limits is not None else None
+    _worker_extractor = ChartExtractor(pdf_source, pdf_name=pdf_name, budget=budget, **options)
+    _worker_doc = _worker_extractor.source.open()
+    if budget is not None:
+        budget.start()
+
+
+def _render_job_in_worker(job: dict) -> dict:
+    """Render one job using the worker's own document, charging its own budget."""
+    budget = _worker_extractor.budget
+    if budget is not None:
+        # Raises without rendering once this worker is out of time or bytes
+        budget.add_output_bytes(0)
+    chart_info = _worker_extractor._run_render_job(_worker_doc, job)
+    if budget is not None and "size_bytes" in chart_info:
+        budget.add_output_bytes(chart_info["size_bytes"])
+    return chart_info
 
 
 def main():
     """Main function to run chart extraction."""
     
-    print(f"\n{'='*60}")
-    print(f"📊 CHART/GRAPH EXTRACTOR - Task 2")
-    print(f"{'='*60}\n")
+    # Console/JSON logging: --quiet, --log-level, --log-json, --log-items, --progress-interval
+    log = configure_from_argv(sys.argv)
+    
+    log.info(f"\n{'='*60}")
+    log.info(f"📊 CHART/GRAPH EXTRACTOR - Task 2")
+    log.info(f"{'='*60}\n")
     
     # Check command line arguments
     if len(sys.argv) < 2:
@@ -442,6 +1241,22 @@ def main():
         print("  --pages 1,3,5,9    Extract specific pages (comma-separated)")
         print("  --all              Extract ALL pages (not just chart pages)")
         print("  --dpi 150          Set resolution (default: 150)")
+        print("  --workers 4        Render in parallel processes (0 = all cores)")
+        print("  --target-px 2000   Adaptive DPI: aim for this long side in pixels")
+        print("  --min-dpi 72       Lowest DPI in adaptive mode (default: 72)")
+        print("  --max-dpi 300      Highest DPI in adaptive mode (default: 300)")
+        print("  --max-pixels N     Hard pixel budget per render (e.g. 40000000)")
+        print("  --tile-pixels N    Render larger images in stripes of N pixels")
+        print("  --preview-dpi 48   Also save a low-resolution preview of each chart")
+        print("  --raster-coverage 0.9  Skip pages this covered by an embedded image (0 = off)")
+        print("  --fingerprints DIR Reuse results for pages seen in earlier PDFs (kept in DIR)")
+        print("  --fingerprints-max-mb 1024  Store size limit before old pages are evicted")
+        print("  --profile-memory memory_profile.json  Record peak heap/RSS/MuPDF store")
+        print("  --quiet            Only warnings and errors on the console")
+        print("  --log-level info   debug shows every page and chart")
+        print("  --log-json events.jsonl  Also append JSON-lines events to this file")
+        print("  --log-items 100    Show every 100th per-page/per-chart line (default: none)")
+        print("  --progress-interval 1  Seconds between progress lines (0 = off)")
         print("\nExamples:")
         print('  python chart_extractor.py "..\\pdfs\\Report.pdf"')
         print('  python chart_extractor.py "..\\pdfs\\Report.pdf" --pages 3,9,20')
@@ -452,6 +1267,18 @@ def main():
     pages = None
     force_all = False
     dpi = 150
+    workers = 1
+    target_long_side = None
+    min_dpi = 72
+    max_dpi = 300
+    max_pixels = None
+    tile_pixels = None
+    preview_dpi = None
+    raster_coverage_threshold = 0.9
+    fingerprint_store = None
+    fingerprint_max_mb = 1024
+    profiler = None
+    profile_path = None
     
     # Parse additional arguments
     i = 2
@@ -469,12 +1296,53 @@ def main():
         elif arg == "--dpi" and i + 1 < len(sys.argv):
             dpi = int(sys.argv[i + 1])
             i += 2
+        elif arg == "--workers" and i + 1 < len(sys.argv):
+            workers = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--target-px" and i + 1 < len(sys.argv):
+            target_long_side = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--min-dpi" and i + 1 < len(sys.argv):
+            min_dpi = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--max-dpi" and i + 1 < len(sys.argv):
+            max_dpi = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--max-pixels" and i + 1 < len(sys.argv):
+            max_pixels = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--tile-pixels" and i + 1 < len(sys.argv):
+            tile_pixels = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--preview-dpi" and i + 1 < len(sys.argv):
+            preview_dpi = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--raster-coverage" and i + 1 < len(sys.argv):
+            raster_coverage_threshold = float(sys.argv[i + 1])
+            i += 2
+        elif arg == "--fingerprints" and i + 1 < len(sys.argv):
+            fingerprint_store = sys.argv[i + 1]
+            i += 2
+        elif arg == "--fingerprints-max-mb" and i + 1 < len(sys.argv):
+            fingerprint_max_mb = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--profile-memory" and i + 1 < len(sys.argv):
+            from mem_profiler import MemoryProfiler
+            profiler = MemoryProfiler()
+            profile_path = sys.argv[i + 1]
+            i += 2
         else:
             i += 1
     
     # Run extraction
     try:
-        extractor = ChartExtractor(pdf_path, dpi=dpi)
+        extractor = ChartExtractor(
+            pdf_path, dpi=dpi, workers=workers,
+            target_long_side=target_long_side, min_dpi=min_dpi, max_dpi=max_dpi,
+            max_pixels=max_pixels, tile_pixels=tile_pixels, preview_dpi=preview_dpi,
+            raster_coverage_threshold=raster_coverage_threshold, profiler=profiler,
+            fingerprint_store=fingerprint_store, fingerprint_max_mb=fingerprint_max_mb
+        )
         extractor.extract_charts(pages=pages, force_all=force_all)
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
@@ -484,6 +1352,12 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        log.close()
+        if profiler is not None:
+            # Records a failed stage; no-op if extraction finished
+            profiler.end(failed=True)
+            profiler.save(profile_path)
 
 
 if __name__ == "__main__":
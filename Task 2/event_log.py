@@ -0,0 +1,313 @@
+"""
+================================================================================
+EVENT LOG - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Keep console output cheap on 100k-image batches and make it parseable,
+      instead of several emoji prints per image and page
+
+How it works:
+- Messages have a level (debug, info, warning, error); lines below the
+  log level are dropped
+- Quiet mode keeps warnings and errors on the console and drops the rest
+  (banners, summaries, progress)
+- Per-item events (one image, one page, one OCR result) are off by default;
+  item_sample=N shows every Nth of each kind, level "debug" shows them all.
+  Call sites ask sample() first, so items that are not shown cost no
+  message formatting
+- Progress is rate-limited: at most one line per interval (1 s by default)
+  per stage, with items/s and ETA, plus a final line when a stage finishes
+- Optionally every event is also written as one JSON object per line to a
+  file; lines are buffered and written in blocks (warnings and errors
+  right away)
+- Extractors take log=None and use the shared default log, which the
+  command-line tools set up from --quiet / --log-level / --log-json /
+  --log-items / --progress-interval
+
+Dependencies:
+- None (standard library)
+
+Output:
+- Console lines, and optionally a JSON-lines event file such as
+  {"ts": 1700000000.123, "level": "info", "event": "image_saved", ...}
+================================================================================
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+# JSON lines kept in memory before they are written out
+BUFFER_LINES = 500
+
+
+def _format_duration(seconds: float) -> str:
+    """Short h/m/s form for ETAs."""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class EventLog:
+    """
+    Leveled console output plus an optional buffered JSON-lines event file.
+    """
+    
+    def __init__(self, level: str = "info", quiet: bool = False, json_path: str = None,
+                 item_sample: int = 0, progress_interval: float = 1.0, stream=None):
+        """
+        Initialize the log.
+        
+        Args:
+            level: Lowest level written, "debug", "info", "warning" or "error"
+            quiet: Only warnings and errors on the console (the JSON file
+                   still gets every event at or above level)
+            json_path: File to append JSON-lines events to (None = no file)
+            item_sample: Show every Nth per-item event of each kind
+                         (0 = none unless level is "debug")
+            progress_interval: Seconds between progress lines per stage
+                               (0 = no progress lines)
+            stream: Console stream (default: sys.stdout at the time of writing)
+        
+        Raises:
+            ValueError: Unknown level
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level: {level} (choose from {', '.join(LEVELS)})")
+        self.level = LEVELS[level]
+        self.quiet = quiet
+        self.console_level = max(self.level, LEVELS["warning"]) if quiet else self.level
+        self.item_sample = max(0, int(item_sample or 0))
+        self.progress_interval = progress_interval or 0
+        self.stream = stream
+        self.json_path = json_path
+        
+        self._item_counts = {}
+        self._progress = {}
+        self._buffer = []
+        self._pid = os.getpid()
+        self._json_file = None
+        if json_path:
+            self._json_file = open(json_path, 'a', encoding='utf-8')
+            atexit.register(self.close)
+    
+    def enabled(self, level: str) -> bool:
+        """True if messages of this level go anywhere (skip building them if not)."""
+        return LEVELS[level] >= self.level
+    
+    def _write_console(self, message: str):
+        print(message, file=self.stream if self.stream is not None else sys.stdout)
+    
+    def _write_json(self, level: str, event: str, message, fields: dict):
+        if os.getpid() != self._pid:
+            # Forked worker: drop the parent's pending lines so they are not written twice
+            self._buffer = []
+            self._pid = os.getpid()
+        
+        record = {"ts": round(time.time(), 3), "level": level, "event": event}
+        if message is not None:
+            record["message"] = message.strip()
+        record.update(fields)
+        self._buffer.append(json.dumps(record, ensure_ascii=False, default=str))
+        
+        if len(self._buffer) >= BUFFER_LINES or LEVELS[level] >= LEVELS["warning"]:
+            self.flush()
+    
+    def log(self, level: str, message: str = None, event: str = None, **fields):
+        """
+        Write one message.
+        
+        Args:
+            level: "debug", "info", "warning" or "error"
+            message: Console text (None = JSON event only)
+            event: Event name for the JSON file; messages without one are
+                   console-only unless they are warnings or errors
+            **fields: Extra JSON fields (must be JSON-serializable or str()-able)
+        """
+        value = LEVELS[level]
+        if value < self.level:
+            return
+        if message is not None and value >= self.console_level:
+            self._write_console(message)
+        if self._json_file is not None and (event or value >= LEVELS["warning"]):
+            self._write_json(level, event or level, message, fields)
+    
+    def debug(self, message: str = None, event: str = None, **fields):
+        self.log("debug", message, event, **fields)
+    
+    def info(self, message: str = None, event: str = None, **fields):
+        self.log("info", message, event, **fields)
+    
+    def warning(self, message: str = None, event: str = None, **fields):
+        self.log("warning", message, event, **fields)
+    
+    def error(self, message: str = None, event: str = None, **fields):
+        self.log("error", message, event, **fields)
+    
+    def sample(self, event: str) -> bool:
+        """
+        Count one per-item event and decide whether it is written.
+        
+        Call this before building the message, and call item() only when it
+        returns True:
+            
+            if log.sample("image_saved"):
+                log.item("image_saved", f"✅ Extracted: {name}", image=name)
+        
+        Args:
+            event: Event name (sampling counts each name separately)
+        
+        Returns:
+            True at debug level, or for every item_sample-th event of this name
+        """
+        if self.level <= LEVELS["debug"]:
+            return True
+        if not self.item_sample:
+            return False
+        count = self._item_counts.get(event, 0) + 1
+        self._item_counts[event] = count
+        return (count - 1) % self.item_sample == 0
+    
+    def item(self, event: str, message: str = None, **fields):
+        """
+        Write a per-item event that sample() selected.
+        
+        Args:
+            event: Event name
+            message: Console text
+            **fields: Extra JSON fields
+        """
+        if self.level <= LEVELS["debug"]:
+            self.log("debug", message, event, **fields)
+        else:
+            self.log("info", message, event, sample=self.item_sample, **fields)
+    
+    def progress(self, stage: str, done: int, total: int = None, unit: str = "items"):
+        """
+        Report progress, at most once per progress_interval per stage.
+        
+        The first call for a stage starts its clock (items already done
+        then, e.g. resumed ones, do not count towards the rate); a call with
+        done == 0 or a smaller count than before starts it again, and the
+        call with done == total always reports and ends the stage.
+        
+        Args:
+            stage: Stage name, e.g. "images" or "ocr"
+            done: Items finished so far
+            total: Items expected (None = unknown, no ETA)
+            unit: Word used for the items on the console
+        """
+        now = time.monotonic()
+        state = self._progress.get(stage)
+        if state is None or done == 0 or done < state["last"]:
+            state = self._progress[stage] = {"started": now, "reported": now, "first": done, "last": done}
+        state["last"] = done
+        
+        finished = total is not None and done >= total
+        if not finished and (not self.progress_interval or now - state["reported"] < self.progress_interval):
+            return
+        state["reported"] = now
+        if finished:
+            del self._progress[stage]
+        
+        elapsed = now - state["started"]
+        rate = (done - state["first"]) / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if total is not None and rate > 0 else None
+        
+        if total is not None:
+            text = f"⏳ {stage}: {done}/{total} {unit} ({rate:.1f}/s"
+            text += ", done)" if finished else (f", ETA {_format_duration(eta)})" if eta is not None else ")")
+        else:
+            text = f"⏳ {stage}: {done} {unit} ({rate:.1f}/s)"
+        
+        self.log("info", text if self.progress_interval else None, "progress", stage=stage, done=done,
+                 total=total, per_second=round(rate, 2),
+                 eta_seconds=round(eta, 1) if eta is not None else None)
+    
+    def flush(self):
+        """Write buffered JSON lines to the event file."""
+        if self._json_file is not None and self._buffer:
+            self._json_file.write("\n".join(self._buffer) + "\n")
+            self._json_file.flush()
+            self._buffer = []
+    
+    def close(self):
+        """Flush and close the event file (safe to call more than once)."""
+        if self._json_file is not None:
+            self.flush()
+            self._json_file.close()
+            self._json_file = None
+
+
+# Shared log used by extractors created without log=...
+_default_log = None
+
+
+def get_log() -> EventLog:
+    """The shared default log (info level, console only, until configured)."""
+    global _default_log
+    if _default_log is None:
+        _default_log = EventLog()
+    return _default_log
+
+
+def configure(**options) -> EventLog:
+    """
+    Replace the shared default log.
+    
+    Args:
+        **options: EventLog arguments (level, quiet, json_path, item_sample, ...)
+    
+    Returns:
+        The new default log
+    """
+    global _default_log
+    if _default_log is not None:
+        _default_log.close()
+    _default_log = EventLog(**options)
+    return _default_log
+
+
+def configure_from_argv(argv: list) -> EventLog:
+    """
+    Set up the default log from command-line flags and remove them from argv.
+    
+    Flags: --quiet, --log-level LEVEL, --log-json PATH, --log-items N,
+    --progress-interval SECONDS
+    
+    Args:
+        argv: Argument list, usually sys.argv (edited in place)
+    
+    Returns:
+        The configured default log
+    """
+    options = {}
+    value_flags = {
+        "--log-level": ("level", str),
+        "--log-json": ("json_path", str),
+        "--log-items": ("item_sample", int),
+        "--progress-interval": ("progress_interval", float)
+    }
+    
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--quiet":
+            options["quiet"] = True
+            del argv[i]
+        elif arg in value_flags and i + 1 < len(argv):
+            name, convert = value_flags[arg]
+            options[name] = convert(argv[i + 1])
+            del argv[i:i + 2]
+        else:
+            i += 1
+    
+    return configure(**options) if options else get_log()
@@ -0,0 +1,738 @@
+"""
+================================================================================
+EXTRACTION SERVICE - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Serve image, chart and OCR extraction over local HTTP without
+      starting a new Python process for every document
+
+How it works:
+- asyncio HTTP server (standard library only) on localhost
+- POST /jobs queues a job for a PDF path (JSON body) or an uploaded PDF
+  (application/pdf body); a full queue answers 429 with Retry-After
+- Clients may only set the per-stage options in STAGE_OPTIONS; output
+  folders, engines and caches are the service's own settings
+- Each stage (images, charts, ocr) runs the existing extractor in its own
+  process pool, so stage concurrency is configured separately and the OCR
+  model stays loaded in its workers between jobs
+- GET /jobs/<id> reports status; GET /jobs/<id>/result streams the records
+  back as JSON once the job is done
+- OCR reads the metadata file the images/charts stage of the same job
+  wrote (or, for OCR-only jobs, the one in the service's output folder)
+- Uploaded PDFs are deleted once their job has finished
+- Stage workers are spawned, not forked, so they never hold the listening
+  socket; SIGTERM shuts the pools down like Ctrl+C
+- ExtractionClient is a small blocking client for scripts and tests
+
+Dependencies:
+- None beyond the extractors themselves (image_extractor.py,
+  chart_extractor.py, ocr_extractor.py)
+
+Usage:
+- python extraction_service.py                    (listens on 127.0.0.1:8780)
+- python extraction_service.py --image-workers 2 --ocr-workers 1 --queue 16
+- python extraction_service.py --submit "..\\pdfs\\File.pdf" --stages images,charts,ocr
+================================================================================
+"""
+
+import asyncio
+import http.client
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+from event_log import configure_from_argv, get_log
+from pdf_source import HEADER_WINDOW, looks_like_pdf
+
+
+DEFAULT_ADDRESS = "127.0.0.1:8780"
+
+STAGES = ("images", "charts", "ocr")
+
+STATUS_TEXT = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+    429: "Too Many Requests", 500: "Internal Server Error"
+}
+
+
+# Options a client may set per stage. Anything else (output_dir, engine,
+# cache_path, workers, ...) is service configuration and is rejected with 400
+STAGE_OPTIONS = {
+    "images": ("save_as_png", "pages", "max_images", "max_bytes"),
+    "charts": ("pages", "force_all", "dpi", "target_long_side", "min_dpi", "max_dpi",
+               "max_pixels", "tile_pixels", "preview_dpi", "raster_coverage_threshold"),
+    "ocr": ("batch_size", "lang", "min_score", "text_gate_threshold", "max_side", "min_side",
+            "max_upscale", "native_text", "native_min_words", "image_timeout", "document_timeout")
+}
+
+# Per-process OCR engines, kept warm across jobs (see _run_stage)
+_ocr_engines = {}
+
+
+def _run_stage(stage: str, pdf_path: str, options: dict, output_dir: str,
+               metadata_path: str = None) -> tuple:
+    """
+    Run one extraction stage in a stage worker process.
+    
+    Args:
+        stage: "images", "charts", "ocr_images" or "ocr_charts"
+        pdf_path: PDF to process
+        options: Keyword arguments for the extractor
+        output_dir: Folder the extractors write to
+        metadata_path: OCR input written by an earlier stage (None = the
+                       default file for this PDF in output_dir)
+    
+    Returns:
+        Tuple of (metadata dictionary, path of the metadata file written)
+    """
+    # Imported here so the server process itself stays light
+    if stage == "images":
+        from image_extractor import ImageExtractor
+        extractor = ImageExtractor(pdf_path, output_dir=output_dir)
+        metadata = extractor.extract_images(**options)
+        return metadata, str(extractor.output_dir / extractor.metadata_filename)
+    
+    if stage == "charts":
+        from chart_extractor import ChartExtractor
+        options = dict(options)
+        run_options = {key: options.pop(key) for key in ("pages", "force_all") if key in options}
+        extractor = ChartExtractor(pdf_path, output_dir=output_dir, **options)
+        metadata = extractor.extract_charts(**run_options)
+        return metadata, str(extractor.script_dir / extractor.metadata_filename)
+    
+    from ocr_engines import create_engine
+    from ocr_extractor import OCRExtractor
+    
+    options = dict(options)
+    lang = options.get("lang", "en")
+    engine_key = (options.get("engine"), lang, json.dumps(options.get("engine_options"), sort_keys=True))
+    if engine_key not in _ocr_engines:
+        _ocr_engines[engine_key] = create_engine(options.get("engine"), lang=lang,
+                                                 **(options.get("engine_options") or {}))
+    options["engine"] = _ocr_engines[engine_key]
+    options.pop("engine_options", None)
+    
+    if metadata_path is None:
+        pdf_name = Path(pdf_path).stem
+        prefix = "charts_metadata" if stage == "ocr_charts" else "metadata"
+        metadata_path = str(Path(output_dir) / f"{prefix} ({pdf_name}).json")
+    extractor = OCRExtractor(metadata_path=metadata_path, output_dir=output_dir, **options)
+    return extractor.run_ocr(), str(extractor.output_dir / extractor.output_filename)
+
+
+class ExtractionJob:
+    """One queued PDF and what has happened to it so far."""
+    
+    def __init__(self, pdf_path: Path, stages: list, options: dict):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.pdf_path = pdf_path
+        self.stages = stages
+        self.options = options
+        self.status = "queued"
+        self.stage = None
+        self.stages_done = []
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.results = {}
+        # Metadata files written by this job's stages ("images", "charts")
+        self.metadata_paths = {}
+        # uploads/<id>/ folder for uploaded PDFs (None for PDFs given by path)
+        self.upload_dir = None
+    
+    def info(self) -> dict:
+        """Status reply for GET /jobs/<id>."""
+        return {
+            "job_id": self.job_id,
+            "pdf_name": self.pdf_path.name,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": self.stages,
+            "stages_done": self.stages_done,
+            "error": self.error,
+            "submitted": datetime.fromtimestamp(self.submitted).isoformat(),
+            "seconds": round((self.finished or time.time()) - (self.started or self.submitted), 3),
+            "counts": {key: len(records) for key, records in self.results.items()}
+        }
+
+
+class ExtractionService:
+    """
+    Local HTTP front end for the extractors with a bounded job queue.
+    """
+    
+    def __init__(self, address: str = DEFAULT_ADDRESS, queue_size: int = 16,
+                 image_workers: int = 2, chart_workers: int = 1, ocr_workers: int = 1,
+                 max_upload_mb: int = 200, keep_jobs: int = 100, ocr_options: dict = None,
+                 output_dir: str = None, log=None):
+        """
+        Initialize the Extraction Service.
+        
+        Args:
+            address: "host:port" to listen on
+            queue_size: Jobs allowed to wait; beyond this POST /jobs gets 429
+            image_workers: Processes for the image stage
+            chart_workers: Processes for the chart stage
+            ocr_workers: Processes for the OCR stage (one warm model each)
+            max_upload_mb: Largest accepted request body
+            keep_jobs: Finished jobs kept for status/result requests
+            ocr_options: Default OCRExtractor options (engine, lang, ...)
+            output_dir: Folder for extraction output and uploads (default:
+                        Task 2 folder)
+            log: Optional EventLog (event_log.py); default is the shared log
+        """
+        self.address = address
+        self.queue_size = max(1, queue_size)
+        self.stage_workers = {
+            "images": max(1, image_workers),
+            "charts": max(1, chart_workers),
+            "ocr": max(1, ocr_workers)
+        }
+        self.max_upload_bytes = max_upload_mb * 1024 * 1024
+        self.keep_jobs = keep_jobs
+        self.ocr_options = ocr_options or {}
+        self.log = log if log is not None else get_log()
+        
+        self.script_dir = Path(__file__).parent.resolve()
+        self.output_dir = Path(output_dir).resolve() if output_dir else self.script_dir
+        self.uploads_dir = self.output_dir / "uploads"
+        
+        self.queue = None
+        self.executors = {}
+        self.jobs = OrderedDict()
+        # Jobs for PDFs with the same file name share output folders
+        self.name_locks = {}
+        self.rejected = 0
+        self._loop = None
+        self._stopping = None
+    
+    def _create_job(self, pdf_path: Path, stages, options) -> ExtractionJob:
+        """Validate a submission and build its job. Raises ValueError if invalid."""
+        stages = stages or ["images", "ocr"]
+        if isinstance(stages, str):
+            stages = [s.strip() for s in stages.split(",") if s.strip()]
+        unknown = [s for s in stages if s not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (use {', '.join(STAGES)})")
+        if not pdf_path.is_file():
+            raise ValueError(f"PDF file not found: {pdf_path}")
+        with open(pdf_path, 'rb') as f:
+            if not looks_like_pdf(f.read(HEADER_WINDOW)):
+                raise ValueError(f"File is not a PDF: {pdf_path}")
+        
+        options = options or {}
+        if not isinstance(options, dict) or any(not isinstance(options.get(s, {}), dict) for s in STAGES):
+            raise ValueError("options must map stage names to keyword arguments")
+        unknown = [s for s in options if s not in STAGES]
+        if unknown:
+            raise ValueError(f"Options for unknown stage(s): {', '.join(unknown)}")
+        for stage, stage_options in options.items():
+            rejected = sorted(key for key in stage_options if key not in STAGE_OPTIONS[stage])
+            if rejected:
+                raise ValueError(f"Option(s) not allowed for {stage}: {', '.join(rejected)} "
+                                 f"(use {', '.join(STAGE_OPTIONS[stage])})")
+        
+        # Keep the requested order but always run extraction before OCR
+        return ExtractionJob(pdf_path, [s for s in STAGES if s in stages], options)
+    
+    def _remember(self, job: ExtractionJob):
+        """Track a job, forgetting the oldest finished ones beyond keep_jobs."""
+        self.jobs[job.job_id] = job
+        finished = [j for j in self.jobs.values() if j.status in ("done", "failed")]
+        for old in finished[:max(0, len(finished) - self.keep_jobs)]:
+            del self.jobs[old.job_id]
+    
+    async def _run_job(self, job: ExtractionJob):
+        """Run a job's stages, each in its own stage pool."""
+        loop = asyncio.get_running_loop()
+        lock = self.name_locks.setdefault(job.pdf_path.name.lower(), asyncio.Lock())
+        
+        async with lock:
+            job.status = "running"
+            job.started = time.time()
+            try:
+                for stage in job.stages:
+                    job.stage = stage
+                    options = job.options.get(stage, {})
+                    
+                    if stage == "ocr":
+                        options = dict(self.ocr_options, **options)
+                        # OCR whatever this job (or an earlier run) extracted
+                        targets = [key for key in ("images", "charts") if key in job.stages] or ["images"]
+                        for key in targets:
+                            metadata, _ = await loop.run_in_executor(
+                                self.executors["ocr"], _run_stage, f"ocr_{key}", str(job.pdf_path), options,
+                                str(self.output_dir), job.metadata_paths.get(key)
+                            )
+                            job.results[key] = metadata.get(key, [])
+                    else:
+                        metadata, metadata_path = await loop.run_in_executor(
+                            self.executors[stage], _run_stage, stage, str(job.pdf_path), options,
+                            str(self.output_dir)
+                        )
+                        job.results[stage] = metadata.get(stage, [])
+                        job.metadata_paths[stage] = metadata_path
+                    
+                    job.stages_done.append(stage)
+                
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+                self.log.error(f"❌ Job {job.job_id} ({job.pdf_path.name}) failed in {job.stage}: {job.error}",
+                               "job_failed", job=job.job_id, pdf=job.pdf_path.name, stage=job.stage, error=job.error)
+            finally:
+                job.stage = None
+                job.finished = time.time()
+                if job.upload_dir is not None:
+                    # Results are kept in memory; the uploaded PDF is not needed anymore
+                    shutil.rmtree(job.upload_dir, ignore_errors=True)
+    
+    async def _job_runner(self):
+        """Take jobs off the queue one at a time."""
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run_job(job)
+            finally:
+                self.queue.task_done()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple:
+        """
+        Read one HTTP request.
+        
+        Returns:
+            Tuple of (method, path, query, headers, body); method is None at EOF
+            and body is None when it exceeds max_upload_bytes
+        """
+        line = await reader.readline()
+        if not line:
+            return None, None, None, None, None
+        
+        method, target, _ = line.decode('latin-1').split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        length = int(headers.get("content-length", 0) or 0)
+        if length > self.max_upload_bytes:
+            body = None
+        else:
+            body = await reader.readexactly(length) if length else b""
+        
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        return method.upper(), url.path, query, headers, body
+    
+    @staticmethod
+    def _response_head(status: int, headers: dict) -> bytes:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+    
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: dict, headers: dict = None):
+        """Send a complete JSON response."""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = {"Content-Type": "application/json", "Content-Length": len(body)}
+        head.update(headers or {})
+        writer.write(self._response_head(status, head) + body)
+        await writer.drain()
+    
+    async def _stream_result(self, writer: asyncio.StreamWriter, job: ExtractionJob):
+        """
+        Stream a finished job's records as one JSON document, chunk by chunk,
+        so large results never have to be serialized in one piece.
+        """
+        writer.write(self._response_head(200, {
+            "Content-Type": "application/json",
+            "Transfer-Encoding": "chunked"
+        }))
+        
+        def chunk(text: str):
+            data = text.encode('utf-8')
+            writer.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        
+        chunk(json.dumps({"job_id": job.job_id, "pdf_name": job.pdf_path.name, "status": job.status})[:-1])
+        for key, records in job.results.items():
+            chunk(f", {json.dumps(key)}: [")
+            for n, record in enumerate(records):
+                chunk(("," if n else "") + json.dumps(record, ensure_ascii=False))
+                await writer.drain()
+            chunk("]")
+        chunk("}")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+    
+    def _save_upload(self, body: bytes, name: str) -> Path:
+        """Store an uploaded PDF under uploads/<id>/ and return its path."""
+        name = Path(name or "upload.pdf").name
+        if not name.lower().endswith(".pdf"):
+            name += ".pdf"
+        folder = self.uploads_dir / uuid.uuid4().hex[:12]
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / name
+        path.write_bytes(body)
+        return path
+    
+    async def _submit(self, writer, query: dict, headers: dict, body: bytes):
+        """POST /jobs"""
+        if body is None:
+            await self._send_json(writer, 413, {"error": f"Body larger than {self.max_upload_bytes} bytes"})
+            return
+        
+        if self.queue.full():
+            self.rejected += 1
+            await self._send_json(writer, 429, {"error": "busy", "queued": self.queue.qsize()},
+                                  {"Retry-After": 1})
+            return
+        
+        try:
+            if headers.get("content-type", "").startswith("application/pdf"):
+                if not looks_like_pdf(body[:HEADER_WINDOW]):
+                    raise ValueError("Uploaded body is not a PDF")
+                pdf_path = self._save_upload(body, query.get("name"))
+                try:
+                    job = self._create_job(pdf_path, query.get("stages"), None)
+                except ValueError:
+                    shutil.rmtree(pdf_path.parent, ignore_errors=True)
+                    raise
+                job.upload_dir = pdf_path.parent
+            else:
+                request = json.loads(body or b"{}")
+                pdf_path = Path(request.get("pdf_path", "")).expanduser().resolve()
+                job = self._create_job(pdf_path, request.get("stages"), request.get("options"))
+        except ValueError as e:
+            await self._send_json(writer, 400, {"error": str(e)})
+            return
+        
+        self.queue.put_nowait(job)
+        self._remember(job)
+        await self._send_json(writer, 202, job.info(), {"Location": f"/jobs/{job.job_id}"})
+    
+    async def _route(self, writer, method: str, path: str, query: dict, headers: dict, body: bytes):
+        """Dispatch one request."""
+        parts = [p for p in path.split("/") if p]
+        
+        if parts == ["health"]:
+            await self._send_json(writer, 200, {
+                "ok": True,
+                "queued": self.queue.qsize(),
+                "queue_size": self.queue_size,
+                "stage_workers": self.stage_workers,
+                "running": sum(1 for j in self.jobs.values() if j.status == "running"),
+                "rejected": self.rejected
+            })
+            return
+        
+        if parts == ["jobs"]:
+            if method != "POST":
+                await self._send_json(writer, 405, {"error": "Use POST to submit a job"})
+                return
+            await self._submit(writer, query, headers, body)
+            return
+        
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await self._send_json(writer, 404, {"error": f"Unknown job: {parts[1]}"})
+            elif len(parts) == 2:
+                await self._send_json(writer, 200, job.info())
+            elif parts[2] == "result" and job.status in ("done", "failed"):
+                await self._stream_result(writer, job)
+            elif parts[2] == "result":
+                await self._send_json(writer, 409, dict(error="Job not finished", **job.info()))
+            else:
+                await self._send_json(writer, 404, {"error": f"Not found: {path}"})
+            return
+        
+        await self._send_json(writer, 404, {"error": f"Not found: {path}"})
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests from one connection (keep-alive) until it closes."""
+        try:
+            while True:
+                method, path, query, headers, body = await self._read_request(reader)
+                if method is None:
+                    break
+                try:
+                    await self._route(writer, method, path, query, headers, body)
+                except Exception as e:
+                    await self._send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+                if body is None or headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    async def serve(self):
+        """Start the stage pools and serve until interrupted."""
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        # Forked workers (started lazily, after binding) would inherit the
+        # listening socket and keep the port open after the service exits
+        context = multiprocessing.get_context("spawn")
+        self.executors = {
+            stage: ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            for stage, workers in self.stage_workers.items()
+        }
+        # Enough runners that every stage pool can be busy at once
+        runners = [asyncio.ensure_future(self._job_runner())
+                   for _ in range(sum(self.stage_workers.values()))]
+        
+        host, port = self.address.rsplit(":", 1)
+        server = await asyncio.start_server(self._handle_client, host, int(port))
+        # Port 0 picks a free port; report the real one
+        self.address = f"{host}:{server.sockets[0].getsockname()[1]}"
+        
+        self.log.info(f"✅ Extraction service listening on http://{self.address}")
+        self.log.info(f"   Workers: {self.stage_workers['images']} image, {self.stage_workers['charts']} chart, "
+                      f"{self.stage_workers['ocr']} OCR; queue: {self.queue_size}\n")
+        self.log.info(event="service_started", address=self.address, stage_workers=self.stage_workers,
+                      queue_size=self.queue_size)
+        
+        # SIGTERM (service managers, docker stop) ends serving like Ctrl+C
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            self._loop.add_signal_handler(signal.SIGTERM, self._stopping.set)
+        except (NotImplementedError, AttributeError, RuntimeError):
+            pass  # Windows, or not the main thread: no signal handlers in the event loop
+        
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            for runner in runners:
+                runner.cancel()
+            for executor in self.executors.values():
+                executor.shutdown(wait=False)
+    
+    def stop(self):
+        """Stop serve() (safe to call from another thread)."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+
+class ServiceBusyError(RuntimeError):
+    """The service kept answering 429 (queue full)."""
+
+
+class ExtractionClient:
+    """
+    Blocking client for ExtractionService (also a stand-in for the web tier
+    in tests). Waits out 429 replies before giving up.
+    """
+    
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 60.0, busy_retries: int = 30):
+        """
+        Args:
+            address: "host:port" of the service
+            timeout: Socket timeout per request, in seconds
+            busy_retries: How many 429 replies to wait out when submitting
+        """
+        self.address = address
+        self.timeout = timeout
+        self.busy_retries = busy_retries
+    
+    def _request(self, method: str, path: str, body: bytes = None, headers: dict = None) -> tuple:
+        """Send one request. Returns (status, headers, parsed JSON body)."""
+        host, port = self.address.rsplit(":", 1)
+        conn = http.client.HTTPConnection(host, int(port), timeout=self.timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            # http.client reassembles chunked (streamed) responses
+            payload = json.loads(response.read() or b"{}")
+            return response.status, dict(response.getheaders()), payload
+        finally:
+            conn.close()
+    
+    def _submit(self, body: bytes, headers: dict, path: str = "/jobs") -> str:
+        for attempt in range(self.busy_retries + 1):
+            status, reply_headers, reply = self._request("POST", path, body, headers)
+            if status == 202:
+                return reply["job_id"]
+            if status != 429:
+                raise RuntimeError(f"Submit failed ({status}): {reply.get('error')}")
+            time.sleep(float(reply_headers.get("Retry-After", 1)) * (1 + attempt / 4))
+        raise ServiceBusyError(f"Extraction service at {self.address} stayed busy")
+    
+    def submit(self, pdf_path: str, stages: list = None, options: dict = None) -> str:
+        """
+        Queue a PDF the service can read from disk.
+        
+        Returns:
+            Job ID
+        """
+        request = {"pdf_path": str(Path(pdf_path).resolve()), "stages": stages, "options": options}
+        return self._submit(json.dumps(request).encode('utf-8'), {"Content-Type": "application/json"})
+    
+    def upload(self, pdf_path: str, stages: list = None) -> str:
+        """
+        Upload a PDF and queue it.
+        
+        Returns:
+            Job ID
+        """
+        path = Path(pdf_path)
+        query = f"?name={quote(path.name)}"
+        if stages:
+            query += f"&stages={','.join(stages)}"
+        return self._submit(path.read_bytes(), {"Content-Type": "application/pdf"}, "/jobs" + query)
+    
+    def status(self, job_id: str) -> dict:
+        """Current job status."""
+        status, _, reply = self._request("GET", f"/jobs/{job_id}")
+        if status != 200:
+            raise RuntimeError(f"Status failed ({status}): {reply.get('error')}")
+        return reply
+    
+    def wait(self, job_id: str, poll_interval: float = 0.5, timeout: float = None) -> dict:
+        """Poll until the job is done or failed. Returns the final status."""
+        started = time.monotonic()
+        while True:
+            info = self.status(job_id)
+            if info["status"] in ("done", "failed"):
+                return info
+            if timeout is not None and time.monotonic() - started > timeout:
+                raise TimeoutError(f"Job {job_id} still {info['status']} after {timeout}s")
+            time.sleep(poll_interval)
+    
+    def result(self, job_id: str) -> dict:
+        """Streamed result of a finished job (records per stage)."""
+        status, _, reply = self._request("GET", f"/jobs/{job_id}/result")
+        if status != 200:
+            raise RuntimeError(f"Result failed ({status}): {reply.get('error')}")
+        return reply
+
+
+def _run_client(address: str, pdf_path: str, stages: list, upload: bool):
+    """Submit one PDF, wait for it and print a summary."""
+    log = get_log()
+    client = ExtractionClient(address)
+    job_id = client.upload(pdf_path, stages) if upload else client.submit(pdf_path, stages)
+    log.info(f"📨 Submitted {Path(pdf_path).name} as job {job_id}")
+    
+    info = client.wait(job_id)
+    if info["status"] == "failed":
+        log.error(f"❌ Job failed: {info['error']}", "job_failed", job=job_id, error=info["error"])
+        sys.exit(1)
+    
+    result = client.result(job_id)
+    log.info(f"✅ Done in {info['seconds']}s")
+    for key in ("images", "charts"):
+        if key in result:
+            with_text = sum(1 for record in result[key] if record.get("text"))
+            log.info(f"   {key}: {len(result[key])} ({with_text} with text)")
+
+
+def main():
+    """Main function to run the extraction service (or the stand-in client)."""
+    
+    # Console/JSON logging: --quiet, --log-level, --log-json, --log-items, --progress-interval
+    log = configure_from_argv(sys.argv)
+    
+    log.info(f"\n{'='*60}")
+    log.info(f"🌐 EXTRACTION SERVICE - Task 2")
+    log.info(f"{'='*60}\n")
+    
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print("Usage:")
+        print("  python extraction_service.py [options]")
+        print("\nOptions:")
+        print(f"  --address {DEFAULT_ADDRESS}   Listen address (host:port)")
+        print("  --queue 16                   Waiting jobs before replying 429")
+        print("  --image-workers 2            Processes for image extraction")
+        print("  --chart-workers 1            Processes for chart extraction")
+        print("  --ocr-workers 1              Processes for OCR (one warm model each)")
+        print("  --engine replay:file.jsonl   OCR engine for all jobs (see ocr_engines.py)")
+        print("  --lang en                    OCR language")
+        print("\nClient:")
+        print("  --submit File.pdf            Send a PDF path to a running service and wait")
+        print("  --upload                     Upload the file instead of sending its path")
+        print("  --stages images,charts,ocr   Stages to run (default: images,ocr)")
+        sys.exit(0)
+    
+    options = {}
+    ocr_options = {}
+    submit = None
+    stages = None
+    upload = False
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        
+        if arg == "--address" and i + 1 < len(sys.argv):
+            options["address"] = sys.argv[i + 1]
+            i += 2
+        elif arg == "--queue" and i + 1 < len(sys.argv):
+            options["queue_size"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--image-workers" and i + 1 < len(sys.argv):
+            options["image_workers"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--chart-workers" and i + 1 < len(sys.argv):
+            options["chart_workers"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--ocr-workers" and i + 1 < len(sys.argv):
+            options["ocr_workers"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--engine" and i + 1 < len(sys.argv):
+            ocr_options["engine"] = sys.argv[i + 1]
+            i += 2
+        elif arg == "--lang" and i + 1 < len(sys.argv):
+            ocr_options["lang"] = sys.argv[i + 1]
+            i += 2
+        elif arg == "--submit" and i + 1 < len(sys.argv):
+            submit = sys.argv[i + 1]
+            i += 2
+        elif arg == "--stages" and i + 1 < len(sys.argv):
+            stages = [s.strip() for s in sys.argv[i + 1].split(",") if s.strip()]
+            i += 2
+        elif arg == "--upload":
+            upload = True
+            i += 1
+        else:
+            i += 1
+    
+    if submit:
+        try:
+            _run_client(options.get("address", DEFAULT_ADDRESS), submit, stages, upload)
+        except (ConnectionError, RuntimeError) as e:
+            log.error(f"❌ Error: {e}", "client_failed", error=str(e))
+            sys.exit(1)
+        return
+    
+    # Suppress PaddlePaddle warnings
+    os.environ['GLOG_minloglevel'] = '2'
+    
+    try:
+        asyncio.run(ExtractionService(ocr_options=ocr_options, **options).serve())
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        log.error(f"❌ Unexpected error: {e}", "service_failed", error=str(e))
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    log.info("\n👋 Extraction service stopped", "service_stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,15 @@ Features:
 - Maintains full image quality
 - Saves metadata with page number, image index, and dimensions
 - Supports PNG, JPG, and other image formats
+- Optional page selection and max-images / max-bytes limits: pages are
+  loaded one at a time and extraction stops as soon as a limit is hit,
+  so previews of huge PDFs cost only what they return
+- An xref-level image index (pdf_index.py) tells which pages carry
+  images, so pages without new images are never loaded
+- Takes a path, bytes, a file object or an mmap (pdf_source.py), so PDFs
+  fetched into memory need no temp file
+- Output goes through event_log.py: per-image lines are off by default
+  (sampled with --log-items N) and progress is printed once a second
 
 Dependencies:
 - PyMuPDF (fitz)
@@ -29,6 +38,42 @@ from datetime import datetime
 from pathlib import Path
 from PIL import Image
 import io
+from event_log import configure_from_argv, get_log
+from pdf_index import load_image_index, page_image_xrefs
+from pdf_source import PDFSource
+from resource_budget import BudgetExceeded
+
+
+def parse_page_ranges(spec: str) -> list:
+    """
+    Parse a page selection such as "1-5,9,12-" into page numbers.
+    
+    Args:
+        spec: Comma-separated pages and ranges (1-indexed). An open range
+              ("12-") runs to the end of the document.
+    
+    Returns:
+        List of page numbers and (start, end) tuples; end is None for
+        open ranges. Resolved against the page count in extract_images().
+    """
+    selection = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            start = int(start) if start.strip() else 1
+            end = int(end) if end.strip() else None
+            if start < 1 or (end is not None and end < start):
+                raise ValueError(f"Invalid page range: {part}")
+            selection.append((start, end))
+        else:
+            page = int(part)
+            if page < 1:
+                raise ValueError(f"Invalid page number: {part}")
+            selection.append(page)
+    return selection
 
 
 class ImageExtractor:
@@ -37,21 +82,40 @@ class ImageExtractor:
     Uses PyMuPDF for 100% accurate image extraction.
     """
     
-    def __init__(self, pdf_path: str, output_dir: str = None):
+    def __init__(self, pdf_path: str, output_dir: str = None, profiler=None, budget=None,
+                 use_index: bool = True, index_cache_dir: str = None, pdf_name: str = None,
+                 log=None):
         """
         Initialize the ImageExtractor.
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or the PDF itself as bytes,
+                      a binary file object or an mmap (opened without a copy)
             output_dir: Directory to save extracted images (default: Task 2 folder)
+            profiler: Optional MemoryProfiler (mem_profiler.py) that records
+                      this extraction as stage "images"
+            budget: Optional ResourceBudget (resource_budget.py); raises
+                    BudgetExceeded when the document goes over it
+            use_index: Pre-index images from the xref table and only load
+                       pages that have images not yet extracted
+            index_cache_dir: Directory to cache the index in between runs
+                             (None = rebuild it every run)
+            pdf_name: Name for output folders and metadata; required when
+                      pdf_path is data without a file name
+            log: Optional EventLog (event_log.py); default is the shared log
+        
+        Raises:
+            FileNotFoundError: The PDF file does not exist
+            ValueError: The input does not start like a PDF ("%PDF-")
         """
-        self.pdf_path = Path(pdf_path).resolve()
-        
-        if not self.pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-        
-        if not self.pdf_path.suffix.lower() == '.pdf':
-            raise ValueError(f"File is not a PDF: {pdf_path}")
+        # The type is checked by content, so "report.bin" or an upload works
+        self.source = PDFSource(pdf_path, pdf_name)
+        self.pdf_path = self.source.path  # None for in-memory PDFs
+        self.profiler = profiler
+        self.budget = budget
+        self.use_index = use_index
+        self.index_cache_dir = index_cache_dir
+        self.log = log if log is not None else get_log()
         
         # Set output directory - always use script's parent directory (Task 2)
         if output_dir:
@@ -62,7 +126,7 @@ class ImageExtractor:
             self.output_dir = script_dir
         
         # Get PDF name without extension for folder naming
-        self.pdf_name_clean = self.pdf_path.stem  # filename without extension
+        self.pdf_name_clean = self.source.stem  # filename without extension
         
         # Create images folder with PDF name: "images (pdf_name)"
         self.images_dir = self.output_dir / f"images ({self.pdf_name_clean})"
@@ -73,8 +137,8 @@ class ImageExtractor:
         
         # Metadata storage
         self.metadata = {
-            "pdf_name": self.pdf_path.name,
-            "pdf_path": str(self.pdf_path.absolute()),
+            "pdf_name": self.source.name,
+            "pdf_path": str(self.pdf_path) if self.pdf_path is not None else None,
             "extraction_date": datetime.now().isoformat(),
             "total_pages": 0,
             "total_images": 0,
@@ -128,8 +192,12 @@ class ImageExtractor:
                 height = base_image.get("height", 0)
                 
                 return image_bytes, ext, width, height
+        except (BudgetExceeded, MemoryError):
+            # Resource limits must stop the document, not just skip one image
+            raise
         except Exception as e:
-            print(f"  ⚠️ Warning: Could not extract image xref {xref}: {e}")
+            self.log.warning(f"  ⚠️ Warning: Could not extract image xref {xref}: {e}",
+                             "image_failed", xref=xref, error=str(e))
         
         return None, None, 0, 0
     
@@ -212,49 +280,155 @@ class ImageExtractor:
                     f.write(image_bytes)
                 return True
             except Exception as e2:
-                print(f"  ❌ Error saving image: {e2}")
+                self.log.error(f"  ❌ Error saving image: {e2}", "image_save_failed",
+                               path=str(filepath), error=str(e2))
                 return False
     
-    def extract_images(self, save_as_png: bool = False) -> dict:
+    def _iter_page_numbers(self, page_count: int, pages):
+        """
+        Yield the 0-indexed pages to visit, in document order.
+        
+        Args:
+            page_count: Number of pages in the document
+            pages: None for all pages, or page numbers / (start, end) ranges
+                   as returned by parse_page_ranges() (1-indexed)
+        """
+        if pages is None:
+            yield from range(page_count)
+            return
+        
+        wanted = set()
+        for item in pages:
+            if isinstance(item, (tuple, list)):
+                start, end = item
+                end = page_count if end is None else min(end, page_count)
+                wanted.update(range(max(start, 1), end + 1))
+            elif 1 <= item <= page_count:
+                wanted.add(item)
+        
+        for page_number in sorted(wanted):
+            yield page_number - 1
+    
+    def extract_images(self, save_as_png: bool = False, pages: list = None,
+                       max_images: int = None, max_bytes: int = None) -> dict:
         """
         Extract all images from the PDF.
         
         Args:
             save_as_png: If True, convert all images to PNG format
+            pages: Page numbers (1-indexed) and/or (start, end) ranges to scan,
+                   e.g. [1, 2, (10, 20)] or parse_page_ranges("1-2,10-20").
+                   If None, scan all pages
+            max_images: Stop after this many images have been saved
+            max_bytes: Stop before the extracted image bytes would exceed this
             
         Returns:
-            Dictionary containing extraction metadata
+            Dictionary containing extraction metadata ("truncated" names the
+            limit that stopped extraction early, or is None)
         """
-        print(f"\n{'='*60}")
-        print(f"📄 IMAGE EXTRACTOR - Task 2")
-        print(f"{'='*60}")
-        print(f"📁 PDF: {self.pdf_path.name}")
-        print(f"📂 Output: {self.images_dir}")
-        print(f"{'='*60}\n")
+        self.log.info(f"\n{'='*60}")
+        self.log.info(f"📄 IMAGE EXTRACTOR - Task 2")
+        self.log.info(f"{'='*60}")
+        self.log.info(f"📁 PDF: {self.source.name}")
+        self.log.info(f"📂 Output: {self.images_dir}")
+        self.log.info(f"{'='*60}\n")
+        self.log.info(event="images_started", pdf=self.source.name, output=str(self.images_dir))
+        
+        if self.profiler is not None:
+            self.profiler.begin(self.source.name, "images")
+        
+        if self.budget is not None and self.budget.started_at is None:
+            self.budget.start()
         
         # Open the PDF
-        doc = fitz.open(self.pdf_path)
+        doc = self.source.open()
         self.metadata["total_pages"] = len(doc)
         
-        print(f"📖 Total Pages: {len(doc)}\n")
+        try:
+            self._extract_pages(doc, save_as_png, pages, max_images, max_bytes)
+        finally:
+            if self.profiler is not None:
+                self.profiler.checkpoint()
+            
+            # Close the document and its source (also when a budget or limit stopped us)
+            doc.close()
+            self.source.close()
+        
+        if self.budget is not None:
+            self.metadata["budget_usage"] = self.budget.usage()
+        
+        # Save metadata to JSON
+        self._save_metadata()
+        
+        # Print summary
+        self._print_summary()
+        
+        if self.profiler is not None:
+            self.profiler.end()
+        
+        return self.metadata
+    
+    def _extract_pages(self, doc: fitz.Document, save_as_png: bool, pages, max_images: int, max_bytes: int):
+        """
+        Walk the selected pages and save their images (see extract_images).
+        
+        Fills self.metadata with the images, counts and truncation reason.
+        """
+        self.log.info(f"📖 Total Pages: {len(doc)}\n")
+        
+        index = self._load_index(doc) if self.use_index else None
         
         # Track processed images to avoid duplicates
         processed_xrefs = set()
         image_count = 0
+        bytes_extracted = 0
+        pages_scanned = 0
+        truncated = None
         
-        # Iterate through each page
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        page_nums = list(self._iter_page_numbers(len(doc), pages))
+        pages_visited = 0
+        
+        # Iterate through the selected pages, loading one page at a time
+        for page_num in page_nums:
+            if truncated:
+                break
+            
+            self.log.progress("images", pages_visited, len(page_nums), unit="pages")
+            pages_visited += 1
+            
+            if index is not None:
+                xrefs = page_image_xrefs(index, page_num + 1)
+                if xrefs is not None and all(xref in processed_xrefs for xref in xrefs):
+                    # No images, or only images already saved from earlier pages
+                    continue
+            
+            # Stop before loading (and charging) pages once a limit is reached
+            if max_images is not None and len(self.metadata["images"]) >= max_images:
+                truncated = "max_images"
+                break
+            if max_bytes is not None and bytes_extracted >= max_bytes:
+                truncated = "max_bytes"
+                break
+            
+            if self.budget is not None:
+                self.budget.add_pages(1)
+            
+            page = doc.load_page(page_num)
             page_number = page_num + 1  # 1-indexed for human readability
+            pages_scanned += 1
             
             # Get images on this page
             image_list = page.get_images(full=True)
             
-            if image_list:
-                print(f"📄 Page {page_number}: Found {len(image_list)} image(s)")
+            if image_list and self.log.sample("page_images"):
+                self.log.item("page_images", f"📄 Page {page_number}: Found {len(image_list)} image(s)",
+                              page=page_number, images=len(image_list))
             
             page_image_index = 0
             
+            if self.profiler is not None:
+                self.profiler.checkpoint()
+            
             for img_index, img in enumerate(image_list):
                 xref = img[0]  # Cross-reference number
                 
@@ -262,16 +436,30 @@ class ImageExtractor:
                 if xref in processed_xrefs:
                     continue
                 
-                processed_xrefs.add(xref)
-                page_image_index += 1
-                image_count += 1
+                if max_images is not None and len(self.metadata["images"]) >= max_images:
+                    truncated = "max_images"
+                    break
+                
+                # Charge the declared size before decoding (decompression bombs)
+                if self.budget is not None:
+                    self.budget.add_pixels(img[2] * img[3])
                 
                 # Extract image bytes
                 image_bytes, ext, width, height = self._extract_image_bytes(doc, xref)
                 
+                if image_bytes is not None and max_bytes is not None and bytes_extracted + len(image_bytes) > max_bytes:
+                    truncated = "max_bytes"
+                    break
+                
+                processed_xrefs.add(xref)
+                page_image_index += 1
+                image_count += 1
+                
                 if image_bytes is None:
                     continue
                 
+                bytes_extracted += len(image_bytes)
+                
                 # Determine output format
                 if save_as_png:
                     output_ext = "png"
@@ -291,6 +479,8 @@ class ImageExtractor:
                     
                     # Get file size
                     file_size = image_path.stat().st_size if image_path.exists() else 0
+                    if self.budget is not None:
+                        self.budget.add_output_bytes(file_size)
                     
                     # Create image metadata entry (matching required output structure)
                     image_metadata = {
@@ -307,21 +497,41 @@ class ImageExtractor:
                     
                     self.metadata["images"].append(image_metadata)
                     
-                    print(f"   ✅ Extracted: {image_name} ({width}x{height})")
+                    if self.log.sample("image_saved"):
+                        self.log.item("image_saved", f"   ✅ Extracted: {image_name} ({width}x{height})",
+                                      page=page_number, image=image_name, width=width, height=height)
         
-        # Close the document
-        doc.close()
+        # Final progress line (fewer pages than selected if a limit stopped us)
+        self.log.progress("images", pages_visited, pages_visited, unit="pages")
         
         # Update total count
         self.metadata["total_images"] = image_count
+        self.metadata["pages_scanned"] = pages_scanned
+        self.metadata["truncated"] = truncated
+    
+    def _load_index(self, doc: fitz.Document):
+        """
+        Build (or load the cached) image index for this PDF.
         
-        # Save metadata to JSON
-        self._save_metadata()
-        
-        # Print summary
-        self._print_summary()
-        
-        return self.metadata
+        Returns:
+            Index dictionary from pdf_index.py, or None if it cannot be built
+            (every selected page is then visited as before)
+        """
+        try:
+            index, from_cache = load_image_index(self.pdf_path, doc, self.index_cache_dir)
+        except Exception as e:
+            self.log.warning(f"⚠️  Image index unavailable, scanning every page: {e}\n",
+                             "index_unavailable", error=str(e))
+            return None
+        
+        self.metadata["image_index"] = {
+            "pages_with_images": len(index["pages"]),
+            "shared_xrefs": len(index["shared_xrefs"]),
+            "from_cache": from_cache
+        }
+        self.log.info(f"🗂️  Image index: {len(index['pages'])} page(s) with images"
+                      f"{' (cached)' if from_cache else ''}\n")
+        return index
     
     def _save_metadata(self):
         """Save metadata to JSON file."""
@@ -330,19 +540,28 @@ class ImageExtractor:
         with open(metadata_path, 'w', encoding='utf-8') as f:
             json.dump(self.metadata, f, indent=2, ensure_ascii=False)
         
-        print(f"\n💾 Metadata saved: {metadata_path}")
+        self.log.info(f"\n💾 Metadata saved: {metadata_path}")
     
     def _print_summary(self):
         """Print extraction summary."""
-        print(f"\n{'='*60}")
-        print(f"✅ EXTRACTION COMPLETE")
-        print(f"{'='*60}")
-        print(f"📄 PDF: {self.metadata['pdf_name']}")
-        print(f"📖 Total Pages: {self.metadata['total_pages']}")
-        print(f"🖼️  Total Images Extracted: {self.metadata['total_images']}")
-        print(f"📂 Images saved to: {self.images_dir}")
-        print(f"📋 Metadata saved to: {self.output_dir / self.metadata_filename}")
-        print(f"{'='*60}\n")
+        self.log.info(f"\n{'='*60}")
+        self.log.info(f"✅ EXTRACTION COMPLETE")
+        self.log.info(f"{'='*60}")
+        self.log.info(f"📄 PDF: {self.metadata['pdf_name']}")
+        self.log.info(f"📖 Total Pages: {self.metadata['total_pages']}")
+        self.log.info(f"🖼️  Total Images Extracted: {self.metadata['total_images']}")
+        if self.metadata.get("pages_scanned", self.metadata['total_pages']) != self.metadata['total_pages']:
+            self.log.info(f"📑 Pages Scanned: {self.metadata['pages_scanned']}")
+        if self.metadata.get("truncated"):
+            self.log.info(f"✂️  Stopped early: {self.metadata['truncated']} limit reached")
+        self.log.info(f"📂 Images saved to: {self.images_dir}")
+        self.log.info(f"📋 Metadata saved to: {self.output_dir / self.metadata_filename}")
+        self.log.info(f"{'='*60}\n")
+        self.log.info(event="images_finished", pdf=self.metadata['pdf_name'],
+                      total_pages=self.metadata['total_pages'],
+                      total_images=self.metadata['total_images'],
+                      pages_scanned=self.metadata.get('pages_scanned'),
+                      truncated=self.metadata.get('truncated'))
     
     def get_simple_metadata(self) -> list:
         """
@@ -372,9 +591,48 @@ def main():
     script_dir = Path(__file__).parent.parent  # Go up to "Greonomy task 2"
     pdfs_folder = script_dir / "pdfs"
     
+    # Console/JSON logging: --quiet, --log-level, --log-json, --log-items, --progress-interval
+    log = configure_from_argv(sys.argv)
+    
+    # Optional memory profile: --profile-memory <report.json>
+    profiler = None
+    profile_path = None
+    if "--profile-memory" in sys.argv:
+        from mem_profiler import MemoryProfiler
+        position = sys.argv.index("--profile-memory")
+        profile_path = sys.argv[position + 1] if position + 1 < len(sys.argv) else "memory_profile.json"
+        del sys.argv[position:position + 2]
+        profiler = MemoryProfiler()
+    
+    # Optional page selection, limits and image index cache
+    run_options = {}
+    extractor_options = {}
+    arguments = []
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg == "--pages" and i + 1 < len(sys.argv):
+            run_options["pages"] = parse_page_ranges(sys.argv[i + 1])
+            i += 2
+        elif arg == "--max-images" and i + 1 < len(sys.argv):
+            run_options["max_images"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--max-bytes" and i + 1 < len(sys.argv):
+            run_options["max_bytes"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--index-cache" and i + 1 < len(sys.argv):
+            extractor_options["index_cache_dir"] = sys.argv[i + 1]
+            i += 2
+        elif arg == "--no-index":
+            extractor_options["use_index"] = False
+            i += 1
+        else:
+            arguments.append(arg)
+            i += 1
+    
     # Check command line arguments
-    if len(sys.argv) > 1:
-        pdf_path = sys.argv[1]
+    if arguments:
+        pdf_path = arguments[0]
     else:
         # Look for PDFs in the pdfs folder
         if pdfs_folder.exists():
@@ -385,24 +643,25 @@ def main():
             else:
                 print("❌ No PDF files found in 'pdfs' folder!")
                 print(f"   Please add PDF files to: {pdfs_folder}")
-                print("\nUsage: python image_extractor.py <path_to_pdf>")
+                print("\nUsage: python image_extractor.py <path_to_pdf> [--pages 1-5,9] [--max-images N] [--max-bytes N] [--index-cache DIR] [--no-index] [--profile-memory report.json] [--quiet] [--log-level info] [--log-json events.jsonl] [--log-items N]")
                 sys.exit(1)
         else:
             print("❌ 'pdfs' folder not found!")
-            print("\nUsage: python image_extractor.py <path_to_pdf>")
+            print("\nUsage: python image_extractor.py <path_to_pdf> [--pages 1-5,9] [--max-images N] [--max-bytes N] [--index-cache DIR] [--no-index] [--profile-memory report.json] [--quiet] [--log-level info] [--log-json events.jsonl] [--log-items N]")
             sys.exit(1)
     
     # Create extractor and run
     try:
-        extractor = ImageExtractor(pdf_path)
-        metadata = extractor.extract_images()
+        extractor = ImageExtractor(pdf_path, profiler=profiler, **extractor_options)
+        metadata = extractor.extract_images(**run_options)
         
         # Also print simple metadata format
-        print("\n📊 Simple Metadata Format (as required):")
-        print("-" * 40)
-        simple = extractor.get_simple_metadata()
-        for img in simple:
-            print(json.dumps(img, indent=2))
+        if not log.quiet and log.enabled("info"):
+            log.info("\n📊 Simple Metadata Format (as required):")
+            log.info("-" * 40)
+            simple = extractor.get_simple_metadata()
+            for img in simple:
+                log.info(json.dumps(img, indent=2))
         
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
@@ -412,6 +671,12 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        log.close()
+        if profiler is not None:
+            # Records a failed stage; no-op if extraction finished
+            profiler.end(failed=True)
+            profiler.save(profile_path)
 
 
 if __name__ == "__main__":
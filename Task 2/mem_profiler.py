@@ -0,0 +1,292 @@
+"""
+================================================================================
+MEMORY PROFILER - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Measure how much memory each document and stage really needs,
+      so worker memory limits can be set from data
+
+How it works:
+- Opt-in: extractors take profiler=None and only measure when one is given
+- Each stage (images, charts, ocr) of each document is one measurement:
+  * peak Python heap (tracemalloc, peak reset per stage)
+  * RSS high-water mark (VmHWM from /proc/self/status, reset per stage by
+    writing "5" to /proc/self/clear_refs where the kernel allows it)
+  * MuPDF resource store size (fitz.TOOLS.store_size), sampled at checkpoints
+  * the largest allocation sites at the stage's highest checkpoint (the
+    snapshot is retaken whenever the traced heap has grown by
+    PEAK_SNAPSHOT_GROWTH since the last one), not what is left at the end
+- Measures the calling process only; work done in worker pools is not
+  included (run with workers=1 to profile a stage completely)
+
+Dependencies:
+- None (standard library; PyMuPDF for the store size if installed)
+
+Output:
+- memory_profile.json (or any path you choose) with one entry per stage
+================================================================================
+"""
+
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from event_log import get_log
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+
+MB = 1024 * 1024
+
+# Retake the allocation snapshot once the traced heap is this much larger
+# than at the last snapshot (snapshots are slow on big heaps)
+PEAK_SNAPSHOT_GROWTH = 1.1
+
+
+def _read_proc_status() -> dict:
+    """VmRSS and VmHWM of this process in bytes (empty off Linux)."""
+    values = {}
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    name, value = line.split(":", 1)
+                    values[name] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+def _reset_rss_peak() -> bool:
+    """Reset VmHWM to the current RSS. Returns False if the kernel refuses."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _mupdf_tools_value(name: str):
+    """Read a fitz.TOOLS value (a property in older PyMuPDF, a method in newer)."""
+    if fitz is None:
+        return None
+    try:
+        value = getattr(fitz.TOOLS, name)
+        return value() if callable(value) else value
+    except Exception:
+        return None
+
+
+def _mupdf_store_size() -> int:
+    """Bytes currently held in MuPDF's resource store (0 without PyMuPDF)."""
+    return int(_mupdf_tools_value("store_size") or 0)
+
+
+class MemoryProfiler:
+    """
+    Collects per-document, per-stage memory measurements.
+    """
+    
+    def __init__(self, top_n: int = 10, frames: int = 1, log=None):
+        """
+        Initialize the Memory Profiler.
+        
+        Args:
+            top_n: Allocation sites kept per stage in the report
+            frames: Stack frames recorded per allocation (more = slower,
+                    but shows who called the allocating line)
+            log: Optional EventLog (event_log.py); default is the shared log
+        """
+        self.top_n = top_n
+        self.frames = frames
+        self.entries = []
+        self.current = None
+        self._started_tracing = False
+        self._baseline = None
+        self.log = log if log is not None else get_log()
+    
+    def begin(self, document: str, stage: str):
+        """
+        Start measuring one stage of one document.
+        
+        Args:
+            document: Document name (e.g. the PDF file name)
+            stage: Stage name ("images", "charts", "ocr", ...)
+        """
+        if self.current is not None:
+            # The previous stage raised before reaching end()
+            self.end(failed=True)
+        
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        
+        # tracemalloc.reset_peak() needs Python 3.9+
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.clear_traces()
+        
+        self._baseline = self._take_snapshot() if self.top_n else None
+        rss_reset = _reset_rss_peak()
+        status = _read_proc_status()
+        store = _mupdf_store_size()
+        
+        self.current = {
+            "document": document,
+            "stage": stage,
+            "started": time.perf_counter(),
+            "rss_start": status.get("VmRSS", 0),
+            "rss_peak_reset": rss_reset,
+            "mupdf_store_start": store,
+            "mupdf_store_peak": store,
+            "peak_snapshot": None,
+            "peak_snapshot_traced": tracemalloc.get_traced_memory()[0]
+        }
+    
+    def checkpoint(self):
+        """
+        Sample values that have no kernel/tracemalloc peak: the MuPDF store,
+        and the allocation snapshot behind top_allocations while the traced
+        heap keeps growing.
+        """
+        if self.current is None:
+            return
+        
+        self.current["mupdf_store_peak"] = max(self.current["mupdf_store_peak"], _mupdf_store_size())
+        
+        if self._baseline is not None:
+            traced = tracemalloc.get_traced_memory()[0]
+            if traced > self.current["peak_snapshot_traced"] * PEAK_SNAPSHOT_GROWTH:
+                self.current["peak_snapshot"] = self._take_snapshot()
+                self.current["peak_snapshot_traced"] = traced
+    
+    def end(self, failed: bool = False) -> dict:
+        """
+        Finish the current stage and record it.
+        
+        Args:
+            failed: True if the stage did not complete
+        
+        Returns:
+            The recorded entry (None if no stage was running)
+        """
+        if self.current is None:
+            return None
+        
+        self.checkpoint()
+        stage = self.current
+        self.current = None
+        
+        py_current, py_peak = tracemalloc.get_traced_memory()
+        status = _read_proc_status()
+        
+        entry = {
+            "document": stage["document"],
+            "stage": stage["stage"],
+            "failed": failed,
+            "seconds": round(time.perf_counter() - stage["started"], 3),
+            "py_peak_mb": round(py_peak / MB, 2),
+            "py_current_mb": round(py_current / MB, 2),
+            "rss_start_mb": round(stage["rss_start"] / MB, 2),
+            "rss_end_mb": round(status.get("VmRSS", 0) / MB, 2),
+            # Without a reset this is the process-wide peak so far
+            "rss_hwm_mb": round(status.get("VmHWM", 0) / MB, 2),
+            "rss_hwm_is_stage_peak": stage["rss_peak_reset"],
+            "mupdf_store_peak_mb": round(stage["mupdf_store_peak"] / MB, 2),
+            "mupdf_store_end_mb": round(_mupdf_store_size() / MB, 2),
+            # Python heap when the top_allocations snapshot was taken
+            "top_allocations_heap_mb": round(stage["peak_snapshot_traced"] / MB, 2),
+            "top_allocations": self._top_allocations(stage["peak_snapshot"])
+        }
+        self.entries.append(entry)
+        
+        self.log.info(f"🧠 Memory [{entry['document']} / {entry['stage']}]: "
+                      f"Python peak {entry['py_peak_mb']} MB, RSS peak {entry['rss_hwm_mb']} MB, "
+                      f"MuPDF store {entry['mupdf_store_peak_mb']} MB",
+                      "memory_stage", document=entry['document'], stage=entry['stage'],
+                      py_peak_mb=entry['py_peak_mb'], rss_hwm_mb=entry['rss_hwm_mb'],
+                      mupdf_store_peak_mb=entry['mupdf_store_peak_mb'])
+        return entry
+    
+    @staticmethod
+    def _take_snapshot():
+        """Snapshot the traced heap without tracemalloc's and the importer's own allocations."""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+    
+    def _top_allocations(self, snapshot) -> list:
+        """
+        Allocation sites that grew most between the start of the stage and
+        its highest checkpoint.
+        
+        Args:
+            snapshot: Snapshot taken at that checkpoint (None if the heap never grew)
+        """
+        baseline = self._baseline
+        self._baseline = None
+        if not self.top_n or baseline is None or snapshot is None:
+            return []
+        
+        stats = snapshot.compare_to(baseline, "lineno")
+        
+        sites = []
+        for stat in stats[:self.top_n]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            sites.append({
+                "site": f"{Path(frame.filename).name}:{frame.lineno}",
+                "size_kb": round(stat.size_diff / 1024, 1),
+                "count": stat.count_diff
+            })
+        return sites
+    
+    def report(self) -> dict:
+        """
+        Build the profile report.
+        
+        Returns:
+            Dictionary with all entries and the worst case per stage
+        """
+        worst = {}
+        for entry in self.entries:
+            best = worst.get(entry["stage"])
+            if best is None or entry["rss_hwm_mb"] > best["rss_hwm_mb"]:
+                worst[entry["stage"]] = {
+                    "document": entry["document"],
+                    "rss_hwm_mb": entry["rss_hwm_mb"],
+                    "py_peak_mb": entry["py_peak_mb"],
+                    "mupdf_store_peak_mb": entry["mupdf_store_peak_mb"]
+                }
+        
+        store_limit = _mupdf_tools_value("store_maxsize")
+        
+        return {
+            "profile_date": datetime.now().isoformat(),
+            # None = PyMuPDF missing or the store is unlimited
+            "mupdf_store_limit_mb": round(store_limit / MB, 2) if store_limit else None,
+            "worst_by_stage": worst,
+            "entries": self.entries
+        }
+    
+    def save(self, path: str) -> Path:
+        """Write the report as JSON and stop tracing if this profiler started it."""
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        
+        self.log.info(f"\n💾 Memory profile saved: {path}", "memory_profile_saved", path=str(path))
+        return path
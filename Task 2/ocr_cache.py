@@ -0,0 +1,153 @@
+"""
+================================================================================
+OCR RESULT CACHE - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Never run OCR twice on the same image
+
+How it works:
+- Keys each result by a SHA-256 of the image bytes plus the OCR settings
+  (engine, version, language, confidence threshold)
+- Stores results in a small SQLite database on disk
+- Evicts least recently used entries when the database grows past a size limit
+- Counts hits and misses for the run summary
+
+Dependencies:
+- None (standard library only)
+
+Output:
+- ocr_cache.sqlite (or any path you choose)
+================================================================================
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+
+class OCRCache:
+    """
+    Disk-backed cache of OCR text, keyed by image content and OCR settings.
+    Identical logos and footers across PDFs are only recognized once.
+    """
+    
+    def __init__(self, cache_path: str, settings: dict, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Open (or create) the cache.
+        
+        Args:
+            cache_path: Path to the SQLite database file
+            settings: OCR settings that change the output (engine, lang,
+                      preprocessing, ...); results made with different
+                      settings never collide
+            max_bytes: Approximate size limit for stored entries
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.settings_key = json.dumps(settings, sort_keys=True).encode('utf-8')
+        
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        
+        self.conn = sqlite3.connect(str(self.cache_path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ocr_cache_last_used ON ocr_cache (last_used)")
+        self.conn.commit()
+    
+    def key_for(self, image_bytes: bytes) -> str:
+        """
+        Build the cache key for an image.
+        
+        Args:
+            image_bytes: Raw bytes of the image file
+        
+        Returns:
+            Hex digest combining the settings and the image content
+        """
+        digest = hashlib.sha256(self.settings_key)
+        digest.update(b"\0")
+        digest.update(image_bytes)
+        return digest.hexdigest()
+    
+    def get(self, key: str):
+        """
+        Look up a cached result and count the hit or miss.
+        
+        Args:
+            key: Cache key from key_for()
+        
+        Returns:
+            Cached text, or None if the image has not been seen
+        """
+        row = self.conn.execute("SELECT text FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+        
+        if row is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self.conn.execute("UPDATE ocr_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+    
+    def put(self, key: str, text: str):
+        """
+        Store a result.
+        
+        Args:
+            key: Cache key from key_for()
+            text: OCR text (may be empty - "no text" is worth caching too)
+        """
+        size = len(key) + len(text.encode('utf-8'))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO ocr_cache (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, text, size, time.time())
+        )
+    
+    def _evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        excess = total - self.max_bytes
+        freed = 0
+        stale_keys = []
+        for key, size in self.conn.execute("SELECT key, size FROM ocr_cache ORDER BY last_used"):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        
+        self.conn.executemany("DELETE FROM ocr_cache WHERE key = ?", stale_keys)
+        self.evicted += len(stale_keys)
+    
+    def flush(self):
+        """Apply the size limit and commit pending writes."""
+        self._evict()
+        self.conn.commit()
+    
+    def close(self):
+        """Flush and close the database."""
+        self.flush()
+        self.conn.close()
+    
+    def stats(self) -> dict:
+        """Hit/miss counters for the run summary."""
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.cache_path),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evicted": self.evicted
+        }
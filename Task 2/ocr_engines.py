@@ -0,0 +1,337 @@
+"""
+================================================================================
+OCR ENGINES - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Let the OCR pipeline run on different engines, including a fake one
+
+How it works:
+- Every engine turns a batch of preprocessed image arrays into lines of
+  [text, score], one list per image
+- PaddleEngine wraps PaddleOCR and loads the model only on first use
+- RecordingEngine wraps another engine and stores every result on disk
+- ReplayEngine serves recorded results with configurable synthetic latency,
+  so scheduling, caching and I/O can be measured on machines without the
+  model (unrecorded images come back empty)
+- create_engine() picks an engine from a spec string at runtime:
+  "paddle", "record:results.jsonl" or "replay:results.jsonl"
+
+Dependencies:
+- NumPy
+- PaddleOCR, PaddlePaddle (Paddle and record engines only)
+
+Output:
+- Recorded results file (JSON lines) for the record engine
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from event_log import get_log
+
+
+# Suppress PaddlePaddle warnings
+os.environ['GLOG_minloglevel'] = '2'
+
+
+def _import_paddleocr():
+    """
+    Import PaddleOCR on first use.
+    
+    The import alone takes seconds and a lot of memory, so it is skipped
+    entirely when an OCR service is doing the inference.
+    """
+    try:
+        import paddleocr
+    except ImportError:
+        raise ImportError("PaddleOCR not installed! Run: pip install paddlepaddle paddleocr")
+    return paddleocr
+
+
+def paddleocr_version() -> str:
+    """Installed PaddleOCR version (part of OCR cache keys)."""
+    return getattr(_import_paddleocr(), "__version__", "unknown")
+
+
+def create_paddle_ocr(lang: str = 'en', cpu_threads: int = None):
+    """
+    Create a PaddleOCR instance.
+    
+    Args:
+        lang: OCR language (change as needed)
+        cpu_threads: Intra-op CPU threads for inference (None = Paddle default)
+    
+    Returns:
+        PaddleOCR instance
+    """
+    options = {"lang": lang}
+    if cpu_threads:
+        options["cpu_threads"] = cpu_threads
+    return _import_paddleocr().PaddleOCR(**options)
+
+
+def result_to_lines(result) -> list:
+    """
+    Flatten raw PaddleOCR output for one image into (text, score) pairs.
+    
+    Handles the dict format of PaddleOCR 3.x (rec_texts/rec_scores) and the
+    older list-of-tuples format. Lines without a score get 1.0.
+    
+    Args:
+        result: List of page results returned by predict() for one image
+    
+    Returns:
+        List of [text, score] pairs
+    """
+    lines = []
+    
+    if result is None or len(result) == 0:
+        return lines
+    
+    # Handle different result formats
+    for page_result in result:
+        if page_result is None:
+            continue
+        
+        # Check if it's the new format (dict with 'rec_texts')
+        if isinstance(page_result, dict):
+            if 'rec_texts' in page_result:
+                texts = page_result.get('rec_texts', [])
+                scores = page_result.get('rec_scores', [])
+                for i, text in enumerate(texts):
+                    score = scores[i] if i < len(scores) else 1.0
+                    lines.append([str(text), float(score)])
+            elif 'text' in page_result:
+                lines.append([str(page_result['text']), 1.0])
+        # Old format (list of tuples)
+        elif isinstance(page_result, list):
+            for item in page_result:
+                if item is None:
+                    continue
+                if isinstance(item, dict):
+                    if 'rec_texts' in item:
+                        lines.extend([str(text), 1.0] for text in item['rec_texts'])
+                elif isinstance(item, (list, tuple)) and len(item) >= 2:
+                    text = item[1][0] if isinstance(item[1], (list, tuple)) else item[1]
+                    confidence = item[1][1] if isinstance(item[1], (list, tuple)) and len(item[1]) > 1 else 1.0
+                    lines.append([str(text), float(confidence)])
+    
+    return lines
+
+
+def image_key(image: np.ndarray) -> str:
+    """Content key of a preprocessed image array (shape, dtype and pixels)."""
+    digest = hashlib.sha256(f"{image.shape}|{image.dtype}".encode('utf-8'))
+    digest.update(np.ascontiguousarray(image).tobytes())
+    return digest.hexdigest()
+
+
+class OCREngine:
+    """
+    Interface shared by all OCR engines.
+    Engines are cheap to create; heavy setup happens in load().
+    """
+    
+    # Engine name recorded in metadata and cache keys
+    name = "base"
+    
+    def __init__(self, lang: str = 'en', cpu_threads: int = None):
+        """
+        Args:
+            lang: OCR language
+            cpu_threads: Intra-op CPU threads for inference (None = engine default)
+        """
+        self.lang = lang
+        self.cpu_threads = cpu_threads
+    
+    def version(self) -> str:
+        """Engine version (part of OCR cache keys)."""
+        return "unknown"
+    
+    def settings(self) -> dict:
+        """Engine identity for cache keys and journals."""
+        return {"engine": self.name, "engine_version": self.version()}
+    
+    def load(self):
+        """Load models. Called once before the first recognize() in a process."""
+    
+    def recognize(self, images: list) -> list:
+        """
+        Recognize text in a batch of images.
+        
+        Args:
+            images: Preprocessed image arrays (BGR)
+        
+        Returns:
+            One list of [text, score] lines per image
+        """
+        raise NotImplementedError
+
+
+class PaddleEngine(OCREngine):
+    """PaddleOCR, loaded on first use."""
+    
+    name = "PaddleOCR"
+    
+    def __init__(self, lang: str = 'en', cpu_threads: int = None):
+        super().__init__(lang, cpu_threads)
+        self.ocr = None
+    
+    def version(self) -> str:
+        return paddleocr_version()
+    
+    def load(self):
+        if self.ocr is None:
+            self.ocr = create_paddle_ocr(lang=self.lang, cpu_threads=self.cpu_threads)
+    
+    def recognize(self, images: list) -> list:
+        self.load()
+        if len(images) == 1:
+            # Use predict() for newer PaddleOCR versions (3.3+)
+            return [result_to_lines(self.ocr.predict(images[0]))]
+        
+        # predict() takes a list of inputs and returns one result per input
+        results = self.ocr.predict(list(images))
+        results = list(results) if results is not None else []
+        if len(results) != len(images):
+            raise RuntimeError(f"Batch returned {len(results)} results for {len(images)} images")
+        return [result_to_lines([r]) for r in results]
+
+
+class RecordingEngine(OCREngine):
+    """
+    Runs another engine and appends every result to a JSON-lines file
+    that ReplayEngine can serve later.
+    """
+    
+    def __init__(self, engine: OCREngine, record_path: str):
+        """
+        Args:
+            engine: Engine that does the real work
+            record_path: JSON-lines file results are appended to
+        """
+        super().__init__(engine.lang, engine.cpu_threads)
+        self.engine = engine
+        self.record_path = Path(record_path)
+        self.name = engine.name
+    
+    def version(self) -> str:
+        return self.engine.version()
+    
+    def load(self):
+        self.engine.load()
+    
+    def recognize(self, images: list) -> list:
+        results = self.engine.recognize(images)
+        # One write per line keeps appends from several workers intact
+        with open(self.record_path, 'a', encoding='utf-8') as f:
+            for image, lines in zip(images, results):
+                f.write(json.dumps({"key": image_key(image), "lines": lines}, ensure_ascii=False) + "\n")
+        return results
+
+
+class ReplayEngine(OCREngine):
+    """
+    Serves results recorded by RecordingEngine, with synthetic latency.
+    Images that were never recorded come back with no text.
+    """
+    
+    name = "replay"
+    
+    def __init__(self, record_path: str, lang: str = 'en', cpu_threads: int = None,
+                 latency: float = 0.0, latency_per_mpx: float = 0.0):
+        """
+        Args:
+            record_path: JSON-lines file written by RecordingEngine
+            lang: OCR language (only reported)
+            cpu_threads: Ignored (kept for a uniform signature)
+            latency: Simulated seconds per image
+            latency_per_mpx: Additional simulated seconds per megapixel
+        """
+        super().__init__(lang, cpu_threads)
+        self.record_path = Path(record_path)
+        self.latency = latency
+        self.latency_per_mpx = latency_per_mpx
+        self.results = None
+        self.hits = 0
+        self.misses = 0
+    
+    def version(self) -> str:
+        # Results change whenever the recording does
+        if not self.record_path.exists():
+            return "empty"
+        stat = self.record_path.stat()
+        return f"{stat.st_size}-{int(stat.st_mtime)}"
+    
+    def load(self):
+        if self.results is not None:
+            return
+        self.results = {}
+        if not self.record_path.exists():
+            get_log().warning(f"⚠️  Replay file not found: {self.record_path} (every image returns no text)",
+                              "replay_file_missing", path=str(self.record_path))
+            return
+        with open(self.record_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.results[entry["key"]] = entry["lines"]
+    
+    def recognize(self, images: list) -> list:
+        self.load()
+        
+        # Pretend to work as long as a real engine would
+        pixels = sum(image.shape[0] * image.shape[1] for image in images)
+        delay = self.latency * len(images) + self.latency_per_mpx * pixels / 1e6
+        if delay > 0:
+            time.sleep(delay)
+        
+        results = []
+        for image in images:
+            lines = self.results.get(image_key(image))
+            if lines is None:
+                self.misses += 1
+                lines = []
+            else:
+                self.hits += 1
+            results.append(lines)
+        return results
+
+
+def create_engine(spec: str = None, lang: str = 'en', cpu_threads: int = None, **options) -> OCREngine:
+    """
+    Create an OCR engine from a spec string (nothing is loaded yet).
+    
+    Args:
+        spec: "paddle" (default), "record:path.jsonl" or "replay:path.jsonl";
+              defaults to the OCR_ENGINE environment variable. An existing
+              OCREngine is returned as is (keeps a loaded model in use)
+        lang: OCR language
+        cpu_threads: Intra-op CPU threads for inference
+        **options: Engine-specific options (latency, latency_per_mpx for replay)
+    
+    Returns:
+        OCREngine instance
+    """
+    if isinstance(spec, OCREngine):
+        return spec
+    
+    spec = spec or os.environ.get("OCR_ENGINE") or "paddle"
+    kind, _, path = spec.partition(":")
+    
+    if kind == "paddle":
+        return PaddleEngine(lang=lang, cpu_threads=cpu_threads)
+    if kind == "record" and path:
+        return RecordingEngine(PaddleEngine(lang=lang, cpu_threads=cpu_threads), path)
+    if kind == "replay" and path:
+        return ReplayEngine(path, lang=lang, cpu_threads=cpu_threads, **options)
+    
+    raise ValueError(f"Unknown OCR engine '{spec}' (use paddle, record:<file> or replay:<file>)")
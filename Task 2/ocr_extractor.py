@@ -6,8 +6,12 @@ Developer: Developer 2 (Image Extraction Owner)
 Goal: Extract text from extracted images using PaddleOCR
 
 Features:
-- Reads existing metadata file
-- Runs OCR on all extracted images
+- Reads existing metadata file (images or chart crops)
+- Uses the PDF's own text layer inside each region when it has enough words
+- Runs OCR on all other extracted images
+- Journals every result as it finishes, so an interrupted run resumes
+- Optional per-image and per-document time limits: slow images are retried
+  smaller, then skipped and flagged
 - Creates NEW metadata file with "text" field added
 - Does NOT modify original metadata
 - Handles logos, infographics, flowcharts, diagrams
@@ -15,27 +19,36 @@ Features:
 Dependencies:
 - PaddleOCR
 - PaddlePaddle
+  (not needed with --engine replay:<file>, see ocr_engines.py)
 
 Output:
 - metadata_with_ocr (pdf_name).json - New metadata with OCR text
+- charts_metadata_with_ocr (pdf_name).json - Same for chart crops
 ================================================================================
 """
 
+import io
 import json
 import sys
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait as wait_connections
 from pathlib import Path
-
-# Suppress PaddlePaddle warnings
-os.environ['GLOG_minloglevel'] = '2'
-
-try:
-    from paddleocr import PaddleOCR
-except ImportError:
-    print("❌ PaddleOCR not installed!")
-    print("   Run: pip install paddlepaddle paddleocr")
-    sys.exit(1)
+import fitz  # PyMuPDF
+from event_log import configure_from_argv, get_log
+from ocr_cache import OCRCache
+from ocr_engines import create_engine
+from ocr_journal import OCRJournal
+from ocr_server import OCRServiceClient
+from resource_budget import BudgetExceeded
+from shm_transport import FrameRing, open_frame
+import numpy as np
+from PIL import Image
+from text_gate import text_likelihood
 
 
 class OCRExtractor:
@@ -44,21 +57,117 @@ class OCRExtractor:
     Creates a new metadata file with OCR text added.
     """
     
-    def __init__(self, pdf_name: str = None, metadata_path: str = None):
+    def __init__(self, pdf_name: str = None, metadata_path: str = None, batch_size: int = 1,
+                 workers: int = 1, cpu_threads: int = None, lang: str = 'en',
+                 min_score: float = 0.5, cache_path: str = None, cache_max_mb: int = 256,
+                 text_gate_threshold: float = None, evaluate_text_gate: bool = False,
+                 max_side: int = 2560, min_side: int = 64, max_upscale: float = 4.0,
+                 service: str = None, native_text: bool = True, native_min_words: int = 3,
+                 resume: bool = True, image_timeout: float = None,
+                 document_timeout: float = None, deadline: float = None,
+                 engine: str = None, engine_options: dict = None, profiler=None,
+                 budget=None, shared_memory: bool = True, output_dir: str = None, log=None):
         """
         Initialize the OCR Extractor.
         
         Args:
             pdf_name: Name of the PDF (without extension) to process
             metadata_path: Direct path to metadata file (alternative to pdf_name)
+            batch_size: Number of images sent to the OCR engine per call
+            workers: Number of OCR worker processes, each with its own model
+                     (1 = run in this process, 0 = one per CPU core)
+            cpu_threads: Intra-op threads per model. Defaults to the CPU count
+                         split evenly across workers, so workers don't
+                         oversubscribe cores
+            lang: OCR language
+            min_score: Minimum recognition confidence for text to be kept
+            cache_path: SQLite file for the OCR result cache (None = no cache)
+            cache_max_mb: Size limit of the cache before old entries are evicted
+            text_gate_threshold: If set, images whose text-likelihood score is
+                                 below this (e.g. 0.2) get text "" without OCR
+            evaluate_text_gate: Run OCR on every image anyway and report how many
+                                images with text the gate would have missed
+            max_side: Longest side (pixels) an image is shrunk to before OCR
+            min_side: Shortest side small images are enlarged towards
+            max_upscale: Largest enlargement factor for small images
+            service: Address of a running ocr_server.py ("host:port" or
+                     "unix:/path"); defaults to the OCR_SERVICE environment
+                     variable. Used when reachable, otherwise OCR runs here
+            native_text: Read text from the PDF's text layer inside each
+                         record's bbox before falling back to OCR
+            native_min_words: Fewest native words that count as "has text";
+                              regions with fewer go through OCR
+            resume: Reuse results journaled by an interrupted earlier run
+                    (False = discard the journal and start over)
+            image_timeout: Seconds one image may spend in OCR. An image that
+                           overruns is retried at half and quarter size, then
+                           skipped and flagged
+            document_timeout: Seconds the whole OCR stage of this PDF may take
+            deadline: Absolute wall-clock cutoff (time.time() value), e.g.
+                      shared by a batch of PDFs. With a document timeout or
+                      deadline, the smallest images are done first and the
+                      rest are skipped once time runs out
+            engine: OCR engine spec - "paddle", "record:file.jsonl" or
+                    "replay:file.jsonl"; defaults to the OCR_ENGINE
+                    environment variable, then PaddleOCR
+            engine_options: Extra engine settings (replay: latency,
+                            latency_per_mpx)
+            profiler: Optional MemoryProfiler (mem_profiler.py) that records
+                      run_ocr() as stage "ocr" (OCR worker processes are
+                      not measured)
+            budget: Optional ResourceBudget (resource_budget.py); image
+                    pixels are charged before decoding and BudgetExceeded
+                    is raised when the document goes over it
+            shared_memory: Hand preprocessed images to OCR worker processes
+                           through shared memory (shm_transport.py) instead
+                           of pickling them
+            output_dir: Folder holding the extracted images and metadata, and
+                        receiving the OCR output (default: Task 2 folder)
+            log: Optional EventLog (event_log.py); default is the shared log.
+                 Per-image results are item events, off unless sampled
         """
         self.script_dir = Path(__file__).parent.resolve()
+        self.output_dir = Path(output_dir) if output_dir else self.script_dir
+        self.batch_size = max(1, batch_size)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.cpu_threads = cpu_threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.lang = lang
+        self.min_score = min_score
+        self.cache_path = cache_path
+        self.cache_max_mb = cache_max_mb
+        self.cache_stats = None
+        self.text_gate_threshold = text_gate_threshold
+        self.evaluate_text_gate = evaluate_text_gate
+        self.text_gate_stats = None
+        self.max_side = max_side
+        self.min_side = min_side
+        self.max_upscale = max_upscale
+        self.native_text = native_text
+        self.native_min_words = native_min_words
+        self.resume = resume
+        self._journal = None
+        self.image_timeout = image_timeout
+        self.document_timeout = document_timeout
+        self.deadline = deadline
+        self.deadline_stats = None
+        self.error_count = 0
+        self._cutoff = None
+        self.engine_spec = engine
+        self.profiler = profiler
+        self.budget = budget
+        self.shared_memory = shared_memory
+        self.transport_stats = None
+        self.log = log if log is not None else get_log()
+        self._finished = 0
+        self.engine_options = engine_options or {}
+        # Nothing is loaded until the engine is first needed in this process
+        self.engine = create_engine(engine, lang=lang, cpu_threads=self.cpu_threads, **self.engine_options)
         
         # Find metadata file
         if metadata_path:
             self.metadata_path = Path(metadata_path)
         elif pdf_name:
-            self.metadata_path = self.script_dir / f"metadata ({pdf_name}).json"
+            self.metadata_path = self.output_dir / f"metadata ({pdf_name}).json"
         else:
             raise ValueError("Either pdf_name or metadata_path must be provided")
         
@@ -72,76 +181,726 @@ class OCRExtractor:
         # Get PDF name from metadata
         self.pdf_name = Path(self.metadata.get("pdf_name", "unknown")).stem
         
-        # Find images folder
-        self.images_dir = self.script_dir / f"images ({self.pdf_name})"
+        # Chart metadata lists "charts" rendered into "charts (name)/",
+        # image metadata lists "images" in "images (name)/"
+        if "charts" in self.metadata and "images" not in self.metadata:
+            self.records_key = "charts"
+            self.images_dir = self.output_dir / f"charts ({self.pdf_name})"
+            self.output_filename = f"charts_metadata_with_ocr ({self.pdf_name}).json"
+            self.journal_path = self.output_dir / f"charts_ocr_journal ({self.pdf_name}).jsonl"
+        else:
+            self.records_key = "images"
+            self.images_dir = self.output_dir / f"images ({self.pdf_name})"
+            self.output_filename = f"metadata_with_ocr ({self.pdf_name}).json"
+            self.journal_path = self.output_dir / f"ocr_journal ({self.pdf_name}).jsonl"
         
         if not self.images_dir.exists():
             raise FileNotFoundError(f"Images folder not found: {self.images_dir}")
         
-        # Initialize PaddleOCR
-        print("🔄 Initializing PaddleOCR (this may take a moment on first run)...")
-        self.ocr = PaddleOCR(
-            lang='en'  # English (change as needed)
-        )
-        print("✅ PaddleOCR initialized!\n")
+        # Prefer a warm OCR service over loading the model here
+        self.service = None
+        self.service_info = None
+        service = service or os.environ.get("OCR_SERVICE")
+        if service and self._has_time_limits():
+            self.log.info("ℹ️  OCR service not used: time limits need killable local workers")
+        elif service:
+            self._connect_service(service)
+        
+        # In worker-pool and time-limit mode each worker loads its own model instead
+        self.ocr = None
+        if self.service is None and self.workers <= 1 and not self._has_time_limits():
+            self._load_local_model()
+    
+    def _has_time_limits(self) -> bool:
+        """True if OCR runs under per-image, per-document or global time limits."""
+        return bool(self.image_timeout or self.document_timeout or self.deadline)
     
-    def _extract_text_from_image(self, image_path: Path) -> str:
+    def _connect_service(self, address: str):
         """
-        Extract text from a single image using PaddleOCR.
+        Use an OCR service if it is reachable and runs the same language.
         
         Args:
-            image_path: Path to the image file
+            address: "host:port" or "unix:/path/to.sock"
+        """
+        client = OCRServiceClient(address)
+        info = client.ping()
+        
+        if info is None:
+            self.log.warning(f"⚠️  OCR service not reachable at {address}, running OCR in-process")
+            return
+        
+        if info.get("engine") != self.engine.name:
+            self.log.warning(f"⚠️  OCR service at {address} runs {info.get('engine')}, not {self.engine.name} - running OCR in-process")
+            client.close()
+            return
+        
+        if info.get("lang") != self.lang:
+            self.log.warning(f"⚠️  OCR service at {address} runs lang '{info.get('lang')}', not '{self.lang}' - running OCR in-process")
+            client.close()
+            return
+        
+        self.service = client
+        self.service_info = info
+        if self.workers > 1:
+            self.log.info("ℹ️  Worker pool disabled: the OCR service schedules inference")
+            self.workers = 1
+        self.log.info(f"✅ Using OCR service at {address} ({info.get('engine')} {info.get('engine_version')})\n")
+    
+    def _load_local_model(self):
+        """Load the OCR engine in this process."""
+        self.log.info(f"🔄 Initializing {self.engine.name} (this may take a moment on first run)...")
+        self.engine.load()
+        self.ocr = self.engine
+        self.log.info(f"✅ {self.engine.name} initialized!\n")
+    
+    def _extract_text_from_image(self, image) -> str:
+        """
+        Extract text from a single image using the OCR engine.
+        
+        Args:
+            image: Preprocessed image array (BGR) or path to an image file
             
         Returns:
-            Extracted text as a single string, or empty string if no text found
+            Extracted text as a single string ("" if no text found), or None
+            if the engine failed - not a result, so it is neither cached
+            nor journaled
         """
         try:
-            # Use predict() for newer PaddleOCR versions (3.3+)
-            result = self.ocr.predict(str(image_path))
+            if not isinstance(image, np.ndarray):
+                image = self._preprocess_image(Image.open(image))
+            return self._lines_to_text(self.ocr.recognize([image])[0])
             
-            if result is None or len(result) == 0:
-                return ""
+        except Exception as e:
+            self.log.warning(f"   ⚠️ OCR error: {e}", "ocr_error", error=str(e))
+            return None
+    
+    def _extract_text_from_batch(self, images: list) -> list:
+        """
+        Extract text from several images with one OCR call.
+        
+        Args:
+            images: Preprocessed image arrays (BGR)
+            
+        Returns:
+            List of extracted texts, in the same order as images (None for
+            images the engine failed on)
+        """
+        if self.service is not None:
+            try:
+                return [self._lines_to_text(lines) for lines in self.service.recognize(list(images))]
+            except (ConnectionError, TimeoutError, RuntimeError) as e:
+                # Service went away mid-run - finish the job in-process
+                self.log.warning(f"   ⚠️ {e}; switching to in-process {self.engine.name}")
+                self.service.close()
+                self.service = None
+                self._load_local_model()
+        
+        if len(images) == 1:
+            return [self._extract_text_from_image(images[0])]
+        
+        try:
+            return [self._lines_to_text(lines) for lines in self.ocr.recognize(list(images))]
+        except Exception as e:
+            self.log.warning(f"   ⚠️ Batch OCR error: {e}, retrying one by one")
+        
+        return [self._extract_text_from_image(image) for image in images]
+    
+    def _timed_batch(self, images: list) -> tuple:
+        """Run one batch and measure it. Returns (texts, seconds)."""
+        started = time.perf_counter()
+        texts = self._extract_text_from_batch(images)
+        return texts, time.perf_counter() - started
+    
+    def _worker_options(self) -> dict:
+        """Constructor options needed to rebuild this extractor in a worker process."""
+        return {
+            "batch_size": self.batch_size,
+            "cpu_threads": self.cpu_threads,
+            "lang": self.lang,
+            "min_score": self.min_score,
+            "engine": self.engine_spec,
+            "engine_options": self.engine_options,
+            "output_dir": str(self.output_dir)
+        }
+    
+    def _journal_settings(self) -> dict:
+        """Everything that changes per-image results; a journal is only resumed if it matches."""
+        settings = self._cache_settings()
+        settings.update({
+            "source_extraction_date": self.metadata.get("extraction_date"),
+            "records": self.records_key,
+            "native_text": self.native_text,
+            "native_min_words": self.native_min_words,
+            "text_gate_threshold": self.text_gate_threshold,
+            "evaluate_text_gate": self.evaluate_text_gate,
+            "image_timeout": self.image_timeout
+        })
+        return settings
+    
+    def _journal_result(self, img_info: dict):
+        """Commit a finished record to the journal (if one is open)."""
+        if self._journal is not None:
+            self._journal.append(img_info["image_name"], img_info)
+    
+    def _engine_settings(self) -> dict:
+        """Engine identity and settings that change its output."""
+        if self.service_info:
+            identity = {"engine": self.service_info["engine"], "engine_version": self.service_info["engine_version"]}
+        else:
+            identity = self.engine.settings()
+        return {
+            "engine": identity["engine"],
+            "engine_version": identity["engine_version"],
+            "lang": self.lang,
+            "min_score": self.min_score
+        }
+    
+    def _cache_settings(self) -> dict:
+        """Settings that change the text read from given image bytes; part of every cache key."""
+        settings = self._engine_settings()
+        # Preprocessing decides what the engine actually sees
+        settings.update({
+            "max_side": self.max_side,
+            "min_side": self.min_side,
+            "max_upscale": self.max_upscale
+        })
+        return settings
+    
+    def _run_batches(self, batches):
+        """
+        Run OCR batches in this process or spread over a worker pool.
+        
+        Pool workers load their model once and pull batches from a shared
+        queue, so a slow batch only holds up the worker that got it. Only a
+        few batches per worker are in flight at a time, so preprocessed images
+        are never all held in memory at once.
+        
+        Args:
+            batches: Iterable of (batch_number, items) where items is a list of
+                     (position, img_info, image_array)
             
-            # Extract all text from results
-            text_parts = []
+        Yields:
+            Tuples of (batch_number, items, texts, seconds); in pool mode these
+            arrive in completion order
+        """
+        if self._has_time_limits():
+            yield from self._run_batches_with_deadlines(batches)
+            return
+        
+        if self.ocr is not None or self.service is not None:
+            for batch_number, items in batches:
+                texts, elapsed = self._timed_batch([image for _, _, image in items])
+                yield batch_number, items, texts, elapsed
+            return
+        
+        self.log.info(f"⚙️  Starting {self.workers} OCR worker(s), {self.cpu_threads} thread(s) each...")
+        
+        # One slot per image that can be in flight (two batches per worker)
+        ring = self._frame_ring(self.workers * 2 * self.batch_size)
+        
+        with ring, ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_ocr_worker,
+            initargs=(str(self.metadata_path), self._worker_options())
+        ) as pool:
+            in_flight = {}
+            batches = iter(batches)
+            exhausted = False
             
-            # Handle different result formats
-            for page_result in result:
-                if page_result is None:
-                    continue
+            while in_flight or not exhausted:
+                # Keep every worker busy with one batch queued behind it
+                while not exhausted and len(in_flight) < self.workers * 2:
+                    try:
+                        batch_number, items = next(batches)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    frames = [ring.put(image) for _, _, image in items]
+                    future = pool.submit(_ocr_batch_in_worker, frames)
+                    in_flight[future] = (batch_number, items, frames)
+                
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_number, items, frames = in_flight.pop(future)
+                    for frame in frames:
+                        ring.release(frame)
+                    texts, elapsed = future.result()
+                    yield batch_number, items, texts, elapsed
+    
+    def _run_batches_with_deadlines(self, batches):
+        """
+        Run OCR batches in killable worker processes under time limits.
+        
+        A stuck predict() call cannot be interrupted inside a process, so each
+        worker is a separate process that is killed and restarted when its
+        batch overruns. An overrunning batch is split into single images; an
+        overrunning image is retried at half and then quarter size, and
+        skipped after that. Once the document cutoff passes, nothing new is
+        started and running batches are stopped; their workers are not
+        restarted. A (re)started worker gets no work until its "ready"
+        message arrives, which is picked up in the same wait as results,
+        so loading a model never delays the limits of other workers.
+        
+        Args:
+            batches: Iterable of (batch_number, items) as in _run_batches
+        
+        Yields:
+            Tuples of (batch_number, items, texts, seconds). A text is None
+            when the image was skipped; img_info["ocr_skipped"] says why
+        """
+        cutoff = self._cutoff
+        stats = self.deadline_stats
+        self.log.info(f"⚙️  Starting {self.workers} killable OCR worker(s), {self.cpu_threads} thread(s) each...")
+        
+        ring = self._frame_ring(self.workers * self.batch_size)
+        workers = [_KillableOCRWorker(str(self.metadata_path), self._worker_options())
+                   for _ in range(self.workers)]
+        sent = {}  # worker -> frames of its running batch
+        # Retries (split batches, downscaled images) go ahead of new batches
+        retries = deque()
+        batches = iter(batches)
+        exhausted = False
+        running = {}  # worker -> (batch_number, items, level, started)
+        
+        try:
+            while True:
+                if cutoff is not None and time.time() >= cutoff:
+                    # Out of time: nothing new starts, whatever is left is skipped
+                    while retries:
+                        batch_number, items, level = retries.popleft()
+                        yield batch_number, items, self._skip_items(items, "deadline"), 0.0
+                    for batch_number, items in batches:
+                        yield batch_number, items, self._skip_items(items, "deadline"), 0.0
+                    exhausted = True
+                else:
+                    # Hand out work to idle workers whose model has loaded
+                    for worker in workers:
+                        if worker in running or not worker.ready:
+                            continue
+                        if retries:
+                            batch_number, items, level = retries.popleft()
+                        elif not exhausted:
+                            try:
+                                batch_number, items = next(batches)
+                                level = 0
+                            except StopIteration:
+                                exhausted = True
+                                break
+                        else:
+                            break
+                    
+                        sent[worker] = [ring.put(image) for _, _, image in items]
+                        worker.send(sent[worker])
+                        running[worker] = (batch_number, items, level, time.monotonic())
+                
+                if not running and exhausted and not retries:
+                    break
+                loading = [worker for worker in workers if worker.loading]
+                
+                # Wait until a batch finishes, a worker is ready or the earliest limit expires.
+                # Model loading does not count against any batch's time limit
+                limits = {worker: self._batch_limit(job) for worker, job in running.items()}
+                if cutoff is not None:
+                    limits[None] = time.monotonic() + cutoff - time.time()
+                earliest = min(limits.values(), default=float("inf"))
+                timeout = None if earliest == float("inf") else max(0.0, earliest - time.monotonic())
+                ready = wait_connections([worker.conn for worker in list(running) + loading], timeout)
+                
+                for worker in loading:
+                    if worker.conn in ready:
+                        worker.check_ready()
+                
+                for worker in list(running):
+                    batch_number, items, level, started = running[worker]
                     
-                # Check if it's the new format (dict with 'rec_texts')
-                if isinstance(page_result, dict):
-                    if 'rec_texts' in page_result:
-                        texts = page_result.get('rec_texts', [])
-                        scores = page_result.get('rec_scores', [])
-                        for i, text in enumerate(texts):
-                            score = scores[i] if i < len(scores) else 1.0
-                            if score > 0.5:  # Only include high-confidence text
-                                text_parts.append(text)
-                    elif 'text' in page_result:
-                        text_parts.append(page_result['text'])
-                # Old format (list of tuples)
-                elif isinstance(page_result, list):
-                    for item in page_result:
-                        if item is None:
+                    if worker.conn in ready:
+                        del running[worker]
+                        result = worker.receive()
+                        for frame in sent.pop(worker):
+                            ring.release(frame)
+                        if result is not None:
+                            texts, elapsed = result
+                            if level:
+                                scale = 0.5 ** level
+                                for _, img_info, _ in items:
+                                    img_info["ocr_degraded"] = {"reason": "image_timeout", "scale": scale}
+                                stats["degraded"] += len(items)
+                            yield batch_number, items, texts, elapsed
                             continue
-                        if isinstance(item, dict):
-                            if 'rec_texts' in item:
-                                text_parts.extend(item['rec_texts'])
-                        elif isinstance(item, (list, tuple)) and len(item) >= 2:
-                            text = item[1][0] if isinstance(item[1], (list, tuple)) else item[1]
-                            confidence = item[1][1] if isinstance(item[1], (list, tuple)) and len(item[1]) > 1 else 1.0
-                            if confidence > 0.5:
-                                text_parts.append(str(text))
+                        # The worker died (crash, out of memory) - treat like an overrun
+                    elif time.monotonic() < limits[worker]:
+                        continue
+                    else:
+                        del running[worker]
+                    
+                    elapsed = time.monotonic() - started
+                    for frame in sent.pop(worker, []):
+                        ring.release(frame)
+                    
+                    if cutoff is not None and time.time() >= cutoff:
+                        # No point loading a model that will never be used
+                        worker.kill()
+                        yield batch_number, items, self._skip_items(items, "deadline"), elapsed
+                        continue
+                    
+                    worker.restart()
+                    if len(items) > 1:
+                        # Find the slow image(s): retry the batch one image at a time
+                        self.log.info(f"⏳ Batch {batch_number} overran {elapsed:.1f}s, retrying its images one by one")
+                        retries.extendleft((batch_number, [item], level) for item in reversed(items))
+                    elif level < 2:
+                        i, img_info, image = items[0]
+                        self.log.info(f"⏳ {img_info['image_name']}: overran {elapsed:.1f}s, retrying at {0.5 ** (level + 1):g}x size")
+                        retries.appendleft((batch_number, [(i, img_info, self._downscale(image))], level + 1))
+                    else:
+                        stats["timed_out"] += 1
+                        yield batch_number, items, self._skip_items(items, "timeout"), elapsed
+        finally:
+            for worker in workers:
+                worker.stop()
+            ring.close()
+    
+    def _frame_ring(self, slots: int) -> FrameRing:
+        """Shared-memory ring for handing images to workers (see shm_transport.py)."""
+        ring = FrameRing(slots)
+        ring.enabled = ring.enabled and self.shared_memory
+        # Counted in the metadata once the run finishes
+        self.transport_stats = ring.stats
+        return ring
+    
+    def _batch_limit(self, job: tuple) -> float:
+        """Monotonic time at which a running batch counts as overrun."""
+        batch_number, items, level, started = job
+        limits = []
+        if self.image_timeout:
+            limits.append(started + self.image_timeout * len(items))
+        if self._cutoff is not None:
+            # Convert the wall-clock cutoff to the monotonic clock
+            limits.append(time.monotonic() + self._cutoff - time.time())
+        return min(limits) if limits else float("inf")
+    
+    def _skip_items(self, items: list, reason: str) -> list:
+        """Flag images that ran out of time; returns None texts for them."""
+        for _, img_info, _ in items:
+            img_info["ocr_skipped"] = reason
+        if reason == "deadline":
+            self.deadline_stats["deadline_skipped"] += len(items)
+        return [None] * len(items)
+    
+    def _downscale(self, image: np.ndarray) -> np.ndarray:
+        """Halve both sides of a preprocessed image array."""
+        height, width = image.shape[:2]
+        resized = Image.fromarray(image).resize(
+            (max(1, width // 2), max(1, height // 2)), Image.LANCZOS
+        )
+        return np.ascontiguousarray(np.asarray(resized))
+    
+    def _preprocess_image(self, image: Image.Image, max_side: int = None) -> np.ndarray:
+        """
+        Normalize an image for OCR and return it as an array.
+        
+        - Palette, CMYK, grayscale and 16-bit images are converted to RGB
+        - Transparent areas are flattened onto white (logos are often RGBA)
+        - The longest side is clamped to max_side (huge scans make detection slow)
+        - Small images are upscaled so short text lines reach min_side pixels
+        
+        Args:
+            image: Decoded PIL image
+            max_side: Override for the longest-side limit
             
-            # Join all text with spaces
-            full_text = " ".join(text_parts)
-            return full_text.strip()
+        Returns:
+            Contiguous uint8 array in BGR channel order, as PaddleOCR expects
+        """
+        max_side = max_side or self.max_side
+        
+        if image.mode in ("I", "I;16", "I;16B", "I;16L"):
+            image = image.convert("I").point(lambda v: v * (1 / 256)).convert("L")
+        
+        if image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info):
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        
+        width, height = image.size
+        long_side, short_side = max(width, height), min(width, height)
+        
+        scale = 1.0
+        if long_side > max_side:
+            scale = max_side / long_side
+        elif 0 < short_side < self.min_side:
+            scale = min(self.min_side / short_side, self.max_upscale, max_side / long_side)
+        
+        if scale != 1.0:
+            new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            resample = Image.LANCZOS if scale < 1 else Image.BICUBIC
+            image = image.resize(new_size, resample)
+        
+        return np.ascontiguousarray(np.asarray(image)[:, :, ::-1])
+    
+    def _gate_image(self, i: int, img_info: dict, image: Image.Image, total: int, gated: dict) -> bool:
+        """
+        Score one image with the cheap text-likelihood gate.
+        
+        Args:
+            i: Position of the image (for progress output)
+            img_info: Image record (updated in place)
+            image: Decoded PIL image
+            total: Total number of images (for progress output)
+            gated: {position: score} of images below the threshold (updated)
             
+        Returns:
+            True if the image should still go through OCR
+        """
+        try:
+            score, _ = text_likelihood(image)
         except Exception as e:
-            print(f"   ⚠️ OCR error: {e}")
-            return ""
+            # Unscorable here does not mean unreadable for OCR - let it through
+            self.log.warning(f"   ⚠️ Text gate could not score {img_info['image_name']}: {e}",
+                             "text_gate_failed", image=img_info['image_name'], error=str(e))
+            return True
+        
+        img_info["text_score"] = score
+        
+        if score >= self.text_gate_threshold:
+            return True
+        
+        gated[i] = score
+        if self.evaluate_text_gate:
+            return True
+        
+        img_info["text"] = ""
+        img_info["text_source"] = "none"
+        img_info["ocr_skipped"] = "text_gate"
+        self._journal_result(img_info)
+        if self.log.sample("ocr_skipped"):
+            self.log.item("ocr_skipped", f"🔄 [{i+1}/{total}] {img_info['image_name']}: ⏭️  Skipped (text score {score})",
+                          image=img_info['image_name'], reason="text_gate", text_score=score)
+        self._advance(total)
+        return False
+    
+    def _prepare_images(self, pending: list, total: int, cache, cache_keys: dict, gated: dict):
+        """
+        Read each image once and decide whether it needs inference.
+        
+        The file bytes feed the cache key, the decoded image feeds the text
+        gate, and the same decoded image is preprocessed into the array that
+        goes to the engine - nothing is read from disk twice.
+        
+        Args:
+            pending: List of (position, img_info, image_path)
+            total: Total number of images (for progress output)
+            cache: OCRCache or None
+            cache_keys: {position: cache key} for misses (filled in here)
+            gated: {position: score} of gated images (filled in here)
+            
+        Yields:
+            (position, img_info, image_array) for images that need OCR
+        """
+        for i, img_info, image_path in pending:
+            data = image_path.read_bytes()
+            
+            # Serve repeated images from the cache without running inference
+            if cache is not None:
+                key = cache.key_for(data)
+                text = cache.get(key)
+                if text is not None:
+                    img_info["text"] = text
+                    img_info["text_source"] = "ocr"
+                    self._journal_result(img_info)
+                    self._log_result(i, total, img_info, " (cached)")
+                    continue
+                cache_keys[i] = key
+            
+            try:
+                # Image.open only reads the header, so the declared size is
+                # charged before the pixels are decoded
+                image = Image.open(io.BytesIO(data))
+                if self.budget is not None:
+                    self.budget.add_pixels(image.width * image.height)
+                image.load()
+            except (BudgetExceeded, MemoryError):
+                raise
+            except Exception as e:
+                self.log.error(f"🔄 [{i+1}/{total}] {img_info['image_name']}: ❌ Cannot decode image: {e}",
+                               "image_undecodable", image=img_info['image_name'], error=str(e))
+                img_info["text"] = ""
+                self._advance(total)
+                continue
+            
+            # Skip photos, gradients and blanks that cannot contain text
+            if self.text_gate_threshold is not None:
+                if not self._gate_image(i, img_info, image, total, gated):
+                    continue
+            
+            yield i, img_info, self._preprocess_image(image)
+    
+    def _group_batches(self, prepared):
+        """Group prepared images into numbered batches of batch_size."""
+        batch = []
+        batch_number = 0
+        for item in prepared:
+            batch.append(item)
+            if len(batch) == self.batch_size:
+                batch_number += 1
+                yield batch_number, batch
+                batch = []
+        if batch:
+            yield batch_number + 1, batch
+    
+    def _native_words(self, doc: fitz.Document, img_info: dict) -> list:
+        """
+        Read the words of the PDF's text layer inside one record's region.
+        
+        Args:
+            doc: Open source PDF
+            img_info: Image or chart record with page_number and bbox
+        
+        Returns:
+            List of words in reading order (empty if the region is unknown)
+        """
+        page_number = img_info.get("page_number", 0)
+        if not 1 <= page_number <= doc.page_count:
+            return []
+        page = doc[page_number - 1]
+        
+        bbox = img_info.get("bbox")
+        if bbox is None:
+            # Full-page chart renders have no bbox - the region is the page
+            clip = page.rect
+        else:
+            clip = fitz.Rect(bbox["x0"], bbox["y0"], bbox["x1"], bbox["y1"]) & page.rect
+            if clip.is_empty:
+                # Image whose placement could not be found
+                return []
+        
+        words = page.get_text("words", clip=clip)
+        return [w[4] for w in sorted(words, key=lambda w: (w[5], w[6], w[7]))]
+    
+    def _apply_native_text(self, records: list, total: int) -> int:
+        """
+        Fill in text from the PDF's text layer where a region has enough of it.
+        
+        Vector charts and images overlaid with real text can be read exactly
+        and far faster than OCR can recognize a render of them.
+        
+        Args:
+            records: Image or chart records (updated in place)
+            total: Total number of records (for progress output)
+        
+        Returns:
+            Number of records that got native text
+        """
+        if not self.metadata.get("pdf_path"):
+            # Extracted from an in-memory PDF - there is no file to reopen
+            self.log.warning("⚠️  Source PDF was not a file, using OCR only\n")
+            return 0
+        
+        pdf_path = Path(self.metadata["pdf_path"])
+        if not pdf_path.is_file():
+            self.log.warning(f"⚠️  Source PDF not found ({pdf_path}), using OCR only\n")
+            return 0
+        
+        found = 0
+        doc = fitz.open(pdf_path)
+        try:
+            for i, img_info in enumerate(records):
+                if "text_source" in img_info:
+                    # Already finished in an earlier run
+                    continue
+                
+                if self.budget is not None:
+                    self.budget.check_time()
+                
+                try:
+                    words = self._native_words(doc, img_info)
+                except Exception as e:
+                    self.log.warning(f"   ⚠️ Cannot read text layer for {img_info.get('image_name', '')}: {e}",
+                                     "text_layer_failed", image=img_info.get('image_name', ''), error=str(e))
+                    continue
+                
+                if len(words) < self.native_min_words:
+                    continue
+                
+                img_info["text"] = " ".join(words)
+                img_info["text_source"] = "native"
+                self._journal_result(img_info)
+                found += 1
+                self._log_result(i, total, img_info, " (text layer)")
+        finally:
+            doc.close()
+        
+        return found
+    
+    def _log_result(self, i: int, total: int, img_info: dict, note: str = ""):
+        """Log the OCR outcome for one image (an item event) and advance progress."""
+        if self.log.sample("ocr_result"):
+            text = img_info.get("text", "")
+            if text:
+                # Truncate for display
+                display_text = text[:50] + "..." if len(text) > 50 else text
+                message = f"🔄 [{i+1}/{total}] {img_info['image_name']}: ✅ Found: \"{display_text}\"{note}"
+            else:
+                message = f"🔄 [{i+1}/{total}] {img_info['image_name']}: 📷 No text found (image only){note}"
+            self.log.item("ocr_result", message, image=img_info['image_name'],
+                          text_source=img_info.get("text_source"), chars=len(text), note=note.strip(" ()") or None)
+        self._advance(total)
+    
+    def _advance(self, total: int):
+        """Count one more finished image towards the rate-limited progress line."""
+        self._finished += 1
+        stage = "ocr" if self.records_key == "images" else "ocr_charts"
+        self.log.progress(stage, self._finished, total, unit="images")
+    
+    def _text_gate_report(self, checked: int, gated: dict, images: list) -> dict:
+        """
+        Summarize what the text gate did (and, in evaluation mode, what it missed).
+        
+        Args:
+            checked: Number of images the gate scored
+            gated: {position: score} of images below the threshold
+            images: Image records with OCR text filled in
+            
+        Returns:
+            Dictionary for the "text_gate" metadata field
+        """
+        report = {
+            "threshold": self.text_gate_threshold,
+            "checked": checked,
+            "below_threshold": len(gated),
+            "skip_rate": round(len(gated) / checked, 3) if checked else 0.0,
+            "evaluation": self.evaluate_text_gate
+        }
+        
+        if self.evaluate_text_gate:
+            with_text = [i for i in range(len(images)) if images[i].get("text", "") and "text_score" in images[i]]
+            missed = [images[i]["image_name"] for i in with_text if i in gated]
+            report["images_with_text"] = len(with_text)
+            report["missed_text"] = len(missed)
+            report["recall"] = round(1 - len(missed) / len(with_text), 3) if with_text else 1.0
+            report["missed_images"] = missed
+        
+        return report
+    
+    def _lines_to_text(self, lines: list) -> str:
+        """
+        Join recognized lines into one string, keeping confident ones only.
+        
+        Args:
+            lines: List of (text, score) pairs
+            
+        Returns:
+            Extracted text as a single string, or empty string if no text found
+        """
+        text_parts = [str(text) for text, score in lines if score > self.min_score]
+        
+        # Join all text with spaces
+        full_text = " ".join(text_parts)
+        return full_text.strip()
     
     def run_ocr(self) -> dict:
         """
@@ -150,95 +909,369 @@ class OCRExtractor:
         Returns:
             New metadata dictionary with OCR text added
         """
-        print(f"\n{'='*60}")
-        print(f"🔍 OCR EXTRACTOR - Task 2")
-        print(f"{'='*60}")
-        print(f"📄 PDF: {self.metadata.get('pdf_name', 'Unknown')}")
-        print(f"📂 Images: {self.images_dir}")
-        print(f"🖼️  Total Images: {len(self.metadata.get('images', []))}")
-        print(f"{'='*60}\n")
+        self.log.info(f"\n{'='*60}")
+        self.log.info(f"🔍 OCR EXTRACTOR - Task 2")
+        self.log.info(f"{'='*60}")
+        self.log.info(f"📄 PDF: {self.metadata.get('pdf_name', 'Unknown')}")
+        self.log.info(f"📂 Images: {self.images_dir}")
+        self.log.info(f"🖼️  Total Images: {len(self.metadata.get(self.records_key, []))}")
+        self.log.info(f"{'='*60}\n")
+        self.log.info(event="ocr_started", pdf=self.metadata.get('pdf_name', 'Unknown'),
+                      records=self.records_key, total=len(self.metadata.get(self.records_key, [])))
+        
+        if self.budget is not None and self.budget.started_at is None:
+            self.budget.start()
+        
+        if self.profiler is not None:
+            stage = "ocr" if self.records_key == "images" else "ocr_charts"
+            self.profiler.begin(self.metadata.get('pdf_name', self.pdf_name), stage)
         
         # Create new metadata (deep copy to not modify original)
         new_metadata = json.loads(json.dumps(self.metadata))
         new_metadata["ocr_extraction_date"] = datetime.now().isoformat()
-        new_metadata["ocr_engine"] = "PaddleOCR"
+        new_metadata["ocr_engine"] = self.engine.name
+        if self.service is not None:
+            new_metadata["ocr_service"] = self.service.address
+        
+        images = new_metadata.get(self.records_key, [])
+        total = len(images)
+        
+        # Pick up where an interrupted run stopped
+        journal = OCRJournal(self.journal_path, self._journal_settings(), log=self.log)
+        if not self.resume and self.journal_path.exists():
+            self.journal_path.unlink()
+        journaled = journal.load()
+        resumed = 0
+        for img_info in images:
+            entry = journaled.get(img_info.get("image_name"))
+            if entry is not None:
+                img_info.update(entry)
+                resumed += 1
+        if resumed:
+            self.log.info(f"♻️  Resuming: {resumed}/{total} image(s) already done ({self.journal_path.name})\n")
+        journal.open()
+        self._journal = journal
+        self._finished = resumed
         
-        images_with_text = 0
-        images_without_text = 0
+        # Take text straight from the PDF where the region has a text layer
+        if self.native_text:
+            self._apply_native_text(images, total)
         
-        # Process each image
-        for i, img_info in enumerate(new_metadata.get("images", [])):
+        # Collect images that exist on disk (position kept for progress output)
+        pending = []
+        for i, img_info in enumerate(images):
+            if "text_source" in img_info:
+                # Native text, or journaled by an earlier run
+                continue
+            
             image_name = img_info.get("image_name", "")
             image_path = self.images_dir / image_name
             
-            print(f"🔄 Processing [{i+1}/{len(new_metadata['images'])}]: {image_name}...", end=" ")
-            
             if not image_path.exists():
-                print("❌ File not found!")
+                self.log.error(f"🔄 [{i+1}/{total}] {image_name}: ❌ File not found!",
+                               "image_missing", image=image_name)
                 img_info["text"] = ""
-                images_without_text += 1
+                self._advance(total)
                 continue
             
-            # Extract text
-            text = self._extract_text_from_image(image_path)
+            pending.append((i, img_info, image_path))
+        
+        if self._has_time_limits():
+            cutoffs = [self.deadline] if self.deadline else []
+            if self.document_timeout:
+                cutoffs.append(time.time() + self.document_timeout)
+            self._cutoff = min(cutoffs) if cutoffs else None
+            self.deadline_stats = {"degraded": 0, "timed_out": 0, "deadline_skipped": 0}
+            if self._cutoff is not None:
+                # Cheap images first, so the cutoff only costs the big ones
+                pending.sort(key=lambda p: p[1].get("width", 0) * p[1].get("height", 0))
+        
+        cache = None
+        cache_keys = {}
+        if self.cache_path:
+            cache = OCRCache(self.cache_path, self._cache_settings(),
+                             max_bytes=self.cache_max_mb * 1024 * 1024)
+        
+        # Read, check cache, gate and preprocess lazily, grouped into batches
+        gated = {}
+        prepared = self._prepare_images(pending, total, cache, cache_keys, gated)
+        batches = self._group_batches(prepared)
+        
+        # Run OCR batch by batch, mapping texts back to their images
+        batch_timings = []
+        for batch_number, items, texts, elapsed in self._run_batches(batches):
+            batch_timings.append({
+                "batch": batch_number,
+                "images": len(items),
+                "seconds": round(elapsed, 3)
+            })
+            if self.batch_size > 1:
+                if self.log.sample("ocr_batch"):
+                    self.log.item("ocr_batch", f"⏱️  Batch {batch_number}: {len(items)} image(s) in {elapsed:.2f}s",
+                                  batch=batch_number, images=len(items), seconds=round(elapsed, 3))
             
-            # Add text field to image info
-            img_info["text"] = text
+            for (i, img_info, _), text in zip(items, texts):
+                if text is None and "ocr_skipped" not in img_info:
+                    # Engine error: not cached or journaled, so a rerun retries the image
+                    img_info["text"] = ""
+                    img_info["ocr_error"] = True
+                    self._advance(total)
+                    continue
+                
+                if text is None:
+                    # Out of time; deadline skips are not journaled so a rerun retries them
+                    img_info["text"] = ""
+                    if img_info["ocr_skipped"] == "timeout":
+                        img_info["text_source"] = "none"
+                        self._journal_result(img_info)
+                    if self.log.sample("ocr_skipped"):
+                        self.log.item("ocr_skipped", f"🔄 [{i+1}/{total}] {img_info['image_name']}: ⏭️  Skipped ({img_info['ocr_skipped']})",
+                                      image=img_info['image_name'], reason=img_info['ocr_skipped'])
+                    self._advance(total)
+                    continue
+                
+                # Add text field to image info
+                img_info["text"] = text
+                img_info["text_source"] = "ocr"
+                # Degraded results are not what the full image would give
+                if cache is not None and "ocr_degraded" not in img_info:
+                    cache.put(cache_keys[i], text)
+                self._journal_result(img_info)
+                self._log_result(i, total, img_info)
             
-            if text:
-                images_with_text += 1
-                # Truncate for display
-                display_text = text[:50] + "..." if len(text) > 50 else text
-                print(f"✅ Found: \"{display_text}\"")
-            else:
-                images_without_text += 1
-                print("📷 No text found (image only)")
+            journal.sync()
+            if self.profiler is not None:
+                self.profiler.checkpoint()
+        
+        batch_timings.sort(key=lambda t: t["batch"])
+        
+        if cache is not None:
+            cache.close()
+            self.cache_stats = cache.stats()
+        
+        if self.service is not None:
+            self.service.close()
+        
+        # Records that got no text from either source (missing, gated, undecodable)
+        for img_info in images:
+            img_info.setdefault("text_source", "none")
+        
+        journal.close()
+        self._journal = None
+        
+        images_with_text = sum(1 for img in images if img.get("text", ""))
+        images_without_text = total - images_with_text
+        native_count = sum(1 for img in images if img["text_source"] == "native")
+        self.error_count = sum(1 for img in images if img.get("ocr_error"))
+        
+        if self.text_gate_threshold is not None:
+            gate_checked = sum(1 for img in images if "text_score" in img)
+            # Rebuilt from the records so images scored before a resume count too
+            gated = {
+                i: img["text_score"] for i, img in enumerate(images)
+                if "text_score" in img and img["text_score"] < self.text_gate_threshold
+            }
+            self.text_gate_stats = self._text_gate_report(gate_checked, gated, images)
         
         # Sort images: ones with text first, then ones without text
         # Within each group, maintain original order (by page_number, then image_index)
-        new_metadata["images"] = sorted(
-            new_metadata["images"],
+        index_key = "chart_index" if self.records_key == "charts" else "image_index"
+        new_metadata[self.records_key] = sorted(
+            new_metadata[self.records_key],
             key=lambda x: (
                 0 if x.get("text", "") else 1,  # Text first (0), no text second (1)
                 x.get("page_number", 0),         # Then by page number
-                x.get("image_index", 0)          # Then by image index
+                x.get(index_key) or 0            # Then by image/chart index
             )
         )
         
         # Add counts to metadata for easy reference
-        new_metadata["images_with_text_count"] = images_with_text
-        new_metadata["images_without_text_count"] = images_without_text
+        new_metadata[f"{self.records_key}_with_text_count"] = images_with_text
+        new_metadata[f"{self.records_key}_without_text_count"] = images_without_text
+        new_metadata["native_text_count"] = native_count
+        new_metadata["ocr_error_count"] = self.error_count
+        new_metadata["ocr_batch_size"] = self.batch_size
+        new_metadata["ocr_batches"] = batch_timings
+        if cache is not None:
+            new_metadata["ocr_cache"] = self.cache_stats
+        if self.text_gate_stats is not None:
+            new_metadata["text_gate"] = self.text_gate_stats
+        if self.deadline_stats is not None:
+            new_metadata["ocr_time_limits"] = dict(
+                image_timeout=self.image_timeout,
+                document_timeout=self.document_timeout,
+                deadline=datetime.fromtimestamp(self.deadline).isoformat() if self.deadline else None,
+                **self.deadline_stats
+            )
+        if self.budget is not None:
+            new_metadata["budget_usage"] = self.budget.usage()
+        if self.transport_stats is not None:
+            new_metadata["ocr_transport"] = self.transport_stats
         
-        # Save new metadata with OCR
+        # Save new metadata with OCR; the journal is no longer needed
         self._save_ocr_metadata(new_metadata)
+        journal.remove()
         
         # Print summary
-        self._print_summary(images_with_text, images_without_text)
+        self._print_summary(images_with_text, images_without_text, native_count)
+        
+        if self.profiler is not None:
+            self.profiler.end()
         
         return new_metadata
     
     def _save_ocr_metadata(self, metadata: dict):
         """Save metadata with OCR to new file."""
-        output_filename = f"metadata_with_ocr ({self.pdf_name}).json"
-        output_path = self.script_dir / output_filename
+        output_path = self.output_dir / self.output_filename
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False)
         
-        print(f"\n💾 OCR Metadata saved: {output_path}")
+        self.log.info(f"\n💾 OCR Metadata saved: {output_path}")
     
-    def _print_summary(self, with_text: int, without_text: int):
+    def _print_summary(self, with_text: int, without_text: int, native_count: int = 0):
         """Print OCR extraction summary."""
         total = with_text + without_text
-        print(f"\n{'='*60}")
-        print(f"✅ OCR EXTRACTION COMPLETE")
-        print(f"{'='*60}")
-        print(f"📄 PDF: {self.metadata.get('pdf_name', 'Unknown')}")
-        print(f"🖼️  Total Images Processed: {total}")
-        print(f"📝 Images WITH text: {with_text}")
-        print(f"📷 Images WITHOUT text: {without_text}")
-        print(f"📋 Output: metadata_with_ocr ({self.pdf_name}).json")
-        print(f"{'='*60}\n")
+        self.log.info(f"\n{'='*60}")
+        self.log.info(f"✅ OCR EXTRACTION COMPLETE")
+        self.log.info(f"{'='*60}")
+        self.log.info(f"📄 PDF: {self.metadata.get('pdf_name', 'Unknown')}")
+        self.log.info(f"🖼️  Total Images Processed: {total}")
+        self.log.info(f"📝 Images WITH text: {with_text}")
+        self.log.info(f"📷 Images WITHOUT text: {without_text}")
+        if self.native_text:
+            self.log.info(f"📑 Text from PDF text layer: {native_count} (OCR skipped)")
+        if self.error_count:
+            self.log.warning(f"⚠️  OCR failed on {self.error_count} image(s); a rerun retries them")
+        if self.cache_stats:
+            stats = self.cache_stats
+            self.log.info(f"🗃️  Cache: {stats['hits']} hit(s), {stats['misses']} miss(es), {stats['evicted']} evicted")
+        if self.text_gate_stats:
+            gate = self.text_gate_stats
+            action = "would skip" if gate["evaluation"] else "skipped"
+            self.log.info(f"⏭️  Text gate {action}: {gate['below_threshold']}/{gate['checked']} ({gate['skip_rate']:.0%})")
+            if gate["evaluation"]:
+                self.log.info(f"🎯 Text gate recall: {gate['recall']:.1%} ({gate['missed_text']} image(s) with text missed)")
+        if self.deadline_stats:
+            limits = self.deadline_stats
+            self.log.info(f"⏳ Time limits: {limits['degraded']} degraded, {limits['timed_out']} timed out, "
+                          f"{limits['deadline_skipped']} skipped at the deadline")
+        self.log.info(f"📋 Output: {self.output_filename}")
+        self.log.info(f"{'='*60}\n")
+        self.log.info(event="ocr_finished", pdf=self.metadata.get('pdf_name', 'Unknown'), total=total,
+                      with_text=with_text, without_text=without_text, native=native_count, errors=self.error_count,
+                      cache=self.cache_stats, text_gate=self.text_gate_stats, time_limits=self.deadline_stats)
+
+
+# Per-process state for the OCR worker pool (see OCRExtractor._run_batches)
+_worker_extractor = None
+
+
+def _init_ocr_worker(metadata_path: str, options: dict):
+    """Load the OCR model once in a worker process, pinned to its thread share."""
+    global _worker_extractor
+    threads = str(options.get("cpu_threads") or 1)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = threads
+    _worker_extractor = OCRExtractor(metadata_path=metadata_path, **options)
+
+
+def _ocr_batch_in_worker(images: list) -> tuple:
+    """
+    Run one batch of preprocessed arrays in a worker. Returns (texts, seconds).
+    
+    Images arrive as SharedFrame handles (read in place from shared memory)
+    or, for small images, as the arrays themselves.
+    """
+    return _worker_extractor._timed_batch([open_frame(image) for image in images])
+
+
+def _killable_worker_main(conn, metadata_path: str, options: dict):
+    """Serve OCR batches sent over a pipe until None arrives."""
+    _init_ocr_worker(metadata_path, options)
+    conn.send("ready")
+    while True:
+        images = conn.recv()
+        if images is None:
+            break
+        conn.send(_ocr_batch_in_worker(images))
+
+
+class _KillableOCRWorker:
+    """
+    One OCR worker process that can be killed mid-batch and started again.
+    Used for time limits (see OCRExtractor._run_batches_with_deadlines).
+    """
+    
+    def __init__(self, metadata_path: str, options: dict):
+        self.metadata_path = metadata_path
+        self.options = options
+        self.process = None
+        self.conn = None
+        self.ready = False
+        self.start()
+    
+    def start(self):
+        """Start the process; its model loads in the background."""
+        self.conn, child_conn = Pipe()
+        self.process = Process(
+            target=_killable_worker_main,
+            args=(child_conn, self.metadata_path, self.options),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+    
+    @property
+    def loading(self) -> bool:
+        """True while the process is started but has not reported "ready"."""
+        return self.process is not None and not self.ready
+    
+    def check_ready(self):
+        """Take the "ready" message once conn is readable (never blocks on the model)."""
+        if self.receive() != "ready":
+            raise RuntimeError("OCR worker failed to start")
+        self.ready = True
+    
+    def send(self, images: list):
+        """Start OCR on one batch of preprocessed arrays (the worker must be ready)."""
+        self.conn.send(images)
+    
+    def receive(self):
+        """Result of the last batch as (texts, seconds), or None if the worker died."""
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            return None
+    
+    def kill(self):
+        """Kill the worker, abandoning its batch."""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self.process = None
+        self.ready = False
+    
+    def restart(self):
+        """Kill the worker and start a fresh one."""
+        self.kill()
+        self.start()
+    
+    def stop(self):
+        """Shut the worker down."""
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process = None
 
 
 def find_available_pdfs():
@@ -257,15 +1290,95 @@ def main():
     
     script_dir = Path(__file__).parent.resolve()
     
-    print(f"\n{'='*60}")
-    print(f"🔍 OCR EXTRACTOR - Task 2")
-    print(f"{'='*60}\n")
+    # Console/JSON logging: --quiet, --log-level, --log-json, --log-items, --progress-interval
+    log = configure_from_argv(sys.argv)
+    
+    log.info(f"\n{'='*60}")
+    log.info(f"🔍 OCR EXTRACTOR - Task 2")
+    log.info(f"{'='*60}\n")
     
     # Check command line arguments
     if len(sys.argv) > 1:
         # PDF name provided
         pdf_name = sys.argv[1]
         
+        # Parse additional arguments
+        options = {}
+        profile_path = None
+        i = 2
+        while i < len(sys.argv):
+            arg = sys.argv[i]
+            
+            if arg == "--batch-size" and i + 1 < len(sys.argv):
+                options["batch_size"] = int(sys.argv[i + 1])
+                i += 2
+            elif arg == "--workers" and i + 1 < len(sys.argv):
+                options["workers"] = int(sys.argv[i + 1])
+                i += 2
+            elif arg == "--threads" and i + 1 < len(sys.argv):
+                options["cpu_threads"] = int(sys.argv[i + 1])
+                i += 2
+            elif arg == "--cache" and i + 1 < len(sys.argv):
+                options["cache_path"] = sys.argv[i + 1]
+                i += 2
+            elif arg == "--cache-max-mb" and i + 1 < len(sys.argv):
+                options["cache_max_mb"] = int(sys.argv[i + 1])
+                i += 2
+            elif arg == "--text-gate" and i + 1 < len(sys.argv):
+                options["text_gate_threshold"] = float(sys.argv[i + 1])
+                i += 2
+            elif arg == "--evaluate-text-gate":
+                options["evaluate_text_gate"] = True
+                options.setdefault("text_gate_threshold", 0.2)
+                i += 1
+            elif arg == "--service" and i + 1 < len(sys.argv):
+                options["service"] = sys.argv[i + 1]
+                i += 2
+            elif arg == "--max-side" and i + 1 < len(sys.argv):
+                options["max_side"] = int(sys.argv[i + 1])
+                i += 2
+            elif arg == "--image-timeout" and i + 1 < len(sys.argv):
+                options["image_timeout"] = float(sys.argv[i + 1])
+                i += 2
+            elif arg == "--doc-timeout" and i + 1 < len(sys.argv):
+                options["document_timeout"] = float(sys.argv[i + 1])
+                i += 2
+            elif arg == "--deadline" and i + 1 < len(sys.argv):
+                # Seconds from now, as an absolute cutoff
+                options["deadline"] = time.time() + float(sys.argv[i + 1])
+                i += 2
+            elif arg == "--engine" and i + 1 < len(sys.argv):
+                options["engine"] = sys.argv[i + 1]
+                i += 2
+            elif arg == "--replay-latency" and i + 1 < len(sys.argv):
+                options.setdefault("engine_options", {})["latency"] = float(sys.argv[i + 1])
+                i += 2
+            elif arg == "--replay-latency-mpx" and i + 1 < len(sys.argv):
+                options.setdefault("engine_options", {})["latency_per_mpx"] = float(sys.argv[i + 1])
+                i += 2
+            elif arg == "--profile-memory" and i + 1 < len(sys.argv):
+                from mem_profiler import MemoryProfiler
+                options["profiler"] = MemoryProfiler()
+                profile_path = sys.argv[i + 1]
+                i += 2
+            elif arg == "--fresh":
+                options["resume"] = False
+                i += 1
+            elif arg == "--no-shared-memory":
+                options["shared_memory"] = False
+                i += 1
+            elif arg == "--no-native-text":
+                options["native_text"] = False
+                i += 1
+            elif arg == "--native-min-words" and i + 1 < len(sys.argv):
+                options["native_min_words"] = int(sys.argv[i + 1])
+                i += 2
+            elif arg == "--lang" and i + 1 < len(sys.argv):
+                options["lang"] = sys.argv[i + 1]
+                i += 2
+            else:
+                i += 1
+        
         # Remove extension if provided
         if pdf_name.endswith('.pdf'):
             pdf_name = pdf_name[:-4]
@@ -273,9 +1386,9 @@ def main():
         # Check if it's a path to metadata file
         if pdf_name.endswith('.json'):
             metadata_path = pdf_name
-            extractor = OCRExtractor(metadata_path=metadata_path)
+            extractor = OCRExtractor(metadata_path=metadata_path, **options)
         else:
-            extractor = OCRExtractor(pdf_name=pdf_name)
+            extractor = OCRExtractor(pdf_name=pdf_name, **options)
     else:
         # Find available metadata files
         metadata_files = find_available_pdfs()
@@ -291,8 +1404,37 @@ def main():
             name = mf.stem.replace("metadata (", "").replace(")", "")
             print(f"   {i}. {name}")
         
-        print(f"\nUsage: python ocr_extractor.py <pdf_name>")
-        print(f"Example: python ocr_extractor.py AutomobileGear")
+        print(f"\nUsage: python ocr_extractor.py <pdf_name> [options]")
+        print("\nOptions:")
+        print("  --batch-size 16    Images per OCR inference call (default: 1)")
+        print("  --workers 4        OCR worker processes, one model each (0 = all cores)")
+        print("  --no-shared-memory Pickle images to workers instead of sharing memory")
+        print("  --threads 2        Inference threads per worker (default: cores / workers)")
+        print("  --cache ocr_cache.sqlite  Reuse OCR results for identical images")
+        print("  --cache-max-mb 256 Cache size limit before old entries are evicted")
+        print("  --lang en          OCR language (default: en)")
+        print("  --max-side 2560    Shrink larger images to this longest side before OCR")
+        print("  --service 127.0.0.1:8765  Use a running ocr_server.py (or set OCR_SERVICE)")
+        print("  --text-gate 0.2    Skip OCR on images scoring below this (photos, blanks)")
+        print("  --evaluate-text-gate  OCR everything and report what the gate would miss")
+        print("  --native-min-words 3  Use the PDF text layer when a region has this many words")
+        print("  --no-native-text   Always OCR, even where the PDF has real text")
+        print("  --fresh            Ignore results journaled by an interrupted run")
+        print("  --profile-memory memory_profile.json  Record peak heap/RSS/MuPDF store")
+        print("  --engine record:ocr_replay.jsonl  Run PaddleOCR and record every result")
+        print("  --engine replay:ocr_replay.jsonl  Serve recorded results, no model needed")
+        print("  --replay-latency 0.3  Simulated seconds per image for the replay engine")
+        print("  --replay-latency-mpx 0.1  Extra simulated seconds per megapixel")
+        print("  --image-timeout 60 Retry an image smaller after 60s, skip it after 3 tries")
+        print("  --doc-timeout 1800 Stop OCR on this PDF after 30 minutes (small images first)")
+        print("  --deadline 3600    Same, as a wall-clock cutoff from now")
+        print("  --quiet            Only warnings and errors on the console")
+        print("  --log-level info   debug shows every image; warning hides banners and progress")
+        print("  --log-json events.jsonl  Also append JSON-lines events to this file")
+        print("  --log-items 100    Show every 100th per-image result (default: none)")
+        print("  --progress-interval 1  Seconds between progress lines (0 = off)")
+        print(f"\nExample: python ocr_extractor.py AutomobileGear")
+        print(f"Charts:  python ocr_extractor.py \"charts_metadata (AutomobileGear).json\"")
         sys.exit(0)
     
     # Run OCR extraction
@@ -306,6 +1448,12 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        log.close()
+        if extractor.profiler is not None:
+            # Records a failed stage; no-op if OCR finished
+            extractor.profiler.end(failed=True)
+            extractor.profiler.save(profile_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+================================================================================
+OCR RESULT JOURNAL - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Never lose finished OCR work when a long run is interrupted
+
+How it works:
+- Appends one JSON line per finished image as soon as its text is known
+- The first line records the OCR settings and source metadata; a journal
+  written with different settings is discarded instead of reused
+- On a rerun, journaled images are filled in from the journal and skipped
+- A line cut off by a crash is ignored (that image simply runs again)
+- The journal is deleted once the final metadata file has been written
+
+Dependencies:
+- None (standard library only)
+
+Output:
+- ocr_journal (pdf_name).jsonl while a run is in progress
+================================================================================
+"""
+
+import json
+import os
+from pathlib import Path
+
+from event_log import get_log
+
+
+# Record fields produced by OCRExtractor that are replayed from the journal
+JOURNAL_FIELDS = ("text", "text_source", "text_score", "ocr_skipped", "ocr_degraded")
+
+
+class OCRJournal:
+    """
+    Append-only log of finished OCR results, keyed by image name.
+    """
+    
+    def __init__(self, journal_path: str, settings: dict, log=None):
+        """
+        Open (or create) the journal.
+        
+        Args:
+            journal_path: Path to the JSON-lines journal file
+            settings: Everything that changes the results (OCR settings,
+                      source metadata date, ...); must match to resume
+            log: Optional EventLog (event_log.py); default is the shared log
+        """
+        self.journal_path = Path(journal_path)
+        self.settings = json.loads(json.dumps(settings, sort_keys=True))
+        self.entries = {}
+        self.file = None
+        self.log = log if log is not None else get_log()
+    
+    def load(self) -> dict:
+        """
+        Read results from an earlier, interrupted run.
+        
+        Returns:
+            {image_name: {field: value}} of journaled results (empty if there
+            is no journal or it was written with other settings)
+        """
+        self.entries = {}
+        if not self.journal_path.exists():
+            return self.entries
+        
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        
+        if header.get("settings") != self.settings:
+            self.log.warning(f"⚠️  OCR settings changed since {self.journal_path.name} was written, starting over",
+                             "journal_discarded", journal=str(self.journal_path))
+            self.journal_path.unlink()
+            return self.entries
+        
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Partial line from a run killed mid-write
+                continue
+            self.entries[entry.pop("image_name")] = entry
+        
+        return self.entries
+    
+    def open(self):
+        """Open the journal for appending, writing the header if it is new."""
+        is_new = not self.journal_path.exists() or self.journal_path.stat().st_size == 0
+        self.file = open(self.journal_path, 'a', encoding='utf-8')
+        if is_new:
+            self.file.write(json.dumps({"settings": self.settings}) + "\n")
+            self.file.flush()
+        elif not self._ends_with_newline():
+            # Terminate a partial line so the next entry starts cleanly
+            self.file.write("\n")
+    
+    def _ends_with_newline(self) -> bool:
+        """True if the journal file ends with a complete line."""
+        with open(self.journal_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    def append(self, image_name: str, record: dict):
+        """
+        Commit one finished result.
+        
+        Args:
+            image_name: Image file name (unique within one PDF)
+            record: Image record; only JOURNAL_FIELDS are stored
+        """
+        entry = {"image_name": image_name}
+        for field in JOURNAL_FIELDS:
+            if field in record:
+                entry[field] = record[field]
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+    
+    def sync(self):
+        """Force journaled results to disk (called after every batch)."""
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+    
+    def close(self):
+        """Sync and close the journal."""
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+    
+    def remove(self):
+        """Delete the journal once the final output is safely written."""
+        self.close()
+        if self.journal_path.exists():
+            self.journal_path.unlink()
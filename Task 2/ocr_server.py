@@ -0,0 +1,472 @@
+"""
+================================================================================
+OCR SERVER - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Keep PaddleOCR loaded between runs so ocr_extractor.py starts instantly
+
+How it works:
+- Loads the OCR model once and listens on localhost (or a Unix socket)
+- Accepts batches of preprocessed images as raw arrays
+- Queues requests and runs at most N batches at a time (one model per slot)
+- Rejects new work with "busy" when the queue is full (backpressure);
+  clients back off and retry
+- Batches larger than --max-batch are split by the client into requests
+  the server accepts
+- OCRExtractor uses the server when it is reachable and falls back to
+  in-process inference when it is not
+
+Dependencies:
+- PaddleOCR, PaddlePaddle (server side only; not needed with --engine replay:<file>)
+- NumPy
+
+Usage:
+- python ocr_server.py                      (listens on 127.0.0.1:8765)
+- python ocr_server.py --socket /tmp/ocr.sock --concurrency 2
+- python ocr_extractor.py AutomobileGear --service 127.0.0.1:8765
+================================================================================
+"""
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from event_log import configure_from_argv, get_log
+
+from ocr_engines import create_engine
+
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+
+# Frame header: JSON length, payload length (both unsigned 32-bit, big-endian)
+FRAME = struct.Struct(">II")
+
+
+def encode_arrays(arrays: list) -> tuple:
+    """
+    Pack image arrays for sending.
+    
+    Returns:
+        Tuple of (list of array specs for the JSON header, payload bytes)
+    """
+    specs = [{"shape": list(a.shape), "dtype": str(a.dtype)} for a in arrays]
+    payload = b"".join(np.ascontiguousarray(a).tobytes() for a in arrays)
+    return specs, payload
+
+
+def decode_arrays(specs: list, payload: bytes) -> list:
+    """Rebuild image arrays from their specs and the payload (no copy)."""
+    arrays = []
+    offset = 0
+    for spec in specs:
+        dtype = np.dtype(spec.get("dtype", "uint8"))
+        count = int(np.prod(spec["shape"]))
+        arrays.append(np.frombuffer(payload, dtype=dtype, count=count, offset=offset).reshape(spec["shape"]))
+        offset += count * dtype.itemsize
+    return arrays
+
+
+def _frame(header: dict, payload: bytes = b"") -> bytes:
+    body = json.dumps(header).encode('utf-8')
+    return FRAME.pack(len(body), len(payload)) + body + payload
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> tuple:
+    """Read one message. Returns (header, payload), or (None, None) at EOF."""
+    try:
+        prefix = await reader.readexactly(FRAME.size)
+    except asyncio.IncompleteReadError:
+        return None, None
+    header_len, payload_len = FRAME.unpack(prefix)
+    header = json.loads(await reader.readexactly(header_len))
+    payload = await reader.readexactly(payload_len) if payload_len else b""
+    return header, payload
+
+
+class OCRServer:
+    """
+    Long-running OCR service with a bounded request queue.
+    Each concurrency slot owns one warm model instance.
+    """
+    
+    def __init__(self, address: str = DEFAULT_ADDRESS, concurrency: int = 1, queue_size: int = 8,
+                 max_batch: int = 64, lang: str = 'en', cpu_threads: int = None,
+                 engine: str = None, engine_options: dict = None, log=None):
+        """
+        Initialize the OCR Server.
+        
+        Args:
+            address: "host:port" or "unix:/path/to.sock"
+            concurrency: Batches run at the same time (one model each)
+            queue_size: Batches allowed to wait; beyond this clients get "busy"
+            max_batch: Largest number of images accepted in one request
+            lang: OCR language
+            cpu_threads: Intra-op threads per model
+            engine: OCR engine spec (see ocr_engines.create_engine)
+            engine_options: Extra engine settings (replay latency)
+            log: Optional EventLog (event_log.py); default is the shared log
+        """
+        self.address = address
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(1, queue_size)
+        self.max_batch = max_batch
+        self.lang = lang
+        self.cpu_threads = cpu_threads
+        self.engine_spec = engine
+        self.engine_options = engine_options or {}
+        self.log = log if log is not None else get_log()
+        
+        self.queue = None
+        self.engines = []
+        self.engine_name = "unknown"
+        self.engine_version = "unknown"
+        
+        # Counters reported by "ping"
+        self.served_batches = 0
+        self.served_images = 0
+        self.rejected = 0
+        
+        self._loop = None
+        self._stopping = None
+    
+    def info(self) -> dict:
+        """Engine identity and load, sent in reply to "ping"."""
+        return {
+            "engine": self.engine_name,
+            "engine_version": self.engine_version,
+            "lang": self.lang,
+            "concurrency": self.concurrency,
+            "max_batch": self.max_batch,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "queue_size": self.queue_size,
+            "served_batches": self.served_batches,
+            "served_images": self.served_images,
+            "rejected": self.rejected
+        }
+    
+    @staticmethod
+    def _predict(engine, arrays: list) -> list:
+        """Run one batch on one model. Returns a list of [text, score] lines per image."""
+        try:
+            return engine.recognize(arrays)
+        except RuntimeError:
+            # Unexpected result count - fall back to one image at a time
+            return [engine.recognize([a])[0] for a in arrays]
+    
+    async def _inference_slot(self, engine, executor: ThreadPoolExecutor):
+        """Take batches off the queue and run them on this slot's model."""
+        loop = asyncio.get_running_loop()
+        while True:
+            arrays, future = await self.queue.get()
+            try:
+                started = time.perf_counter()
+                results = await loop.run_in_executor(executor, self._predict, engine, arrays)
+                if not future.done():
+                    future.set_result((results, time.perf_counter() - started))
+                self.served_batches += 1
+                self.served_images += len(arrays)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+    
+    async def _dispatch(self, header: dict, payload: bytes) -> dict:
+        """Handle one request and build its reply."""
+        op = header.get("op")
+        
+        if op == "ping":
+            return dict(ok=True, **self.info())
+        
+        if op == "ocr":
+            specs = header.get("images", [])
+            if len(specs) > self.max_batch:
+                return {"ok": False, "error": "too_large", "max_batch": self.max_batch}
+            
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self.queue.put_nowait((decode_arrays(specs, payload), future))
+            except asyncio.QueueFull:
+                self.rejected += 1
+                return {"ok": False, "error": "busy", "retry_after": 0.25}
+            
+            try:
+                results, seconds = await future
+            except Exception as e:
+                return {"ok": False, "error": f"inference failed: {e}"}
+            return {"ok": True, "results": results, "seconds": round(seconds, 3)}
+        
+        return {"ok": False, "error": f"unknown op: {op}"}
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests from one connection until it closes."""
+        try:
+            while True:
+                header, payload = await _read_frame(reader)
+                if header is None:
+                    break
+                reply = await self._dispatch(header, payload)
+                writer.write(_frame(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    async def serve(self):
+        """Load the models and serve until interrupted."""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        
+        for _ in range(self.concurrency):
+            self.engines.append(create_engine(self.engine_spec, self.lang, self.cpu_threads, **self.engine_options))
+        self.engine_name = self.engines[0].name
+        self.engine_version = self.engines[0].version()
+        
+        self.log.info(f"🔄 Loading {self.concurrency} {self.engine_name} model(s)...")
+        for engine in self.engines:
+            await loop.run_in_executor(executor, engine.load)
+        
+        slots = [asyncio.ensure_future(self._inference_slot(engine, executor)) for engine in self.engines]
+        
+        if self.address.startswith("unix:"):
+            path = self.address[len("unix:"):]
+            if os.path.exists(path):
+                os.unlink(path)
+            server = await asyncio.start_unix_server(self._handle_client, path=path)
+        else:
+            host, port = self.address.rsplit(":", 1)
+            server = await asyncio.start_server(self._handle_client, host, int(port))
+            # Port 0 picks a free port; report the real one
+            self.address = f"{host}:{server.sockets[0].getsockname()[1]}"
+        
+        self.log.info(f"✅ OCR server listening on {self.address}")
+        self.log.info(f"   Concurrency: {self.concurrency}, queue: {self.queue_size}, max batch: {self.max_batch}\n")
+        self.log.info(event="ocr_server_started", address=self.address, engine=self.engine_name,
+                      concurrency=self.concurrency, queue_size=self.queue_size, max_batch=self.max_batch)
+        
+        # SIGTERM ends serving like Ctrl+C
+        self._loop = loop
+        self._stopping = asyncio.Event()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self._stopping.set)
+        except (NotImplementedError, AttributeError, RuntimeError):
+            pass  # Windows, or not the main thread: no signal handlers in the event loop
+        
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            for slot in slots:
+                slot.cancel()
+            executor.shutdown(wait=False)
+
+    def stop(self):
+        """Stop serve() (safe to call from another thread)."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+
+class OCRServiceClient:
+    """
+    Blocking client for OCRServer, used by OCRExtractor.
+    Keeps one connection open, backs off while the server is busy and
+    splits batches larger than the server's max_batch.
+    """
+    
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 600.0, busy_retries: int = 240):
+        """
+        Initialize the client (the connection is opened on first use).
+        
+        Args:
+            address: "host:port" or "unix:/path/to.sock"
+            timeout: Socket timeout for one request, in seconds
+            busy_retries: How many "busy" replies to wait out before giving up
+        """
+        self.address = address
+        self.timeout = timeout
+        self.busy_retries = busy_retries
+        # Largest batch the server accepts (from "ping" or a "too_large" reply)
+        self.max_batch = None
+        self.sock = None
+    
+    def _connect(self, timeout: float):
+        if self.address.startswith("unix:"):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            sock.connect(self.address[len("unix:"):])
+        else:
+            host, port = self.address.rsplit(":", 1)
+            sock = socket.create_connection((host, int(port)), timeout=timeout)
+        sock.settimeout(self.timeout)
+        self.sock = sock
+    
+    def _recv_exactly(self, size: int) -> bytes:
+        chunks = bytearray()
+        while len(chunks) < size:
+            chunk = self.sock.recv(min(size - len(chunks), 1 << 20))
+            if not chunk:
+                raise ConnectionError("OCR service closed the connection")
+            chunks += chunk
+        return bytes(chunks)
+    
+    def _request(self, header: dict, payload: bytes = b"", connect_timeout: float = 2.0) -> dict:
+        """Send one request and wait for the reply. Raises ConnectionError on failure."""
+        try:
+            if self.sock is None:
+                self._connect(connect_timeout)
+            self.sock.sendall(_frame(header, payload))
+            header_len, payload_len = FRAME.unpack(self._recv_exactly(FRAME.size))
+            reply = json.loads(self._recv_exactly(header_len))
+            if payload_len:
+                self._recv_exactly(payload_len)
+            return reply
+        except (OSError, ValueError) as e:
+            self.close()
+            raise ConnectionError(f"OCR service unavailable at {self.address}: {e}")
+    
+    def ping(self):
+        """
+        Check that the service is up.
+        
+        Returns:
+            Server info dictionary, or None if it cannot be reached
+        """
+        try:
+            reply = self._request({"op": "ping"}, connect_timeout=0.5)
+        except ConnectionError:
+            return None
+        if not reply.get("ok"):
+            return None
+        self.max_batch = reply.get("max_batch") or None
+        return reply
+    
+    def recognize(self, arrays: list) -> list:
+        """
+        Run OCR on a batch of preprocessed arrays.
+        
+        Args:
+            arrays: Image arrays (BGR, uint8)
+        
+        Returns:
+            List of [text, score] line lists, one per image
+        """
+        if self.max_batch and len(arrays) > self.max_batch:
+            results = []
+            for start in range(0, len(arrays), self.max_batch):
+                results.extend(self.recognize(arrays[start:start + self.max_batch]))
+            return results
+        
+        specs, payload = encode_arrays(arrays)
+        header = {"op": "ocr", "images": specs}
+        
+        for attempt in range(self.busy_retries):
+            reply = self._request(header, payload)
+            if reply.get("ok"):
+                return reply["results"]
+            if reply.get("error") == "too_large" and 0 < (reply.get("max_batch") or 0) < len(arrays):
+                # The server's limit changed since ping (or ping was skipped)
+                self.max_batch = reply["max_batch"]
+                return self.recognize(arrays)
+            if reply.get("error") != "busy":
+                raise RuntimeError(f"OCR service error: {reply.get('error')}")
+            # Backpressure: wait a little longer each time the queue is full
+            time.sleep(min(2.0, reply.get("retry_after", 0.25) * (1 + attempt / 4)))
+        
+        raise TimeoutError(f"OCR service at {self.address} stayed busy")
+    
+    def close(self):
+        """Close the connection (it is reopened on the next request)."""
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+
+def main():
+    """Main function to run the OCR server."""
+    
+    # Console/JSON logging: --quiet, --log-level, --log-json, --log-items, --progress-interval
+    log = configure_from_argv(sys.argv)
+    
+    log.info(f"\n{'='*60}")
+    log.info(f"🛰️  OCR SERVER - Task 2")
+    log.info(f"{'='*60}\n")
+    
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print("Usage:")
+        print("  python ocr_server.py [options]")
+        print("\nOptions:")
+        print(f"  --address {DEFAULT_ADDRESS}   Listen address (host:port)")
+        print("  --socket /tmp/ocr.sock       Listen on a Unix socket instead")
+        print("  --concurrency 2              Batches run at once (one model each)")
+        print("  --queue 8                    Waiting batches before replying busy")
+        print("  --max-batch 64               Largest batch accepted per request")
+        print("  --threads 4                  Inference threads per model")
+        print("  --lang en                    OCR language")
+        print("  --engine replay:ocr_replay.jsonl  Serve recorded results (load testing)")
+        print("  --replay-latency 0.3         Simulated seconds per image (replay engine)")
+        sys.exit(0)
+    
+    options = {}
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        
+        if arg == "--address" and i + 1 < len(sys.argv):
+            options["address"] = sys.argv[i + 1]
+            i += 2
+        elif arg == "--socket" and i + 1 < len(sys.argv):
+            options["address"] = "unix:" + sys.argv[i + 1]
+            i += 2
+        elif arg == "--concurrency" and i + 1 < len(sys.argv):
+            options["concurrency"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--queue" and i + 1 < len(sys.argv):
+            options["queue_size"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--max-batch" and i + 1 < len(sys.argv):
+            options["max_batch"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--threads" and i + 1 < len(sys.argv):
+            options["cpu_threads"] = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--engine" and i + 1 < len(sys.argv):
+            options["engine"] = sys.argv[i + 1]
+            i += 2
+        elif arg == "--replay-latency" and i + 1 < len(sys.argv):
+            options["engine_options"] = {"latency": float(sys.argv[i + 1])}
+            i += 2
+        elif arg == "--lang" and i + 1 < len(sys.argv):
+            options["lang"] = sys.argv[i + 1]
+            i += 2
+        else:
+            i += 1
+    
+    # Suppress PaddlePaddle warnings
+    os.environ['GLOG_minloglevel'] = '2'
+    
+    try:
+        asyncio.run(OCRServer(**options).serve())
+    except KeyboardInterrupt:
+        log.info("\n👋 OCR server stopped", "ocr_server_stopped")
+    except Exception as e:
+        log.error(f"❌ Unexpected error: {e}", "ocr_server_failed", error=str(e))
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+================================================================================
+PAGE FINGERPRINTS - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Recognise template pages (covers, disclaimers, back pages) that repeat
+      across thousands of PDFs, and reuse their chart results instead of
+      detecting, rendering and OCRing them again
+
+How it works:
+- page_fingerprint() hashes what decides how a page looks:
+  * the page's content stream, with whitespace normalised
+  * its resources, walked recursively; object numbers are replaced by the
+    hash of the object they point to, so the same page hashes the same in
+    every PDF
+  * page size, rotation, annotations and the page text
+- Things that change per file but not per page are left out: font subset
+  tags (ABCDEF+Arial), font programs, widths and unicode maps (these cover
+  the whole subset of a document), metadata and structure-tree links.
+  The page text pins down which glyphs the content stream really shows
+- PageFingerprintStore keeps, per fingerprint and chart settings, the
+  detection result, the chart regions and copies of the rendered PNGs in a
+  directory that is shared across runs and batches
+- Least recently used entries (and their PNGs) are evicted past a size limit
+- OCR is reused through the OCR cache (ocr_cache.py): a reused render is a
+  byte-identical copy of the earlier PNG, so it hits the cache
+
+Dependencies:
+- PyMuPDF (fitz)
+
+Output:
+- <store_dir>/page_fingerprints.sqlite and <store_dir>/renders/*.png
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+
+# Bump when the fingerprint recipe changes so old entries stop matching
+FINGERPRINT_VERSION = 1
+
+# Keys whose values differ between files that show the same page
+_SKIPPED_KEYS = {
+    "Parent", "P", "StructParent", "StructParents", "Metadata", "PieceInfo",
+    "LastModified", "NM", "M", "FontFile", "FontFile2", "FontFile3",
+    "ToUnicode", "Widths", "W", "W2", "FirstChar", "LastChar", "CIDSet", "CIDToGIDMap"
+}
+
+_REFERENCE = re.compile(rb"(\d+)\s+\d+\s+R")
+_SKIPPED_REFERENCE = re.compile(
+    rb"/(?:" + b"|".join(k.encode() for k in sorted(_SKIPPED_KEYS)) + rb")\s+\d+\s+\d+\s+R"
+)
+_SUBSET_TAG = re.compile(rb"/[A-Z]{6}\+")
+
+
+def _digest_value(doc: fitz.Document, value: str, memo: dict, active: set) -> bytes:
+    """Inline PDF source with references replaced by the referenced objects' hashes."""
+    value = _SKIPPED_REFERENCE.sub(b"", value.encode("utf-8", "surrogateescape"))
+    value = _SUBSET_TAG.sub(b"/", value)
+    return _REFERENCE.sub(lambda m: b"#" + _object_digest(doc, int(m.group(1)), memo, active), value)
+
+
+def _object_digest(doc: fitz.Document, xref: int, memo: dict, active: set) -> bytes:
+    """Hash of an object and everything it references (object numbers excluded)."""
+    if xref in memo:
+        return memo[xref]
+    if xref in active:
+        # Reference cycle (e.g. a form that draws itself) - hash the back edge only
+        return b"cycle"
+    active.add(xref)
+    
+    digest = hashlib.sha256()
+    try:
+        keys = doc.xref_get_keys(xref)
+        if keys:
+            for key in keys:
+                if key in _SKIPPED_KEYS:
+                    continue
+                kind, value = doc.xref_get_key(xref, key)
+                digest.update(f"/{key} {kind} ".encode())
+                digest.update(_digest_value(doc, value, memo, active))
+                digest.update(b"\n")
+        else:
+            digest.update(_digest_value(doc, doc.xref_object(xref, compressed=True), memo, active))
+        
+        if doc.xref_is_stream(xref):
+            digest.update(hashlib.sha256(doc.xref_stream_raw(xref) or b"").digest())
+    finally:
+        active.discard(xref)
+    
+    memo[xref] = digest.hexdigest()[:32].encode()
+    return memo[xref]
+
+
+def page_fingerprint(doc: fitz.Document, page: fitz.Page, memo: dict = None) -> str:
+    """
+    Fingerprint a page independently of the file it is in.
+    
+    Args:
+        doc: Open PyMuPDF document
+        page: Page of that document
+        memo: Dictionary reused for all pages of one document, so shared fonts
+              and images are hashed once (must not be reused across documents)
+    
+    Returns:
+        Hex digest; equal digests mean the page renders the same
+    """
+    memo = {} if memo is None else memo
+    active = set()
+    page_xref = page.xref
+    
+    digest = hashlib.sha256(f"v{FINGERPRINT_VERSION}\n".encode())
+    digest.update(f"{tuple(page.mediabox)} {tuple(page.cropbox)} {page.rotation}\n".encode())
+    digest.update(b" ".join(page.read_contents().split()))
+    digest.update(b"\n")
+    
+    # Resources may be inherited from the page tree
+    owner = page_xref
+    seen = set()
+    while owner and owner not in seen:
+        seen.add(owner)
+        kind, value = doc.xref_get_key(owner, "Resources")
+        if kind != "null":
+            digest.update(_digest_value(doc, value, memo, active))
+            break
+        kind, value = doc.xref_get_key(owner, "Parent")
+        owner = int(value.split()[0]) if kind == "xref" else 0
+    digest.update(b"\n")
+    
+    kind, value = doc.xref_get_key(page_xref, "Annots")
+    if kind != "null":
+        digest.update(_digest_value(doc, value, memo, active))
+    digest.update(b"\n")
+    
+    digest.update(page.get_text().encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+class PageFingerprintStore:
+    """
+    Disk-backed chart results per page fingerprint, shared across documents,
+    runs and batches.
+    """
+    
+    def __init__(self, store_dir: str, settings: dict, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Open (or create) the store.
+        
+        Args:
+            store_dir: Directory for the database and the rendered PNGs
+            settings: Chart settings that change the output (DPI, limits, ...);
+                      results made with different settings never collide
+            max_bytes: Approximate size limit (PNGs included)
+        """
+        self.store_dir = Path(store_dir)
+        self.renders_dir = self.store_dir / "renders"
+        self.renders_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.settings_key = json.dumps(settings, sort_keys=True).encode('utf-8')
+        
+        self.hits = 0
+        self.misses = 0
+        self.reused_renders = 0
+        self.evicted = 0
+        
+        # Several batch processes may share one store: WAL lets them read while
+        # one writes, and every write is committed at once so no lock is held
+        self.conn = sqlite3.connect(str(self.store_dir / "page_fingerprints.sqlite"), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " key TEXT PRIMARY KEY,"
+            " entry TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)")
+        self.conn.commit()
+    
+    def _key(self, fingerprint: str) -> str:
+        """Store key: the fingerprint combined with the chart settings."""
+        digest = hashlib.sha256(self.settings_key)
+        digest.update(b"\0")
+        digest.update(fingerprint.encode())
+        return digest.hexdigest()
+    
+    def _load(self, key: str):
+        """Stored entry for a key (None if missing)."""
+        row = self.conn.execute("SELECT entry FROM pages WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+    
+    def _save(self, key: str, entry: dict):
+        """Write an entry; its size counts the stored PNGs."""
+        text = json.dumps(entry)
+        size = len(key) + len(text) + sum(r.get("bytes", 0) for r in entry.get("renders", {}).values())
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages (key, entry, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, text, size, time.time())
+        )
+        self.conn.commit()
+    
+    def get(self, fingerprint: str):
+        """
+        Look up a page and count the hit or miss.
+        
+        Args:
+            fingerprint: From page_fingerprint()
+        
+        Returns:
+            Entry dictionary, or None if the page has not been seen. Entries hold
+            "chart" (auto-detection result, None if never detected), "coverage"
+            (raster coverage if the page was skipped as a scan), "regions"
+            (list of region tuples, None if never analysed) and "renders"
+        """
+        key = self._key(fingerprint)
+        entry = self._load(key)
+        
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self.conn.execute("UPDATE pages SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return entry
+    
+    def update(self, fingerprint: str, **fields):
+        """Record detection results for a page (chart=, coverage=, regions=)."""
+        key = self._key(fingerprint)
+        entry = self._load(key) or {"chart": None, "coverage": None, "regions": None, "renders": {}}
+        entry.update(fields)
+        self._save(key, entry)
+    
+    def add_render(self, fingerprint: str, region_index, chart_info: dict, charts_dir: Path):
+        """
+        Keep a copy of a rendered chart (and its preview) for reuse.
+        
+        Args:
+            fingerprint: Fingerprint of the rendered page
+            region_index: Region number on the page (None = full page)
+            chart_info: Chart metadata entry from ChartExtractor
+            charts_dir: Folder the chart PNGs were written to
+        """
+        key = self._key(fingerprint)
+        entry = self._load(key)
+        if entry is None:
+            return
+        
+        slot = str(region_index or "page")
+        render = {
+            "width": chart_info["width"],
+            "height": chart_info["height"],
+            "dpi": chart_info["dpi"],
+            "bytes": 0
+        }
+        for field in ("image_name", "preview_name"):
+            if field not in chart_info:
+                continue
+            name = f"{key[:40]}_{slot}{'_preview' if field == 'preview_name' else ''}.png"
+            temp_path = self.renders_dir / f"{name}.{os.getpid()}.tmp"
+            shutil.copyfile(charts_dir / chart_info[field], temp_path)
+            os.replace(temp_path, self.renders_dir / name)
+            render[field.replace("_name", "_file")] = name
+            render["bytes"] += (self.renders_dir / name).stat().st_size
+        
+        entry["renders"][slot] = render
+        self._save(key, entry)
+    
+    def render_for(self, entry: dict, region_index):
+        """
+        Stored render of one region of a page entry.
+        
+        Returns:
+            Picklable dictionary for copy_render() with absolute file paths,
+            or None if the region was not rendered yet
+        """
+        render = entry.get("renders", {}).get(str(region_index or "page"))
+        if render is None:
+            return None
+        render = dict(render)
+        for field in ("image_file", "preview_file"):
+            if field in render:
+                render[field] = str(self.renders_dir / render[field])
+        return render
+    
+    def _evict(self):
+        """Delete least recently used entries and their PNGs until the store fits max_bytes."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for key, entry, size in self.conn.execute("SELECT key, entry, size FROM pages ORDER BY last_used"):
+            stale.append((key, entry))
+            freed += size
+            if freed >= excess:
+                break
+        
+        for key, entry in stale:
+            for render in json.loads(entry).get("renders", {}).values():
+                for name in (render.get("image_file"), render.get("preview_file")):
+                    if name:
+                        try:
+                            (self.renders_dir / name).unlink()
+                        except FileNotFoundError:
+                            pass
+        
+        self.conn.executemany("DELETE FROM pages WHERE key = ?", [(key,) for key, _ in stale])
+        self.evicted += len(stale)
+    
+    def flush(self):
+        """Apply the size limit and commit pending writes."""
+        self._evict()
+        self.conn.commit()
+    
+    def close(self):
+        """Flush and close the database."""
+        self.flush()
+        self.conn.close()
+    
+    def stats(self) -> dict:
+        """Hit/miss counters for the run summary."""
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.store_dir),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "reused_renders": self.reused_renders,
+            "evicted": self.evicted
+        }
+
+
+def copy_render(render: dict, image_path: Path, preview_path: Path = None) -> bool:
+    """
+    Copy a stored render (from PageFingerprintStore.render_for) to a chart file.
+    
+    Files are copied, not linked: a later render to the same chart name
+    would otherwise overwrite the stored PNG through the link.
+    
+    Returns:
+        False if the stored PNGs are gone (evicted); the caller renders instead
+    """
+    try:
+        shutil.copyfile(render["image_file"], image_path)
+        if preview_path is not None:
+            shutil.copyfile(render["preview_file"], preview_path)
+    except (OSError, KeyError):
+        return False
+    return True
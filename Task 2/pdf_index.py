@@ -0,0 +1,220 @@
+"""
+================================================================================
+PDF IMAGE INDEX - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Know which pages carry images before touching any page, so long
+      text-only reports are not walked page by page
+
+How it works:
+- Reads the xref table directly (no fitz.Page objects are created):
+  * each page's /Resources, following /Parent for inherited resources
+  * the /XObject dictionary: /Image entries are recorded with size,
+    bits per component, colour space, filter and soft mask
+  * Form XObjects with their own /Resources are searched recursively,
+    the same way PyMuPDF's page.get_images(full=True) does
+- Records which image xrefs are shared by several pages
+- A page whose resources cannot be read is marked unknown (None), so
+  callers fall back to visiting it instead of missing images
+- The index can be cached as JSON per PDF; the cache is reused while the
+  PDF's size and modification time are unchanged (PDFs opened from memory
+  have no file to check against and are never cached)
+
+Dependencies:
+- PyMuPDF (fitz)
+
+Output:
+- Index dictionary (see build_image_index) and, optionally,
+  <cache_dir>/<pdf_name>.image_index.json
+================================================================================
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+
+# Bump when the index layout changes so old cache files are rebuilt
+INDEX_VERSION = 1
+
+# "/Name 12 0 R" entries of an XObject dictionary
+_REFERENCE = re.compile(r"/([^\s/<>\[\]()%{}]+)\s*(\d+)\s+\d+\s+R")
+
+
+def _value(doc: fitz.Document, xref: int, key: str):
+    """Value of a key as a plain Python value (None if missing)."""
+    kind, value = doc.xref_get_key(xref, key)
+    if kind == "null":
+        return None
+    if kind == "int":
+        return int(value)
+    if kind == "xref":
+        return int(value.split()[0])
+    if kind == "name":
+        return value.lstrip("/")
+    return value
+
+
+def _xobject_references(doc: fitz.Document, owner: int) -> list:
+    """(name, xref) pairs of the XObject dictionary in owner's /Resources."""
+    kind, value = doc.xref_get_key(owner, "Resources/XObject")
+    if kind == "xref":
+        value = doc.xref_object(int(value.split()[0]), compressed=True)
+    elif kind != "dict":
+        return []
+    return [(name, int(xref)) for name, xref in _REFERENCE.findall(value)]
+
+
+def _resources_owner(doc: fitz.Document, page_xref: int):
+    """The page or ancestor page-tree node whose /Resources apply to a page."""
+    node = page_xref
+    seen = set()
+    while node and node not in seen:
+        seen.add(node)
+        if doc.xref_get_key(node, "Resources")[0] != "null":
+            return node
+        node = _value(doc, node, "Parent")
+    return None
+
+
+def _page_images(doc: fitz.Document, page_xref: int) -> list:
+    """Image XObjects used by one page, including those inside Form XObjects."""
+    images = []
+    owner = _resources_owner(doc, page_xref)
+    if owner is None:
+        return images
+    
+    # (resources owner, referencing form xref or 0 for the page itself)
+    pending = [(owner, 0)]
+    visited = set()
+    while pending:
+        owner, referencer = pending.pop(0)
+        if owner in visited:
+            continue
+        visited.add(owner)
+        
+        for name, xref in _xobject_references(doc, owner):
+            subtype = _value(doc, xref, "Subtype")
+            if subtype == "Image":
+                images.append({
+                    "xref": xref,
+                    "name": name,
+                    "width": _value(doc, xref, "Width"),
+                    "height": _value(doc, xref, "Height"),
+                    "bpc": _value(doc, xref, "BitsPerComponent"),
+                    "colorspace": _value(doc, xref, "ColorSpace"),
+                    "filter": _value(doc, xref, "Filter"),
+                    "smask": _value(doc, xref, "SMask"),
+                    "referencer": referencer
+                })
+            elif doc.xref_get_key(xref, "Resources")[0] != "null":
+                pending.append((xref, xref))
+    
+    return images
+
+
+def build_image_index(doc: fitz.Document) -> dict:
+    """
+    Index the image XObjects of every page from the xref table.
+    
+    Args:
+        doc: Open PyMuPDF document
+    
+    Returns:
+        Dictionary with:
+        - "page_count"
+        - "pages": {page number (1-indexed, as string): list of images};
+          pages without images are left out, unreadable pages map to None
+        - "shared_xrefs": {xref (as string): page numbers} for images
+          used on more than one page
+    """
+    pages = {}
+    used_on = {}
+    
+    for page_num in range(doc.page_count):
+        page_number = page_num + 1
+        try:
+            images = _page_images(doc, doc.page_xref(page_num))
+        except Exception:
+            # Damaged page tree or resources - let the caller look at the page
+            pages[str(page_number)] = None
+            continue
+        
+        if images:
+            pages[str(page_number)] = images
+            for image in images:
+                used_on.setdefault(image["xref"], []).append(page_number)
+    
+    shared = {str(xref): numbers for xref, numbers in used_on.items() if len(numbers) > 1}
+    
+    return {
+        "version": INDEX_VERSION,
+        "page_count": doc.page_count,
+        "pages": pages,
+        "shared_xrefs": shared
+    }
+
+
+def load_image_index(pdf_path: str, doc: fitz.Document, cache_dir: str = None) -> tuple:
+    """
+    Get the image index of a PDF, from the cache when it is still valid.
+    
+    Args:
+        pdf_path: Path to the PDF file (identifies the cache entry);
+                  None for a PDF opened from memory (no caching)
+        doc: The same PDF, already open (used to build the index)
+        cache_dir: Directory for cached index files (None = no caching)
+    
+    Returns:
+        Tuple of (index dictionary, True if it came from the cache)
+    """
+    if pdf_path is None:
+        return build_image_index(doc), False
+    
+    pdf_path = Path(pdf_path)
+    stat = pdf_path.stat()
+    source = {"pdf_size": stat.st_size, "pdf_mtime_ns": stat.st_mtime_ns}
+    
+    cache_path = None
+    if cache_dir:
+        cache_path = Path(cache_dir) / f"{pdf_path.stem}.image_index.json"
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached.get("version") == INDEX_VERSION and cached.get("source") == source:
+                    return cached, True
+            except (OSError, ValueError):
+                pass
+    
+    index = build_image_index(doc)
+    index["source"] = source
+    
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(temp_path, cache_path)
+    
+    return index, False
+
+
+def page_image_xrefs(index: dict, page_number: int):
+    """
+    Image xrefs on a page according to the index.
+    
+    Args:
+        index: Index from build_image_index / load_image_index
+        page_number: Page number (1-indexed)
+    
+    Returns:
+        List of xrefs ([] = no images), or None if the page must be inspected
+    """
+    images = index["pages"].get(str(page_number), [])
+    if images is None:
+        return None
+    return [image["xref"] for image in images]
@@ -0,0 +1,149 @@
+"""
+================================================================================
+PDF SOURCE - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Let the extractors take a PDF from a path, from memory (bytes from
+      object storage) or from a memory-mapped file, without temp files
+
+How it works:
+- Paths are opened by MuPDF directly, as before
+- bytes, bytearray, memoryview and mmap objects are handed to
+  fitz.open(stream=...) as a memoryview, so the document is not copied
+- io.BytesIO is taken with getvalue(), which shares the buffer without
+  copying it (getbuffer() would lock the BytesIO until released); other
+  file-like objects are memory-mapped when they are real files, otherwise
+  read once; close() (or a with block) releases the mapping, and the
+  extractors call it when they close the document
+- The file type is checked by its "%PDF-" header, not by the file suffix
+
+Dependencies:
+- PyMuPDF (fitz)
+
+Output:
+- PDFSource objects used by ImageExtractor and ChartExtractor
+================================================================================
+"""
+
+import io
+import mmap
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+
+# PDF readers accept the header anywhere in the first 1024 bytes
+PDF_MAGIC = b"%PDF-"
+HEADER_WINDOW = 1024
+
+
+def looks_like_pdf(head: bytes) -> bool:
+    """True if the first bytes of a file carry a PDF header."""
+    return PDF_MAGIC in bytes(head[:HEADER_WINDOW])
+
+
+class PDFSource:
+    """
+    A PDF given as a path or as in-memory data, plus the name to report it by.
+    """
+    
+    def __init__(self, source, pdf_name: str = None):
+        """
+        Resolve a PDF source.
+        
+        Args:
+            source: Path (str or Path), bytes, bytearray, memoryview, mmap,
+                    or a binary file-like object
+            pdf_name: Document name for output folders and metadata; defaults
+                      to the file name. Required for bytes without a name
+        
+        Raises:
+            FileNotFoundError: The path does not exist
+            ValueError: The data is not a PDF, or no name is available
+        """
+        self.path = None
+        self.stream = None
+        self._mapping = None
+        
+        if isinstance(source, (str, Path)):
+            self.path = Path(source).resolve()
+            if not self.path.is_file():
+                raise FileNotFoundError(f"PDF file not found: {source}")
+            with open(self.path, 'rb') as f:
+                head = f.read(HEADER_WINDOW)
+            label = str(source)
+            default_name = self.path.stem
+        else:
+            self.stream = self._as_buffer(source)
+            head = self.stream[:HEADER_WINDOW]
+            file_name = getattr(source, "name", None)
+            label = file_name if isinstance(file_name, str) else "<memory>"
+            default_name = Path(file_name).stem if isinstance(file_name, str) else None
+        
+        if not looks_like_pdf(head):
+            self.close()
+            raise ValueError(f"File is not a PDF: {label}")
+        
+        self.stem = Path(pdf_name).stem if pdf_name else default_name
+        if not self.stem:
+            self.close()
+            raise ValueError("pdf_name is required when the PDF is given as data")
+        self.name = self.path.name if self.path is not None and not pdf_name else f"{self.stem}.pdf"
+    
+    def _as_buffer(self, source):
+        """Turn in-memory data or a file object into a buffer MuPDF can read in place."""
+        if isinstance(source, bytes):
+            return source
+        if isinstance(source, (bytearray, mmap.mmap)):
+            return memoryview(source)
+        if isinstance(source, memoryview):
+            return source if source.format == "B" and source.ndim == 1 else source.cast("B")
+        if isinstance(source, io.BytesIO):
+            return source.getvalue()
+        
+        if not hasattr(source, "read"):
+            raise ValueError(f"Unsupported PDF source: {type(source).__name__}")
+        
+        try:
+            self._mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._mapping)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            # Pipes, sockets and wrappers without a real file behind them
+            return source.read()
+    
+    def open(self) -> fitz.Document:
+        """Open the document (call close() on it as usual)."""
+        if self.path is not None:
+            return fitz.open(self.path)
+        if self.stream is None:
+            raise ValueError(f"PDF source is closed: {self.name}")
+        try:
+            return fitz.open(stream=self.stream, filetype="pdf")
+        except TypeError:
+            # Older PyMuPDF only takes bytes-like streams it can copy
+            return fitz.open(stream=bytes(self.stream), filetype="pdf")
+    
+    def worker_source(self):
+        """Something picklable that worker processes can open the PDF from."""
+        return str(self.path) if self.path is not None else bytes(self.stream)
+    
+    def close(self):
+        """
+        Release a memory mapping made for a file object.
+        
+        Close documents opened from this source first. Paths and in-memory
+        data have nothing to release, so they can still be opened afterwards.
+        """
+        if self._mapping is not None:
+            if isinstance(self.stream, memoryview):
+                self.stream.release()
+            self.stream = None
+            self._mapping.close()
+            self._mapping = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
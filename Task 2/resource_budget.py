@@ -0,0 +1,231 @@
+"""
+================================================================================
+RESOURCE BUDGET - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Stop hostile or corrupt PDFs (decompression bombs, endless content
+      streams) from eating the whole machine
+
+How it works:
+- A ResourceBudget holds per-document limits: wall time, decoded pixels,
+  output bytes and pages processed
+- Extractors take budget=None and charge it as they go; pixels are charged
+  from the declared image / render size *before* anything is decoded, so a
+  bomb is rejected without allocating it
+- Going over any limit raises BudgetExceeded, which extractors never swallow
+- Checks run between MuPDF calls, so they cannot interrupt one call that
+  spins forever. run_isolated() runs a document in its own process and
+  kills it when the wall time runs out (optionally under an address-space
+  limit), so the rest of a batch carries on
+
+Dependencies:
+- None (standard library; the memory limit needs the POSIX resource module)
+
+Output:
+- BudgetExceeded / run_isolated() results with the limit that was hit
+================================================================================
+"""
+
+import time
+from multiprocessing import Pipe, Process
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Extra seconds an isolated document gets to report its own BudgetExceeded
+# before it is killed from outside
+KILL_GRACE_SECONDS = 5.0
+
+
+class BudgetExceeded(Exception):
+    """Raised when a document uses more than its ResourceBudget allows."""
+    
+    def __init__(self, limit: str, used, allowed):
+        self.limit = limit
+        self.used = used
+        self.allowed = allowed
+        super().__init__(f"Resource budget exceeded: {limit} {used} > {allowed}")
+    
+    def __reduce__(self):
+        # Rebuild from the fields so the error survives the trip back from a worker process
+        return (BudgetExceeded, (self.limit, self.used, self.allowed))
+    
+    def to_dict(self) -> dict:
+        """Describe the overrun for metadata files."""
+        return {"limit": self.limit, "used": self.used, "allowed": self.allowed}
+
+
+class ResourceBudget:
+    """
+    Per-document resource limits and what has been used so far.
+    
+    One budget covers one document. The clock starts on start() (or the
+    first charge); call start() again before reusing it for another document.
+    """
+    
+    def __init__(self, max_seconds: float = None, max_pixels: int = None,
+                 max_output_bytes: int = None, max_pages: int = None,
+                 max_memory_mb: int = None):
+        """
+        Initialize the budget. None means "no limit".
+        
+        Args:
+            max_seconds: Wall time for the document
+            max_pixels: Total decoded pixels (embedded images, renders, OCR inputs)
+            max_output_bytes: Total bytes of files written
+            max_pages: Pages processed
+            max_memory_mb: Address-space limit for run_isolated() children
+        """
+        self.max_seconds = max_seconds
+        self.max_pixels = max_pixels
+        self.max_output_bytes = max_output_bytes
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.started_at = None
+        self.pixels = 0
+        self.output_bytes = 0
+        self.pages = 0
+    
+    def is_limited(self) -> bool:
+        """True if any limit is set."""
+        return any(value is not None for value in self.limits().values())
+    
+    def limits(self) -> dict:
+        """The configured limits (for metadata and worker processes)."""
+        return {
+            "max_seconds": self.max_seconds,
+            "max_pixels": self.max_pixels,
+            "max_output_bytes": self.max_output_bytes,
+            "max_pages": self.max_pages,
+            "max_memory_mb": self.max_memory_mb
+        }
+    
+    def usage(self) -> dict:
+        """What the current document has used so far."""
+        return {
+            "seconds": round(self.elapsed(), 3),
+            "pixels": self.pixels,
+            "output_bytes": self.output_bytes,
+            "pages": self.pages
+        }
+    
+    def start(self):
+        """Reset the usage counters and start the clock for a new document."""
+        self.started_at = time.monotonic()
+        self.pixels = 0
+        self.output_bytes = 0
+        self.pages = 0
+    
+    def elapsed(self) -> float:
+        """Seconds since start() (0 if not started)."""
+        return time.monotonic() - self.started_at if self.started_at is not None else 0.0
+    
+    def check_time(self):
+        """Raise BudgetExceeded if the wall time is used up."""
+        if self.started_at is None:
+            self.start()
+        if self.max_seconds is not None and self.elapsed() > self.max_seconds:
+            raise BudgetExceeded("seconds", round(self.elapsed(), 1), self.max_seconds)
+    
+    def add_pixels(self, count: int):
+        """Charge decoded pixels; call before decoding or rendering."""
+        self.check_time()
+        self.pixels += max(0, int(count))
+        if self.max_pixels is not None and self.pixels > self.max_pixels:
+            raise BudgetExceeded("pixels", self.pixels, self.max_pixels)
+    
+    def add_output_bytes(self, count: int):
+        """Charge bytes written to disk."""
+        self.check_time()
+        self.output_bytes += max(0, int(count))
+        if self.max_output_bytes is not None and self.output_bytes > self.max_output_bytes:
+            raise BudgetExceeded("output_bytes", self.output_bytes, self.max_output_bytes)
+    
+    def add_pages(self, count: int = 1):
+        """Charge pages about to be processed."""
+        self.check_time()
+        self.pages += count
+        if self.max_pages is not None and self.pages > self.max_pages:
+            raise BudgetExceeded("pages", self.pages, self.max_pages)
+
+
+def apply_memory_limit(max_memory_mb: int) -> bool:
+    """
+    Cap this process's address space (RLIMIT_AS).
+    
+    Allocations beyond the cap fail with MemoryError instead of swapping the
+    machine to death. Only call this in a throwaway child process.
+    
+    Returns:
+        True if the limit was applied (False on platforms without it)
+    """
+    if resource is None or not max_memory_mb:
+        return False
+    limit = int(max_memory_mb) * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        return True
+    except (ValueError, OSError):
+        return False
+
+
+def _isolated_main(conn, target, args: tuple, budget: ResourceBudget):
+    """Run target(*args, budget=budget) and send back its outcome."""
+    apply_memory_limit(budget.max_memory_mb)
+    budget.start()
+    try:
+        conn.send(("ok", target(*args, budget=budget)))
+    except BudgetExceeded as e:
+        conn.send(("budget_exceeded", e.to_dict()))
+    except MemoryError:
+        conn.send(("budget_exceeded", {"limit": "memory_mb", "used": None, "allowed": budget.max_memory_mb}))
+    except Exception as e:
+        conn.send(("failed", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_isolated(target, args: tuple, budget: ResourceBudget) -> tuple:
+    """
+    Process one document in a child process under a budget.
+    
+    The child enforces the budget itself; if it stops responding (stuck in
+    one MuPDF call, say) it is killed KILL_GRACE_SECONDS after the wall time
+    runs out. A crash or kill never affects the calling process.
+    
+    Args:
+        target: Picklable top-level function taking *args and budget=
+        args: Positional arguments for target
+        budget: Limits for this document (usage is tracked in the child)
+    
+    Returns:
+        Tuple of (status, value): ("ok", result), ("budget_exceeded",
+        {"limit", "used", "allowed"}) or ("failed", error message)
+    """
+    conn, child_conn = Pipe(duplex=False)
+    process = Process(target=_isolated_main, args=(child_conn, target, args, budget), daemon=True)
+    process.start()
+    child_conn.close()
+    
+    timeout = budget.max_seconds + KILL_GRACE_SECONDS if budget.max_seconds is not None else None
+    started = time.monotonic()
+    
+    try:
+        if conn.poll(timeout):
+            outcome = conn.recv()
+        else:
+            process.kill()
+            used = round(time.monotonic() - started, 1)
+            outcome = ("budget_exceeded", {"limit": "seconds", "used": used, "allowed": budget.max_seconds})
+    except (EOFError, OSError):
+        # Died without reporting (native crash or killed by the OS)
+        process.join()
+        outcome = ("failed", f"worker process exited with code {process.exitcode}")
+    finally:
+        conn.close()
+    
+    process.join()
+    return outcome
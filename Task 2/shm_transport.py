@@ -0,0 +1,218 @@
+"""
+================================================================================
+SHARED-MEMORY FRAME TRANSPORT - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Hand preprocessed image arrays to OCR worker processes without
+      pickling them (pickling copies every frame several times)
+
+How it works:
+- The sending process owns a FrameRing: a fixed number of slots, each backed
+  by one multiprocessing.shared_memory block
+- put() copies an array into a free slot once and returns a SharedFrame - a
+  tiny picklable handle (slot, block name, shape, dtype)
+- Workers call open_frame() on whatever they receive and get a NumPy view
+  straight onto the shared block (zero-copy); blocks stay attached per slot
+- Slots are reference-counted by the owner: put() holds one reference,
+  acquire()/release() add and drop more, and a slot is reused only at zero
+- Small arrays, a full ring, or a /dev/shm without room fall back to sending
+  the array itself, so callers never have to handle "no shared memory"
+
+Dependencies:
+- NumPy
+- Python 3.8+ for multiprocessing.shared_memory (falls back to pickling)
+
+Output:
+- SharedFrame handles / NumPy views; FrameRing.stats counts both paths
+================================================================================
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = shared_memory = None
+
+
+# Arrays smaller than this are cheaper to pickle than to route through a slot
+INLINE_BYTES = 64 * 1024
+
+# Blocks are sized in whole MiB so slots can be reused by similar frames
+BLOCK_ROUNDING = 1024 * 1024
+
+# Attached blocks in this (worker) process: slot -> SharedMemory
+_attached = {}
+
+
+class SharedFrame:
+    """Picklable handle to one array stored in a FrameRing slot."""
+    
+    __slots__ = ("slot", "name", "shape", "dtype")
+    
+    def __init__(self, slot: int, name: str, shape: tuple, dtype: str):
+        self.slot = slot
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+    
+    def __getstate__(self):
+        return (self.slot, self.name, self.shape, self.dtype)
+    
+    def __setstate__(self, state):
+        self.slot, self.name, self.shape, self.dtype = state
+
+
+def _shm_has_room(nbytes: int) -> bool:
+    """
+    Check that /dev/shm can hold another block of this size.
+    
+    Linux creates shared memory lazily, so an oversized block only fails
+    (with SIGBUS) when it is written to - check the free space first.
+    """
+    if not os.path.isdir("/dev/shm"):
+        return True
+    try:
+        stats = os.statvfs("/dev/shm")
+    except OSError:
+        return True
+    return stats.f_bavail * stats.f_frsize > nbytes * 2
+
+
+class FrameRing:
+    """
+    Ring of shared-memory slots owned by the process that sends frames.
+    
+    Create it before starting the worker processes that read from it.
+    """
+    
+    def __init__(self, slots: int):
+        """
+        Initialize the ring. Blocks are created on first use and grown when
+        a larger frame needs the slot.
+        
+        Args:
+            slots: Number of frames that can be in flight at once
+        """
+        self.slots = max(1, slots)
+        self.blocks = [None] * self.slots
+        self.refs = [0] * self.slots
+        self.enabled = shared_memory is not None
+        self.stats = {"shared": 0, "inline": 0, "shared_bytes": 0}
+        
+        if self.enabled and os.name == "posix":
+            # Start the resource tracker before any worker is forked, so all
+            # workers share it; otherwise each worker gets its own tracker,
+            # which unlinks the ring's blocks when that worker exits or is killed
+            resource_tracker.ensure_running()
+    
+    def _free_slot(self, nbytes: int):
+        """Pick a free slot, preferring one whose block is already big enough."""
+        free = [slot for slot in range(self.slots) if self.refs[slot] == 0]
+        for slot in free:
+            block = self.blocks[slot]
+            if block is not None and block.size >= nbytes:
+                return slot
+        return free[0] if free else None
+    
+    def put(self, array: np.ndarray):
+        """
+        Store an array for another process.
+        
+        Args:
+            array: Array to send (copied into shared memory once)
+        
+        Returns:
+            SharedFrame holding one reference, or the array itself when it
+            is sent inline (small, ring full, or no shared memory)
+        """
+        nbytes = array.nbytes
+        slot = self._free_slot(nbytes) if self.enabled and nbytes >= INLINE_BYTES else None
+        
+        if slot is not None and (self.blocks[slot] is None or self.blocks[slot].size < nbytes):
+            size = -(-nbytes // BLOCK_ROUNDING) * BLOCK_ROUNDING
+            if not _shm_has_room(size):
+                slot = None
+            else:
+                self._unlink(slot)
+                try:
+                    self.blocks[slot] = shared_memory.SharedMemory(create=True, size=size)
+                except OSError:
+                    slot = None
+        
+        if slot is None:
+            self.stats["inline"] += 1
+            return array
+        
+        block = self.blocks[slot]
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        np.copyto(view, array)
+        del view
+        
+        self.refs[slot] = 1
+        self.stats["shared"] += 1
+        self.stats["shared_bytes"] += nbytes
+        return SharedFrame(slot, block.name, array.shape, array.dtype.str)
+    
+    def acquire(self, frame):
+        """Add a reference (e.g. the same frame is sent to a second worker)."""
+        if isinstance(frame, SharedFrame):
+            self.refs[frame.slot] += 1
+    
+    def release(self, frame):
+        """Drop a reference; the slot is reused once no reference is left."""
+        if isinstance(frame, SharedFrame) and self.refs[frame.slot] > 0:
+            self.refs[frame.slot] -= 1
+    
+    def _unlink(self, slot: int):
+        """Destroy a slot's block (workers still attached keep their mapping)."""
+        block = self.blocks[slot]
+        self.blocks[slot] = None
+        if block is not None:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+    
+    def close(self):
+        """Destroy all blocks; call once no worker reads from the ring anymore."""
+        for slot in range(self.slots):
+            self._unlink(slot)
+            self.refs[slot] = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_frame(item) -> np.ndarray:
+    """
+    Turn a received item back into an array (worker side).
+    
+    Args:
+        item: SharedFrame from FrameRing.put, or an array sent inline
+    
+    Returns:
+        NumPy array; for a SharedFrame a view onto shared memory that is
+        valid until the sender releases the frame
+    """
+    if not isinstance(item, SharedFrame):
+        return item
+    
+    block = _attached.get(item.slot)
+    if block is None or block.name != item.name:
+        # The slot was grown (new block) - drop the old mapping
+        if block is not None:
+            try:
+                block.close()
+            except BufferError:
+                pass
+        block = shared_memory.SharedMemory(name=item.name)
+        _attached[item.slot] = block
+    
+    return np.ndarray(item.shape, dtype=np.dtype(item.dtype), buffer=block.buf)
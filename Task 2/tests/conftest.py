@@ -0,0 +1,94 @@
+"""
+Shared fixtures for the Task 2 tests.
+
+The tests run against the synthetic benchmark corpus (benchmark.py),
+generated once per session at a small scale.
+"""
+
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+TASK_DIR = Path(__file__).resolve().parent.parent
+if str(TASK_DIR) not in sys.path:
+    sys.path.insert(0, str(TASK_DIR))
+
+from event_log import EventLog
+from ocr_engines import OCREngine, image_key
+
+
+@pytest.fixture(scope="session")
+def corpus(tmp_path_factory):
+    """{kind: path} of the benchmark documents (see benchmark.KINDS)."""
+    import benchmark
+    corpus_dir = tmp_path_factory.mktemp("corpus")
+    manifest = benchmark.generate_corpus(str(corpus_dir), scale=0.25)
+    return {doc["kind"]: corpus_dir / doc["file"] for doc in manifest["documents"]}
+
+
+@pytest.fixture(scope="session")
+def extracted(corpus, tmp_path_factory):
+    """
+    ImageExtractor output for the image-heavy document (metadata plus
+    images), input for the OCR tests. Copy it before writing to it.
+    """
+    from image_extractor import ImageExtractor
+    output_dir = tmp_path_factory.mktemp("extracted")
+    ImageExtractor(str(corpus["image_heavy"]), output_dir=str(output_dir),
+                   log=EventLog(level="warning")).extract_images()
+    return output_dir
+
+
+@pytest.fixture
+def log():
+    """A log that only writes warnings and errors."""
+    return EventLog(level="warning")
+
+
+def read_outputs(folder: Path) -> dict:
+    """{file name: bytes} of every file in an output folder."""
+    return {path.name: path.read_bytes() for path in sorted(folder.iterdir()) if path.is_file()}
+
+
+class FakeEngine(OCREngine):
+    """
+    Deterministic engine: one line per image derived from its pixels.
+    With kill_after=N the process kills itself when image N+1 arrives,
+    like a crash or an OOM kill in the middle of a run; failures=N makes
+    the first N calls raise instead. load_seconds and latency stand in for
+    model loading and inference time.
+    """
+    
+    name = "fake"
+    
+    def __init__(self, kill_after: int = None, failures: int = 0, load_seconds: float = 0.0,
+                 latency: float = 0.0):
+        super().__init__()
+        self.kill_after = kill_after
+        self.failures = failures
+        self.load_seconds = load_seconds
+        self.latency = latency
+        self.seen = 0
+    
+    def version(self) -> str:
+        return "1"
+    
+    def load(self):
+        time.sleep(self.load_seconds)
+    
+    def recognize(self, images: list) -> list:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("engine failure")
+        time.sleep(self.latency * len(images))
+        results = []
+        for image in images:
+            if self.kill_after is not None and self.seen >= self.kill_after:
+                os.kill(os.getpid(), signal.SIGKILL)
+            self.seen += 1
+            results.append([[f"text {image_key(image)[:12]}", 0.99]])
+        return results
@@ -0,0 +1,42 @@
+"""Tests for benchmark.py."""
+
+import copy
+
+import benchmark
+
+
+def _files(folder) -> dict:
+    return {path.name: path.read_bytes() for path in sorted(folder.glob("*.pdf"))}
+
+
+def test_corpus_is_reproducible(tmp_path):
+    kinds = ("vector_charts", "duplicate_heavy")
+    first = benchmark.generate_corpus(str(tmp_path / "first"), scale=0.1, kinds=kinds)
+    second = benchmark.generate_corpus(str(tmp_path / "second"), scale=0.1, kinds=kinds)
+    other = benchmark.generate_corpus(str(tmp_path / "other"), scale=0.1, kinds=kinds, seed=1)
+    
+    assert first == second
+    assert _files(tmp_path / "first") == _files(tmp_path / "second")
+    assert _files(tmp_path / "other") != _files(tmp_path / "first")
+
+
+def test_benchmark_measures_and_compares(tmp_path):
+    report = benchmark.run_benchmark(str(tmp_path / "corpus"), str(tmp_path / "work"), stages=("images",),
+                                     kinds=("image_heavy",), scale=0.1)
+    
+    [result] = report["results"]
+    assert result["status"] == "ok"
+    assert result["stage"] == "images" and result["kind"] == "image_heavy"
+    assert result["pages"] == 2 and result["items"] == 8
+    assert result["pages_per_s"] > 0 and result["peak_rss_mb"] > 0
+    
+    assert benchmark.compare_results(report, report)["regressions"] == []
+    
+    slower = copy.deepcopy(report)
+    slower["results"][0]["seconds"] = result["seconds"] * 2 + 1
+    [regression] = benchmark.compare_results(slower, report)["regressions"]
+    assert regression["metric"] == "seconds"
+    
+    other_seed = copy.deepcopy(report)
+    other_seed["corpus"]["settings"]["seed"] = 1
+    assert not benchmark.compare_results(other_seed, report)["comparable"]
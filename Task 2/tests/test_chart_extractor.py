@@ -0,0 +1,203 @@
+"""Tests for chart_extractor.py."""
+
+import io
+import shutil
+
+import fitz
+import numpy as np
+import pytest
+from PIL import Image
+
+import chart_extractor
+from chart_extractor import ChartExtractor
+from conftest import read_outputs
+from page_fingerprint import page_fingerprint
+
+
+def _extract_charts(pdf_path, output_dir, log, **options):
+    extractor = ChartExtractor(str(pdf_path), output_dir=str(output_dir), log=log, **options)
+    metadata = extractor.extract_charts()
+    return metadata, read_outputs(extractor.charts_dir)
+
+
+def test_parallel_rendering_matches_serial(corpus, tmp_path, log):
+    serial, serial_files = _extract_charts(corpus["vector_charts"], tmp_path / "serial", log, workers=1)
+    parallel, parallel_files = _extract_charts(corpus["vector_charts"], tmp_path / "parallel", log, workers=2)
+    
+    assert serial["charts"]
+    assert parallel["charts"] == serial["charts"]
+    assert parallel_files == serial_files
+
+
+def _comparable_charts(metadata: dict) -> list:
+    """Chart entries without the fields that say how a chart was produced."""
+    return [{key: value for key, value in chart.items() if key not in ("reused", "page_fingerprint")}
+            for chart in metadata["charts"]]
+
+
+def test_template_pages_reuse_renders_across_pdfs(corpus, tmp_path, log):
+    first_pdf = tmp_path / "first.pdf"
+    second_pdf = tmp_path / "second.pdf"
+    shutil.copyfile(corpus["duplicate_heavy"], first_pdf)
+    shutil.copyfile(corpus["duplicate_heavy"], second_pdf)
+    store = str(tmp_path / "fingerprints")
+    
+    plain, plain_files = _extract_charts(first_pdf, tmp_path / "plain", log)
+    first, first_files = _extract_charts(first_pdf, tmp_path / "first", log, fingerprint_store=store)
+    second, second_files = _extract_charts(second_pdf, tmp_path / "second", log, fingerprint_store=store)
+    
+    assert plain["charts"]
+    assert all(chart.get("reused") for chart in second["charts"])
+    assert second["page_fingerprints"]["reused_renders"] == len(second["charts"])
+    assert _comparable_charts(first) == _comparable_charts(second) == _comparable_charts(plain)
+    assert first_files == second_files == plain_files
+
+
+def test_only_selected_pages_are_fingerprinted(corpus, tmp_path, log, monkeypatch):
+    fingerprinted = []
+    
+    def counting_fingerprint(doc, page, memo=None):
+        fingerprinted.append(page.number + 1)
+        return page_fingerprint(doc, page, memo)
+    
+    monkeypatch.setattr(chart_extractor, "page_fingerprint", counting_fingerprint)
+    extractor = ChartExtractor(str(corpus["duplicate_heavy"]), output_dir=str(tmp_path), log=log,
+                               fingerprint_store=str(tmp_path / "fingerprints"))
+    metadata = extractor.extract_charts(pages=[2, 5])
+    
+    assert fingerprinted == [2, 5]
+    assert {chart["page_number"] for chart in metadata["charts"]} <= {2, 5}
+
+
+def test_adaptive_dpi_hits_target_long_side(corpus, tmp_path, log):
+    metadata, _ = _extract_charts(corpus["vector_charts"], tmp_path, log,
+                                  target_long_side=800, min_dpi=72, max_dpi=300)
+    
+    assert metadata["charts"]
+    for chart in metadata["charts"]:
+        assert 72 <= chart["dpi"] <= 300
+        assert abs(max(chart["width"], chart["height"]) - 800) <= 2
+
+
+def test_max_pixels_caps_every_render(corpus, tmp_path, log):
+    metadata, files = _extract_charts(corpus["huge_page"], tmp_path, log, dpi=300, max_pixels=250_000)
+    
+    assert metadata["charts"]
+    for chart in metadata["charts"]:
+        assert chart["width"] * chart["height"] <= 250_000
+        assert chart["dpi"] < 300
+        # The recorded size is the size of the file written
+        with Image.open(io.BytesIO(files[chart["image_name"]])) as image:
+            assert image.size == (chart["width"], chart["height"])
+
+
+def _without_sizes(metadata: dict) -> list:
+    return [{key: value for key, value in chart.items() if key != "size_bytes"} for chart in metadata["charts"]]
+
+
+def _pixels(data: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"), dtype=np.int16)
+
+
+def test_striped_renders_match_single_renders(corpus, tmp_path, log):
+    whole, whole_files = _extract_charts(corpus["vector_charts"], tmp_path / "whole", log, dpi=200)
+    striped, striped_files = _extract_charts(corpus["vector_charts"], tmp_path / "striped", log, dpi=200,
+                                             tile_pixels=20_000)
+    
+    assert whole["charts"]
+    assert _without_sizes(striped) == _without_sizes(whole)
+    assert whole_files.keys() == striped_files.keys()
+    for name in whole_files:
+        # MuPDF's anti-aliasing depends slightly on the clip, so edges may differ by a few levels
+        difference = np.abs(_pixels(striped_files[name]) - _pixels(whole_files[name]))
+        assert difference.max() <= 32
+        assert (difference > 0).mean() < 0.02
+
+
+def test_striped_writer_is_lossless(tmp_path):
+    rng = np.random.default_rng(0)
+    height, width = 37, 23
+    # Noise, gradients and flat areas, so every row filter gets picked
+    image = np.concatenate([
+        rng.integers(0, 256, (12, width, 3)),
+        np.tile(np.arange(width, dtype=np.int64)[None, :, None] * 11, (12, 1, 3)),
+        np.full((height - 24, width, 3), 200)
+    ]).astype(np.uint8)
+    # Pixmap rows are padded beyond width * 3
+    stride = width * 3 + 5
+    samples = np.zeros((height, stride), dtype=np.uint8)
+    samples[:, :width * 3] = image.reshape(height, width * 3)
+    
+    path = tmp_path / "striped.png"
+    with chart_extractor._StripedPNGWriter(path, width, height) as writer:
+        for y in range(0, height, 5):
+            rows = min(5, height - y)
+            writer.write_rows(samples[y:y + rows].tobytes(), stride, rows)
+    
+    assert np.array_equal(_pixels(path.read_bytes()), image)
+
+
+def test_striped_writer_removes_partial_file(tmp_path):
+    path = tmp_path / "partial.png"
+    
+    with pytest.raises(RuntimeError):
+        with chart_extractor._StripedPNGWriter(path, 4, 4) as writer:
+            writer.write_rows(bytes(4 * 3), 4 * 3, 1)
+            raise RuntimeError("render failed")
+    
+    assert not path.exists()
+
+
+def test_each_page_is_interpreted_once(corpus, tmp_path, log, monkeypatch):
+    interpreted = []
+    get_displaylist = fitz.Page.get_displaylist
+    
+    def counting_displaylist(page, *args, **kwargs):
+        interpreted.append(page.number + 1)
+        return get_displaylist(page, *args, **kwargs)
+    
+    monkeypatch.setattr(fitz.Page, "get_displaylist", counting_displaylist)
+    metadata, _ = _extract_charts(corpus["vector_charts"], tmp_path, log, preview_dpi=36, tile_pixels=50_000)
+    
+    # Full render (in stripes) and preview of each page come from one display list
+    rendered_pages = [chart["page_number"] for chart in metadata["charts"]]
+    assert rendered_pages
+    assert all("preview_name" in chart for chart in metadata["charts"])
+    assert interpreted == rendered_pages
+
+
+def _scan_with_overlay(path, image_fraction: float):
+    """One page: an embedded raster over image_fraction of its height, plus many small vector marks."""
+    doc = fitz.open()
+    page = doc.new_page()
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 60, 80), False)
+    pixmap.clear_with(200)
+    page.insert_image(fitz.Rect(0, 0, page.rect.width, page.rect.height * image_fraction), pixmap=pixmap,
+                      keep_proportion=False)
+    for i in range(120):
+        x = 40 + (i % 12) * 40
+        y = 60 + (i // 12) * 70
+        page.draw_line((x, y), (x + 20, y + 10))
+    doc.save(str(path))
+    doc.close()
+
+
+def test_raster_covered_pages_are_not_rendered(tmp_path, log):
+    scan = tmp_path / "scan.pdf"
+    half = tmp_path / "half.pdf"
+    _scan_with_overlay(scan, 1.0)
+    _scan_with_overlay(half, 0.5)
+    
+    skipped, skipped_files = _extract_charts(scan, tmp_path / "skipped", log)
+    assert skipped["charts"] == [] and skipped_files == {}
+    assert [page["page_number"] for page in skipped["raster_covered_pages"]] == [1]
+    assert skipped["raster_covered_pages"][0]["coverage"] == 1.0
+    assert skipped["raster_covered_pages"][0]["xref"]
+    
+    rendered, _ = _extract_charts(scan, tmp_path / "rendered", log, raster_coverage_threshold=0)
+    assert len(rendered["charts"]) == 1
+    
+    partly, _ = _extract_charts(half, tmp_path / "partly", log)
+    assert partly["raster_covered_pages"] == []
+    assert len(partly["charts"]) == 1
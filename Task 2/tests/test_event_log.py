@@ -0,0 +1,68 @@
+"""Tests for event_log.py."""
+
+import io
+import json
+
+from event_log import EventLog
+from image_extractor import ImageExtractor
+
+
+def _events(path) -> list:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_item_events_are_sampled():
+    off = EventLog(stream=io.StringIO())
+    every_third = EventLog(item_sample=3, stream=io.StringIO())
+    debug = EventLog(level="debug", stream=io.StringIO())
+    
+    assert not any(off.sample("image_saved") for _ in range(10))
+    assert [every_third.sample("image_saved") for _ in range(7)] == [True, False, False, True, False, False, True]
+    # Counted per event name
+    assert every_third.sample("chart_saved")
+    assert all(debug.sample("image_saved") for _ in range(10))
+
+
+def test_quiet_console_keeps_json_events(tmp_path):
+    console = io.StringIO()
+    json_path = tmp_path / "events.jsonl"
+    log = EventLog(quiet=True, json_path=str(json_path), stream=console)
+    
+    log.info("🚀 started", "run_started", pdf="a.pdf")
+    log.debug("not written", "details")
+    # Info events wait in the buffer; warnings flush it
+    assert json_path.read_text() == ""
+    log.warning("⚠️ slow page", "page_slow", page=3)
+    
+    assert console.getvalue() == "⚠️ slow page\n"
+    events = _events(json_path)
+    assert [event["event"] for event in events] == ["run_started", "page_slow"]
+    assert events[0]["pdf"] == "a.pdf" and events[1]["page"] == 3
+    log.close()
+
+
+def test_progress_is_rate_limited(tmp_path):
+    console = io.StringIO()
+    log = EventLog(progress_interval=60, stream=console)
+    
+    for done in range(1, 101):
+        log.progress("images", done, 100)
+    
+    # Only the final line within the interval
+    [line] = console.getvalue().splitlines()
+    assert line.startswith("⏳ images: 100/100 items") and line.endswith("done)")
+
+
+def test_extraction_writes_no_per_image_lines_by_default(corpus, tmp_path):
+    default, sampled = io.StringIO(), io.StringIO()
+    ImageExtractor(str(corpus["image_heavy"]), output_dir=str(tmp_path / "default"),
+                   log=EventLog(stream=default, progress_interval=0)).extract_images()
+    ImageExtractor(str(corpus["image_heavy"]), output_dir=str(tmp_path / "sampled"),
+                   log=EventLog(stream=sampled, progress_interval=0, item_sample=1)).extract_images()
+    
+    default_lines = default.getvalue().splitlines()
+    sampled_lines = sampled.getvalue().splitlines()
+    # 20 images on 5 pages: one line per image and per page when sampled
+    assert len(sampled_lines) - len(default_lines) >= 20
+    assert not any("✅ Extracted:" in line for line in default_lines)
+    assert sum("✅ Extracted:" in line for line in sampled_lines) == 20
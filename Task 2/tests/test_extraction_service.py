@@ -0,0 +1,67 @@
+"""Tests for extraction_service.py, against a service running in this process."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from extraction_service import ExtractionClient, ExtractionService, ServiceBusyError
+
+
+@pytest.fixture
+def service(tmp_path):
+    """A running service (replay OCR engine, queue of one) and its output folder."""
+    replay = tmp_path / "ocr_replay.jsonl"
+    replay.write_text("", encoding="utf-8")
+    service = ExtractionService(address="127.0.0.1:0", queue_size=1, image_workers=1, chart_workers=1,
+                                ocr_workers=1, ocr_options={"engine": f"replay:{replay}"},
+                                output_dir=str(tmp_path / "service"))
+    thread = threading.Thread(target=asyncio.run, args=(service.serve(),), daemon=True)
+    thread.start()
+    while service._stopping is None:
+        time.sleep(0.05)
+    yield service
+    service.stop()
+    thread.join(30)
+
+
+def test_upload_runs_all_stages_and_is_deleted(service, corpus):
+    client = ExtractionClient(service.address)
+    job_id = client.upload(str(corpus["scan_like"]), ["images", "ocr"])
+    
+    info = client.wait(job_id, poll_interval=0.1, timeout=120)
+    assert info["status"] == "done", info["error"]
+    assert info["stages_done"] == ["images", "ocr"]
+    
+    result = client.result(job_id)
+    assert len(result["images"]) == info["counts"]["images"] > 0
+    assert all("text_source" in record for record in result["images"])
+    assert (service.output_dir / "metadata_with_ocr (bench_scan_like).json").exists()
+    assert list(service.uploads_dir.iterdir()) == []
+
+
+def test_full_queue_answers_429(service, corpus):
+    client = ExtractionClient(service.address, busy_retries=0)
+    
+    # Jobs for the same PDF run one at a time, so the queue of one fills up
+    accepted = []
+    with pytest.raises(ServiceBusyError):
+        for _ in range(10):
+            accepted.append(client.submit(str(corpus["scan_like"]), ["images"]))
+    assert len(accepted) >= 2
+    
+    for job_id in accepted:
+        assert client.wait(job_id, poll_interval=0.1, timeout=120)["status"] == "done"
+
+
+@pytest.mark.parametrize("options", [
+    {"images": {"output_dir": "/tmp"}},
+    {"ocr": {"engine": "paddle"}},
+    {"charts": {"fingerprint_store": "/tmp/fingerprints.sqlite"}},
+    {"upload": {}}
+])
+def test_options_outside_the_whitelist_are_rejected(service, corpus, options):
+    client = ExtractionClient(service.address)
+    with pytest.raises(RuntimeError, match=r"\(400\)"):
+        client.submit(str(corpus["scan_like"]), ["images"], options)
@@ -0,0 +1,71 @@
+"""Tests for image_extractor.py."""
+
+import pytest
+
+from conftest import read_outputs
+from image_extractor import ImageExtractor, parse_page_ranges
+from resource_budget import ResourceBudget
+
+
+def _extract_images(pdf_path, output_dir, log, pages=None, **options):
+    extractor = ImageExtractor(str(pdf_path), output_dir=str(output_dir), log=log, **options)
+    metadata = extractor.extract_images(pages=pages)
+    # The index only changes which pages are visited, not what is extracted
+    metadata = {key: value for key, value in metadata.items()
+                if key not in ("extraction_date", "image_index", "pages_scanned")}
+    return metadata, read_outputs(extractor.images_dir)
+
+
+@pytest.mark.parametrize("kind", ["image_heavy", "duplicate_heavy"])
+def test_xref_index_does_not_change_output(corpus, tmp_path, log, kind):
+    scanned, scanned_files = _extract_images(corpus[kind], tmp_path / "scanned", log, use_index=False)
+    indexed, indexed_files = _extract_images(corpus[kind], tmp_path / "indexed", log, use_index=True,
+                                             index_cache_dir=str(tmp_path / "index"))
+    cached, cached_files = _extract_images(corpus[kind], tmp_path / "cached", log, use_index=True,
+                                           index_cache_dir=str(tmp_path / "index"))
+    
+    assert scanned["images"]
+    assert indexed == scanned
+    assert cached == scanned
+    assert indexed_files == scanned_files
+    assert cached_files == scanned_files
+
+
+def test_parse_page_ranges():
+    assert parse_page_ranges("1-3, 5,9-") == [(1, 3), 5, (9, None)]
+    assert parse_page_ranges("-2") == [(1, 2)]
+    for spec in ("5-3", "0", "0-2"):
+        with pytest.raises(ValueError):
+            parse_page_ranges(spec)
+
+
+def test_pages_beyond_the_document_are_ignored(corpus, tmp_path, log):
+    # The benchmark document has 5 pages
+    clipped, clipped_files = _extract_images(corpus["image_heavy"], tmp_path / "clipped", log,
+                                             pages=parse_page_ranges("4-100,50"))
+    tail, tail_files = _extract_images(corpus["image_heavy"], tmp_path / "tail", log, pages=[(4, None)])
+    
+    assert {image["page_number"] for image in clipped["images"]} == {4, 5}
+    assert clipped == tail
+    assert clipped_files == tail_files
+
+
+def test_max_images_stops_before_loading_more_pages(corpus, tmp_path, log):
+    budget = ResourceBudget()
+    extractor = ImageExtractor(str(corpus["image_heavy"]), output_dir=str(tmp_path), log=log, budget=budget)
+    # Every page holds 4 images, so the limit is reached at the end of page 1
+    metadata = extractor.extract_images(max_images=4)
+    
+    assert metadata["truncated"] == "max_images"
+    assert len(metadata["images"]) == metadata["total_images"] == 4
+    assert metadata["pages_scanned"] == 1
+    assert metadata["budget_usage"]["pages"] == 1
+
+
+def test_max_bytes_truncates(corpus, tmp_path, log):
+    metadata = ImageExtractor(str(corpus["image_heavy"]), output_dir=str(tmp_path),
+                              log=log).extract_images(max_bytes=1)
+    
+    assert metadata["truncated"] == "max_bytes"
+    assert metadata["images"] == []
+    assert metadata["pages_scanned"] == 1
@@ -0,0 +1,28 @@
+"""Tests for mem_profiler.py."""
+
+import json
+
+from mem_profiler import MemoryProfiler
+
+
+def _allocate(size: int) -> bytearray:
+    return bytearray(size)
+
+
+def test_top_allocations_are_taken_at_the_peak(tmp_path, log):
+    profiler = MemoryProfiler(top_n=5, log=log)
+    profiler.begin("doc.pdf", "images")
+    
+    buffer = _allocate(8 * 1024 * 1024)
+    profiler.checkpoint()
+    del buffer
+    
+    profiler.end()
+    # Also stops tracing
+    entry = json.loads(profiler.save(tmp_path / "profile.json").read_text())["entries"][0]
+    
+    top = entry["top_allocations"][0]
+    assert top["site"].startswith("test_mem_profiler.py:")
+    assert top["size_kb"] >= 8 * 1024
+    assert entry["top_allocations_heap_mb"] >= 8
+    assert entry["py_current_mb"] < 8
@@ -0,0 +1,98 @@
+"""Tests for the OCR result cache (ocr_cache.py)."""
+
+import itertools
+import shutil
+from types import SimpleNamespace
+
+import pytest
+
+import ocr_cache
+from conftest import FakeEngine
+from event_log import EventLog
+from ocr_cache import OCRCache
+from ocr_extractor import OCRExtractor
+
+
+def _ocr_extractor(output_dir, **options) -> OCRExtractor:
+    return OCRExtractor(pdf_name="bench_image_heavy", output_dir=str(output_dir), native_text=False,
+                        log=EventLog(level="warning"), **options)
+
+
+def test_cache_key_is_pinned(extracted, tmp_path):
+    # Changing what goes into the key invalidates every cache in use; do it on purpose
+    settings = _ocr_extractor(extracted, engine=FakeEngine())._cache_settings()
+    assert settings == {
+        "engine": "fake",
+        "engine_version": "1",
+        "lang": "en",
+        "min_score": 0.5,
+        "max_side": 2560,
+        "min_side": 64,
+        "max_upscale": 4.0
+    }
+    
+    cache = OCRCache(str(tmp_path / "ocr_cache.sqlite"), settings)
+    try:
+        assert cache.key_for(b"image bytes") == "d1b0e207cbe44f00ff80f4e101df1ca4aa2f00c181a8d52b69d9247a7eaeb533"
+    finally:
+        cache.close()
+
+
+@pytest.mark.parametrize("option", [{"max_side": 512}, {"min_side": 256}, {"max_upscale": 1.0},
+                                    {"min_score": 0.9}, {"lang": "fr"}])
+def test_changed_settings_miss_the_cache(extracted, tmp_path, option):
+    output_dir = tmp_path / "output"
+    shutil.copytree(extracted, output_dir)
+    cache_path = str(tmp_path / "ocr_cache.sqlite")
+    
+    first = FakeEngine()
+    metadata = _ocr_extractor(output_dir, engine=first, cache_path=cache_path).run_ocr()
+    assert first.seen == len(metadata["images"])
+    
+    same = FakeEngine()
+    _ocr_extractor(output_dir, engine=same, cache_path=cache_path).run_ocr()
+    assert same.seen == 0
+    
+    changed = FakeEngine()
+    _ocr_extractor(output_dir, engine=changed, cache_path=cache_path, **option).run_ocr()
+    assert changed.seen == len(metadata["images"])
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    # A clock that always moves, so every access has its own time
+    clock = itertools.count()
+    monkeypatch.setattr(ocr_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    cache_path = str(tmp_path / "ocr_cache.sqlite")
+    cache = OCRCache(cache_path, {"engine": "fake"}, max_bytes=3 * (64 + 100))
+    keys = [cache.key_for(bytes([i])) for i in range(4)]
+    for key in keys[:3]:
+        cache.put(key, "x" * 100)
+    cache.flush()
+    
+    # Touch the oldest entry, then go over the limit
+    assert cache.get(keys[0]) == "x" * 100
+    cache.put(keys[3], "x" * 100)
+    cache.close()
+    
+    cache = OCRCache(cache_path, {"engine": "fake"}, max_bytes=3 * (64 + 100))
+    try:
+        assert cache.get(keys[1]) is None
+        assert [cache.get(key) for key in (keys[0], keys[2], keys[3])] == ["x" * 100] * 3
+        assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+    finally:
+        cache.close()
+
+
+def test_run_summary_counts_hits_and_misses(extracted, tmp_path):
+    output_dir = tmp_path / "output"
+    shutil.copytree(extracted, output_dir)
+    cache_path = str(tmp_path / "ocr_cache.sqlite")
+    
+    first = _ocr_extractor(output_dir, engine=FakeEngine(), cache_path=cache_path).run_ocr()
+    second = _ocr_extractor(output_dir, engine=FakeEngine(), cache_path=cache_path).run_ocr()
+    
+    images = len(first["images"])
+    assert (first["ocr_cache"]["hits"], first["ocr_cache"]["misses"]) == (0, images)
+    assert (second["ocr_cache"]["hits"], second["ocr_cache"]["misses"]) == (images, 0)
+    assert second["ocr_cache"]["hit_rate"] == 1.0
+    assert [img["text"] for img in second["images"]] == [img["text"] for img in first["images"]]
@@ -0,0 +1,53 @@
+"""Tests for ocr_engines.py."""
+
+import shutil
+import time
+
+import numpy as np
+import pytest
+
+from conftest import FakeEngine
+from event_log import EventLog
+from ocr_engines import PaddleEngine, RecordingEngine, ReplayEngine, create_engine
+from ocr_extractor import OCRExtractor
+
+
+def _run_ocr(output_dir, engine) -> dict:
+    extractor = OCRExtractor(pdf_name="bench_image_heavy", output_dir=str(output_dir), engine=engine,
+                             native_text=False, resume=False, log=EventLog(level="error"))
+    return extractor.run_ocr()
+
+
+def test_record_then_replay_gives_the_same_text(extracted, tmp_path):
+    output_dir = tmp_path / "output"
+    shutil.copytree(extracted, output_dir)
+    record_path = tmp_path / "recording.jsonl"
+    
+    recorded = _run_ocr(output_dir, RecordingEngine(FakeEngine(), str(record_path)))
+    assert len(record_path.read_text().splitlines()) == len(recorded["images"])
+    
+    replay = ReplayEngine(str(record_path))
+    replayed = _run_ocr(output_dir, replay)
+    
+    assert replay.hits == len(recorded["images"]) and replay.misses == 0
+    assert [img["text"] for img in replayed["images"]] == [img["text"] for img in recorded["images"]]
+    assert all(img["text"] for img in replayed["images"])
+
+
+def test_replay_latency_and_unknown_images(tmp_path):
+    engine = create_engine(f"replay:{tmp_path / 'missing.jsonl'}", latency=0.05)
+    image = np.zeros((10, 10, 3), dtype=np.uint8)
+    
+    started = time.monotonic()
+    assert engine.recognize([image, image]) == [[], []]
+    assert time.monotonic() - started >= 0.1
+    assert engine.misses == 2
+
+
+def test_engine_selection_is_lazy(monkeypatch):
+    monkeypatch.delenv("OCR_ENGINE", raising=False)
+    
+    # Creating the default engine must not import PaddleOCR
+    assert isinstance(create_engine(), PaddleEngine)
+    with pytest.raises(ValueError):
+        create_engine("tesseract")
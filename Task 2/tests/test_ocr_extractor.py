@@ -0,0 +1,102 @@
+"""Tests for ocr_extractor.py."""
+
+import shutil
+import time
+
+from chart_extractor import ChartExtractor
+from conftest import FakeEngine
+from event_log import EventLog
+from ocr_extractor import OCRExtractor
+
+
+def _run_ocr(output_dir, engine, **options) -> dict:
+    extractor = OCRExtractor(pdf_name="bench_image_heavy", output_dir=str(output_dir), engine=engine,
+                             native_text=False, log=EventLog(level="error"), **options)
+    return extractor.run_ocr()
+
+
+def test_engine_errors_are_not_cached_and_retried(extracted, tmp_path):
+    output_dir = tmp_path / "output"
+    shutil.copytree(extracted, output_dir)
+    cache_path = str(tmp_path / "ocr_cache.sqlite")
+    
+    failed = _run_ocr(output_dir, FakeEngine(failures=1), cache_path=cache_path)
+    errors = [img for img in failed["images"] if img.get("ocr_error")]
+    assert len(errors) == 1
+    assert errors[0]["text"] == "" and errors[0]["text_source"] == "none"
+    assert failed["ocr_error_count"] == 1
+    
+    # Only the failed image reaches the engine again; the rest come from the cache
+    engine = FakeEngine()
+    retried = _run_ocr(output_dir, engine, cache_path=cache_path)
+    assert engine.seen == 1
+    assert retried["ocr_error_count"] == 0
+    assert all(img["text"] for img in retried["images"])
+
+
+def test_document_timeout_does_not_restart_workers(extracted, tmp_path):
+    output_dir = tmp_path / "output"
+    shutil.copytree(extracted, output_dir)
+    
+    # Every image overruns; past the cutoff the workers must not reload their
+    # model (3 s) before the run can finish
+    started = time.monotonic()
+    metadata = _run_ocr(output_dir, FakeEngine(load_seconds=3, latency=60), workers=2, document_timeout=5)
+    elapsed = time.monotonic() - started
+    
+    assert all(img["ocr_skipped"] == "deadline" for img in metadata["images"])
+    assert metadata["ocr_time_limits"]["deadline_skipped"] == len(metadata["images"])
+    assert elapsed < 7
+
+
+def test_batched_ocr_keeps_image_order(extracted, tmp_path):
+    single_dir = tmp_path / "single"
+    batched_dir = tmp_path / "batched"
+    shutil.copytree(extracted, single_dir)
+    shutil.copytree(extracted, batched_dir)
+    
+    single = _run_ocr(single_dir, FakeEngine())
+    batched = _run_ocr(batched_dir, FakeEngine(), batch_size=6)
+    
+    images = len(single["images"])
+    assert [batch["images"] for batch in batched["ocr_batches"]] == [6] * (images // 6) + [images % 6]
+    assert all(img["text"] for img in batched["images"])
+    assert batched["images"] == single["images"]
+
+
+def test_worker_pool_matches_single_process(extracted, tmp_path):
+    single_dir = tmp_path / "single"
+    pool_dir = tmp_path / "pool"
+    shutil.copytree(extracted, single_dir)
+    shutil.copytree(extracted, pool_dir)
+    
+    single = _run_ocr(single_dir, FakeEngine())
+    pooled = _run_ocr(pool_dir, FakeEngine(), workers=2, batch_size=3, cpu_threads=1)
+    
+    assert sorted(batch["batch"] for batch in pooled["ocr_batches"]) == list(range(1, len(pooled["ocr_batches"]) + 1))
+    assert pooled["images"] == single["images"]
+
+
+def _ocr_charts(output_dir, engine, **options) -> dict:
+    extractor = OCRExtractor(metadata_path=str(output_dir / "charts_metadata (bench_vector_charts).json"),
+                             output_dir=str(output_dir), engine=engine, log=EventLog(level="error"), **options)
+    return extractor.run_ocr()
+
+
+def test_native_text_layer_replaces_ocr(corpus, tmp_path):
+    ChartExtractor(str(corpus["vector_charts"]), output_dir=str(tmp_path), log=EventLog(level="error")).extract_charts()
+    
+    engine = FakeEngine()
+    native = _ocr_charts(tmp_path, engine)
+    assert native["charts"]
+    assert engine.seen == 0
+    assert all(chart["text_source"] == "native" for chart in native["charts"])
+    assert all("Figure" in chart["text"] for chart in native["charts"])
+    assert native["native_text_count"] == len(native["charts"])
+    
+    # Too few words in the text layer: fall back to OCR
+    engine = FakeEngine()
+    fallback = _ocr_charts(tmp_path, engine, native_min_words=10_000, resume=False)
+    assert engine.seen == len(fallback["charts"])
+    assert all(chart["text_source"] == "ocr" for chart in fallback["charts"])
+    assert fallback["native_text_count"] == 0
@@ -0,0 +1,47 @@
+"""Tests for resuming OCR from ocr_journal.py after an interrupted run."""
+
+import multiprocessing
+import shutil
+import signal
+
+from conftest import FakeEngine
+from event_log import EventLog
+from ocr_extractor import OCRExtractor
+
+
+def _run_ocr(output_dir, engine: FakeEngine) -> dict:
+    extractor = OCRExtractor(pdf_name="bench_image_heavy", output_dir=str(output_dir), engine=engine,
+                             native_text=False, log=EventLog(level="warning"))
+    return extractor.run_ocr()
+
+
+def _run_ocr_until_killed(output_dir, kill_after: int):
+    _run_ocr(output_dir, FakeEngine(kill_after=kill_after))
+
+
+def _comparable(metadata: dict) -> dict:
+    """Metadata without run dates and timings."""
+    return {key: value for key, value in metadata.items()
+            if key not in ("ocr_extraction_date", "ocr_batches")}
+
+
+def test_resume_after_kill_matches_uninterrupted_run(extracted, tmp_path):
+    
+    complete_dir = tmp_path / "complete"
+    shutil.copytree(extracted, complete_dir)
+    complete = _run_ocr(complete_dir, FakeEngine())
+    
+    resumed_dir = tmp_path / "resumed"
+    shutil.copytree(extracted, resumed_dir)
+    process = multiprocessing.get_context("spawn").Process(target=_run_ocr_until_killed, args=(resumed_dir, 5))
+    process.start()
+    process.join(120)
+    assert process.exitcode == -signal.SIGKILL
+    assert (resumed_dir / "ocr_journal (bench_image_heavy).jsonl").exists()
+    
+    engine = FakeEngine()
+    resumed = _run_ocr(resumed_dir, engine)
+    
+    assert engine.seen == len(complete["images"]) - 5
+    assert _comparable(resumed) == _comparable(complete)
+    assert not (resumed_dir / "ocr_journal (bench_image_heavy).jsonl").exists()
@@ -0,0 +1,92 @@
+"""Tests for ocr_server.py, against a server running in this process."""
+
+import asyncio
+import shutil
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from conftest import FakeEngine
+from event_log import EventLog
+from ocr_extractor import OCRExtractor
+from ocr_server import OCRServer, OCRServiceClient
+
+
+@pytest.fixture
+def start_server():
+    """Start OCRServer instances in background threads; all are stopped afterwards."""
+    running = []
+    
+    def start(**options) -> OCRServer:
+        server = OCRServer(address="127.0.0.1:0", log=EventLog(level="error"), **options)
+        thread = threading.Thread(target=asyncio.run, args=(server.serve(),), daemon=True)
+        thread.start()
+        while server._stopping is None:
+            time.sleep(0.05)
+        running.append((server, thread))
+        return server
+    
+    yield start
+    for server, thread in running:
+        server.stop()
+        thread.join(10)
+
+
+def _images(count: int) -> list:
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (32 + i, 48, 3), dtype=np.uint8) for i in range(count)]
+
+
+def test_large_batches_are_split_to_max_batch(start_server):
+    server = start_server(engine=FakeEngine(), max_batch=2)
+    client = OCRServiceClient(server.address)
+    images = _images(5)
+    
+    assert client.ping()["max_batch"] == 2
+    assert client.recognize(images) == FakeEngine().recognize(images)
+    assert server.served_batches == 3
+    
+    # Without a ping the client learns the limit from the "too_large" reply
+    fresh = OCRServiceClient(server.address)
+    assert fresh.recognize(images) == FakeEngine().recognize(images)
+    client.close()
+    fresh.close()
+
+
+def test_busy_server_makes_clients_back_off(start_server):
+    server = start_server(engine=FakeEngine(latency=0.3), concurrency=1, queue_size=1)
+    images = _images(4)
+    results = [None] * len(images)
+    
+    def send(i):
+        client = OCRServiceClient(server.address)
+        results[i] = client.recognize([images[i]])
+        client.close()
+    
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(len(images))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    
+    assert server.rejected > 0
+    assert results == [FakeEngine().recognize([image]) for image in images]
+
+
+def test_extractor_keeps_using_the_service_with_larger_batches(start_server, extracted, tmp_path):
+    server = start_server(engine=FakeEngine(), max_batch=2)
+    output_dir = tmp_path / "output"
+    shutil.copytree(extracted, output_dir)
+    
+    extractor = OCRExtractor(pdf_name="bench_image_heavy", output_dir=str(output_dir), engine=FakeEngine(),
+                             service=server.address, batch_size=4, native_text=False,
+                             log=EventLog(level="error"))
+    metadata = extractor.run_ocr()
+    
+    # No fallback to a local model
+    assert extractor.service is not None and extractor.ocr is None
+    assert metadata["ocr_service"] == server.address
+    assert server.served_images == len(metadata["images"])
+    assert all(img["text"] for img in metadata["images"])
@@ -0,0 +1,57 @@
+"""Tests for pdf_source.py."""
+
+import io
+
+import pytest
+
+from chart_extractor import ChartExtractor
+from conftest import read_outputs
+from image_extractor import ImageExtractor
+
+
+def _without_path(metadata: dict) -> dict:
+    """Metadata without the fields that depend on how or when the PDF was opened."""
+    return {key: value for key, value in metadata.items() if key not in ("pdf_path", "extraction_date")}
+
+
+def _open_as(kind: str, pdf_path, stack: list):
+    """The same PDF as a path, bytes, a BytesIO or an open file object."""
+    if kind == "path":
+        return str(pdf_path)
+    data = pdf_path.read_bytes()
+    if kind == "bytes":
+        return data
+    if kind == "bytesio":
+        return io.BytesIO(data)
+    f = open(pdf_path, "rb")
+    stack.append(f)
+    return f
+
+
+@pytest.mark.parametrize("kind", ["bytes", "bytesio", "file"])
+def test_in_memory_sources_match_path(corpus, tmp_path, log, kind):
+    pdf_path = corpus["image_heavy"]
+    outputs = {}
+    files = []
+    try:
+        for source_kind in ("path", kind):
+            output_dir = str(tmp_path / source_kind)
+            
+            images = ImageExtractor(_open_as(source_kind, pdf_path, files), pdf_name=pdf_path.name,
+                                    output_dir=output_dir, log=log)
+            image_metadata = images.extract_images()
+            assert images.source._mapping is None
+            
+            charts = ChartExtractor(_open_as(source_kind, pdf_path, files), pdf_name=pdf_path.name,
+                                    output_dir=output_dir, log=log)
+            chart_metadata = charts.extract_charts(pages=[1, 2])
+            assert charts.source._mapping is None
+            
+            outputs[source_kind] = (_without_path(image_metadata), read_outputs(images.images_dir),
+                                    _without_path(chart_metadata), read_outputs(charts.charts_dir))
+    finally:
+        for f in files:
+            f.close()
+    
+    assert outputs["path"][0]["images"]
+    assert outputs[kind] == outputs["path"]
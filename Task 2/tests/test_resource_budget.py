@@ -0,0 +1,36 @@
+"""Tests for resource_budget.py."""
+
+import pickle
+
+import pytest
+
+from batch_extractor import _extract_pdf
+from chart_extractor import ChartExtractor
+from resource_budget import BudgetExceeded, ResourceBudget, run_isolated
+
+
+def test_run_isolated_stops_at_pixel_budget(corpus, tmp_path):
+    status, value = run_isolated(_extract_pdf, (str(corpus["image_heavy"]), str(tmp_path)),
+                                 ResourceBudget(max_pixels=1000))
+    
+    assert status == "budget_exceeded"
+    assert value["limit"] == "pixels"
+    assert value["used"] > value["allowed"] == 1000
+
+
+def test_budget_exceeded_survives_pickling():
+    error = pickle.loads(pickle.dumps(BudgetExceeded("output_bytes", 10, 1)))
+    
+    assert error.to_dict() == {"limit": "output_bytes", "used": 10, "allowed": 1}
+
+
+def test_parallel_renders_stop_at_output_budget(corpus, tmp_path, log):
+    budget = ResourceBudget(max_output_bytes=1)
+    extractor = ChartExtractor(str(corpus["duplicate_heavy"]), output_dir=str(tmp_path), log=log,
+                               workers=2, budget=budget)
+    
+    with pytest.raises(BudgetExceeded) as raised:
+        extractor.extract_charts(force_all=True)
+    
+    assert raised.value.limit == "output_bytes"
+    assert len(list(extractor.charts_dir.glob("*.png"))) < extractor.metadata["total_pages"]
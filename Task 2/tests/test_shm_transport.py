@@ -0,0 +1,75 @@
+"""Tests for shm_transport.py and the shared-memory handoff to OCR workers."""
+
+import shutil
+
+import numpy as np
+
+import shm_transport
+from conftest import FakeEngine
+from event_log import EventLog
+from ocr_extractor import OCRExtractor
+from shm_transport import INLINE_BYTES, FrameRing, SharedFrame, open_frame
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((INLINE_BYTES // 3 + 1, 3), value, dtype=np.uint8)
+
+
+def test_slots_are_reused_only_when_released():
+    with FrameRing(2) as ring:
+        first = ring.put(_frame(1))
+        second = ring.put(_frame(2))
+        assert isinstance(first, SharedFrame) and isinstance(second, SharedFrame)
+        assert np.array_equal(open_frame(first), _frame(1))
+        
+        # Both slots are taken: the third frame goes inline
+        third = ring.put(_frame(3))
+        assert isinstance(third, np.ndarray)
+        
+        ring.acquire(first)
+        ring.release(first)
+        assert isinstance(ring.put(_frame(4)), np.ndarray)
+        
+        ring.release(first)
+        reused = ring.put(_frame(5))
+        assert reused.slot == first.slot
+        assert np.array_equal(open_frame(reused), _frame(5))
+        assert ring.stats["shared"] == 3 and ring.stats["inline"] == 2
+
+
+def test_small_frames_go_inline():
+    with FrameRing(2) as ring:
+        small = np.zeros((8, 8), dtype=np.uint8)
+        assert ring.put(small) is small
+        assert open_frame(small) is small
+
+
+def _run_ocr(output_dir) -> dict:
+    extractor = OCRExtractor(pdf_name="bench_image_heavy", output_dir=str(output_dir), engine=FakeEngine(),
+                             native_text=False, workers=2, cpu_threads=1, log=EventLog(level="error"))
+    return extractor.run_ocr()
+
+
+def test_ocr_falls_back_to_inline_without_shared_memory(extracted, tmp_path, monkeypatch):
+    shared_dir = tmp_path / "shared"
+    inline_dir = tmp_path / "inline"
+    shutil.copytree(extracted, shared_dir)
+    shutil.copytree(extracted, inline_dir)
+    
+    shared = _run_ocr(shared_dir)
+    assert shared["ocr_transport"]["shared"] == len(shared["images"])
+    
+    # No multiprocessing.shared_memory (or no room in /dev/shm): images are pickled
+    monkeypatch.setattr(shm_transport, "shared_memory", None)
+    inline = _run_ocr(inline_dir)
+    
+    assert inline["ocr_transport"] == {"shared": 0, "inline": len(inline["images"]), "shared_bytes": 0}
+    assert inline["images"] == shared["images"]
+
+
+def test_full_shm_falls_back_to_inline(monkeypatch):
+    monkeypatch.setattr(shm_transport, "_shm_has_room", lambda nbytes: False)
+    
+    with FrameRing(2) as ring:
+        assert isinstance(ring.put(_frame(1)), np.ndarray)
+        assert ring.stats["inline"] == 1
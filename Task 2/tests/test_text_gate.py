@@ -0,0 +1,66 @@
+"""Tests for text_gate.py and the text gate in ocr_extractor.py."""
+
+import shutil
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+import benchmark
+from conftest import FakeEngine
+from event_log import EventLog
+from ocr_extractor import OCRExtractor
+from text_gate import text_likelihood
+
+
+def _text_image() -> Image.Image:
+    image = Image.new("RGB", (600, 200), "white")
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.load_default(size=28)
+    except TypeError:
+        # Pillow < 10.1 has a single bitmap size
+        font = ImageFont.load_default()
+    for line in range(5):
+        draw.text((10, 10 + line * 36), "Quarterly revenue grew 12% in FY2024", fill="black", font=font)
+    return image
+
+
+def test_text_scores_above_blank_and_photo():
+    blank_score, blank = text_likelihood(Image.new("RGB", (400, 200), "white"))
+    photo_score, _ = text_likelihood(Image.fromarray(benchmark._photo(np.random.default_rng(0), 480, 600)))
+    text_score, _ = text_likelihood(_text_image())
+    
+    assert blank["blank"] and blank_score == 0.0
+    assert photo_score < 0.2
+    assert text_score > 0.5
+
+
+def test_gated_images_skip_inference(extracted, tmp_path):
+    output_dir = tmp_path / "output"
+    shutil.copytree(extracted, output_dir)
+    
+    # The image-heavy document is all photos: the gate keeps them from the engine
+    engine = FakeEngine()
+    metadata = OCRExtractor(pdf_name="bench_image_heavy", output_dir=str(output_dir), engine=engine,
+                            native_text=False, text_gate_threshold=0.2,
+                            log=EventLog(level="error")).run_ocr()
+    
+    assert engine.seen == 0
+    assert all(img["ocr_skipped"] == "text_gate" and img["text"] == "" for img in metadata["images"])
+    assert metadata["text_gate"]["skip_rate"] == 1.0
+
+
+def test_evaluation_mode_reports_missed_text(extracted, tmp_path):
+    output_dir = tmp_path / "output"
+    shutil.copytree(extracted, output_dir)
+    
+    # The fake engine "finds" text in every photo, so every gated image counts as a miss
+    engine = FakeEngine()
+    metadata = OCRExtractor(pdf_name="bench_image_heavy", output_dir=str(output_dir), engine=engine,
+                            native_text=False, text_gate_threshold=0.2, evaluate_text_gate=True,
+                            log=EventLog(level="error")).run_ocr()
+    
+    images = len(metadata["images"])
+    assert engine.seen == images
+    assert metadata["text_gate"]["missed_text"] == images
+    assert metadata["text_gate"]["recall"] == 0.0
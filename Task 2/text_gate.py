@@ -0,0 +1,157 @@
+"""
+================================================================================
+TEXT LIKELIHOOD GATE - Task 2
+================================================================================
+Developer: Developer 2 (Image Extraction Owner)
+Goal: Skip OCR on images that cannot contain text (photos, gradients, blanks)
+
+How it works:
+- Downscales the image to a small grayscale copy
+- Computes cheap vectorized features with NumPy:
+  * blank detection (almost no contrast)
+  * edge density (text has many sharp edges)
+  * histogram bimodality (text is ink on a background - two clear peaks)
+  * stroke-width consistency (glyph strokes have similar widths)
+- Combines them into a score between 0 and 1
+
+Dependencies:
+- NumPy
+- Pillow
+
+Output:
+- text_likelihood() returns (score, features) for one image
+================================================================================
+"""
+
+import numpy as np
+from PIL import Image
+
+
+# Longest side of the analysis copy (features are stable well below this)
+ANALYSIS_SIZE = 256
+
+# Standard deviation below which an image is treated as blank
+BLANK_STD = 4.0
+
+# Edge density at which the edge feature saturates
+EDGE_DENSITY_FULL = 0.08
+
+# Otsu bimodality of a single smooth peak (a Gaussian gives ~0.64, a flat
+# histogram 0.75); only the part above this counts as evidence of ink
+BIMODALITY_BASELINE = 0.7
+
+# Stroke consistency of random runs (geometric run lengths give ~0.5)
+STROKE_BASELINE = 0.5
+
+
+def _to_analysis_gray(image: Image.Image) -> np.ndarray:
+    """Downscale to ANALYSIS_SIZE and convert to a float grayscale array."""
+    gray = image.convert('L')
+    gray.thumbnail((ANALYSIS_SIZE, ANALYSIS_SIZE))
+    return np.asarray(gray, dtype=np.float32)
+
+
+def _otsu_split(gray: np.ndarray) -> tuple:
+    """
+    Find the Otsu threshold and how cleanly it splits the histogram.
+    
+    Returns:
+        Tuple of (threshold, bimodality) where bimodality is the between-class
+        variance divided by the total variance (1.0 = two perfect peaks)
+    """
+    hist = np.bincount(gray.astype(np.uint8).ravel(), minlength=256).astype(np.float64)
+    total = hist.sum()
+    if total == 0:
+        return 128, 0.0
+    
+    prob = hist / total
+    levels = np.arange(256)
+    omega = np.cumsum(prob)
+    mu = np.cumsum(prob * levels)
+    mu_total = mu[-1]
+    
+    denom = omega * (1.0 - omega)
+    denom[denom == 0] = np.nan
+    between = (mu_total * omega - mu) ** 2 / denom
+    
+    if np.all(np.isnan(between)):
+        return 128, 0.0
+    
+    threshold = int(np.nanargmax(between))
+    variance = float(np.sum(prob * (levels - mu_total) ** 2))
+    bimodality = float(between[threshold] / variance) if variance > 0 else 0.0
+    return threshold, min(1.0, bimodality)
+
+
+def _stroke_consistency(foreground: np.ndarray) -> float:
+    """
+    Measure how uniform horizontal stroke widths are (1.0 = all equal).
+    
+    Runs of foreground pixels along each row approximate stroke widths.
+    Glyphs produce many short runs of similar length; photos and large
+    shapes produce a wide spread.
+    """
+    padded = np.pad(foreground.astype(np.int8), ((0, 0), (1, 1)))
+    changes = np.diff(padded, axis=1)
+    starts = np.flatnonzero(changes == 1)
+    ends = np.flatnonzero(changes == -1)
+    
+    if starts.size < 8:
+        return 0.0
+    
+    runs = (ends - starts).astype(np.float64)
+    # Runs longer than a tenth of the width are fills, not strokes
+    runs = runs[runs <= max(2, foreground.shape[1] // 10)]
+    if runs.size < 8:
+        return 0.0
+    
+    cv = runs.std() / runs.mean()
+    return float(1.0 / (1.0 + cv))
+
+
+def text_likelihood(image: Image.Image) -> tuple:
+    """
+    Estimate how likely an image is to contain readable text.
+    
+    Args:
+        image: PIL image (any mode)
+    
+    Returns:
+        Tuple of (score between 0 and 1, dictionary of individual features)
+    """
+    gray = _to_analysis_gray(image)
+    
+    std = float(gray.std())
+    if gray.size == 0 or std < BLANK_STD:
+        return 0.0, {"blank": True, "std": round(std, 2)}
+    
+    # Edge density: share of pixels with a strong gradient, measured on a
+    # 2x2 box-filtered copy so sensor noise and film grain average out
+    h, w = gray.shape[0] // 2 * 2, gray.shape[1] // 2 * 2
+    smooth = gray[:h, :w].reshape(h // 2, 2, w // 2, 2).mean(axis=(1, 3)) if h and w else gray
+    gx = np.abs(np.diff(smooth, axis=1))[:-1, :]
+    gy = np.abs(np.diff(smooth, axis=0))[:, :-1]
+    edges = (gx + gy) > 64
+    edge_density = float(edges.mean()) if edges.size else 0.0
+    
+    threshold, bimodality = _otsu_split(gray)
+    
+    # Treat the minority class as ink (works for dark-on-light and light-on-dark)
+    foreground = gray <= threshold
+    if foreground.mean() > 0.5:
+        foreground = ~foreground
+    stroke = _stroke_consistency(foreground)
+    
+    edge_score = min(1.0, edge_density / EDGE_DENSITY_FULL)
+    bimodal_score = max(0.0, (bimodality - BIMODALITY_BASELINE) / (1.0 - BIMODALITY_BASELINE))
+    stroke_score = max(0.0, (stroke - STROKE_BASELINE) / (1.0 - STROKE_BASELINE))
+    score = 0.4 * edge_score + 0.4 * bimodal_score + 0.2 * stroke_score
+    
+    features = {
+        "blank": False,
+        "std": round(std, 2),
+        "edge_density": round(edge_density, 4),
+        "bimodality": round(bimodality, 3),
+        "stroke_consistency": round(stroke, 3)
+    }
+    return round(score, 3), features